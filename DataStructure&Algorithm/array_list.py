@@ -1,163 +1,251 @@
 from __future__ import annotations
 from typing import Any, Type
+from array import array
+import sys
 
 Null = -1
 
-class Node:
-    
-    def __init__(self, data = Null, next = Null, dnext = Null):
-        self.data = data
-        self.next = next
-        self.dnext = dnext
-
 class ArrayLinkedList:
-    def __init__(self, capacity: int):
+    # 노드 객체 없이 슬롯별 열(column) 세 개로 나타낸 커서 연결 리스트
+    #   data[i]   i번 슬롯의 데이터 (임의의 객체이므로 리스트)
+    #   nexts[i]  뒤쪽 포인터, dnexts[i]  프리 리스트의 뒤쪽 포인터 (둘 다 array('q'))
+    # 꼬리 노드 인덱스(tail)를 유지하므로 add_last는 O(1)
+    # grow가 참이면 빈 슬롯이 없을 때 배열을 두 배로 늘린다 (거짓이면 예전처럼 삽입하지 않는다)
+    def __init__(self, capacity: int, grow: bool = True):
         self.head = Null
+        self.tail = Null
         self.current = Null
         self.max = Null
         self.deleted = Null
         self.capacity = capacity
-        self.n = [Node()] * self.capacity
+        self.data = [None] * capacity
+        self.nexts = array('q', [Null]) * capacity
+        self.dnexts = array('q', [Null]) * capacity
         self.no = 0
-        
+        self.grow = grow
+
     def __len__(self) -> int:
         return self.no
-    def get_insert_index(self):
+
+    def reserve(self, capacity: int) -> None:
+        if capacity > self.capacity:
+            capacity = max(capacity, self.capacity * 2)
+            more = capacity - self.capacity
+            self.data.extend([None] * more)
+            self.nexts.extend(array('q', [Null]) * more)
+            self.dnexts.extend(array('q', [Null]) * more)
+            self.capacity = capacity
+
+    def get_insert_index(self) -> int:
         if self.deleted == Null:
-            if self.max + 1 < self.capacity:
-                self.max += 1
-                return self.max
-            else:
-                return Null
-        
+            if self.max + 1 >= self.capacity:
+                if not self.grow:
+                    return Null
+                self.reserve(self.max + 2)
+            self.max += 1
+            return self.max
         else:
             rec = self.deleted
-            self.deleted = self.n[rec].dnext
+            self.deleted = self.dnexts[rec]
             return rec
-    
-    def deleted_index(self,idx: int) -> None:
-        if self.deleted == Null:
-            self.deleted = idx
-            self.n[idx].dnext = Null
-        else:
-            rec = self.deleted
-            self.deleted = idx
-            self.n[idx].dnext = rec
+
+    def deleted_index(self, idx: int) -> None:
+        self.dnexts[idx] = self.deleted
+        self.deleted = idx
+        self.data[idx] = None
+        self.nexts[idx] = Null
+
     def search(self, data: Any) -> int:
         cnt = 0
         ptr = self.head
         while ptr != Null:
-            if self.n[ptr].data == data:
+            if self.data[ptr] == data:
                 self.current = ptr
                 return cnt
             cnt += 1
-            ptr = self.n[ptr].next
+            ptr = self.nexts[ptr]
         return Null
-    def __contains__(self,data:Any) -> bool:
+
+    def __contains__(self, data: Any) -> bool:
         return self.search(data) >= 0
-    
-    def add_first(self, data: Any):
-        ptr = self.head
+
+    def add_first(self, data: Any) -> None:
         rec = self.get_insert_index()
         if rec != Null:
+            self.data[rec] = data
+            self.nexts[rec] = self.head
+            if self.head == Null:
+                self.tail = rec
             self.head = self.current = rec
-            self.n[self.head] = Node(data, ptr)
             self.no += 1
-        
-    def add_last(self,data: Any)-> None:
+
+    def add_last(self, data: Any) -> None:
         if self.head == Null:
             self.add_first(data)
         else:
-            ptr= self.head
-            while self.n[ptr].next != Null:
-                ptr= self.n[ptr].next
             rec = self.get_insert_index()
-            
             if rec != Null:
-                self.n[ptr].next = self.current = rec
-                self.n[rec] = Node(data)
+                self.data[rec] = data
+                self.nexts[rec] = Null
+                self.nexts[self.tail] = self.current = self.tail = rec
                 self.no += 1
+
+    def extend(self, iterable) -> None:
+        # 꼬리에 차례로 삽입. 프리 리스트의 슬롯을 먼저 쓰고, 나머지는 새 슬롯에 한 번에 채운다
+        items = list(iterable)
+        data, nexts = self.data, self.nexts
+        k = 0
+        prev = self.tail
+        while k < len(items) and self.deleted != Null:
+            rec = self.deleted
+            self.deleted = self.dnexts[rec]
+            data[rec] = items[k]
+            if prev == Null:
+                self.head = rec
+            else:
+                nexts[prev] = rec
+            prev = rec
+            k += 1
+        m = len(items) - k
+        if m:
+            start = self.max + 1
+            if start + m > self.capacity:
+                if not self.grow:
+                    m = self.capacity - start
+                self.reserve(start + m)
+            if m:
+                data[start:start + m] = items[k:k + m]
+                nexts[start:start + m] = array('q', range(start + 1, start + m + 1))
+                if prev == Null:
+                    self.head = start
+                else:
+                    nexts[prev] = start
+                prev = start + m - 1
+                self.max += m
+                k += m
+        if prev != Null and k:
+            nexts[prev] = Null
+            self.tail = self.current = prev
+        self.no += k
+
+    def compact(self) -> None:
+        # 살아 있는 노드를 리스트 순서대로 0번 슬롯부터 다시 놓는다 (프리 리스트는 비워진다)
+        order = []
+        ptr = self.head
+        cur = Null
+        while ptr != Null:
+            if ptr == self.current:
+                cur = len(order)
+            order.append(ptr)
+            ptr = self.nexts[ptr]
+        n = len(order)
+        data = [self.data[p] for p in order]
+        self.data[:n] = data
+        self.data[n:] = [None] * (self.capacity - n)
+        self.nexts[:n] = array('q', range(1, n + 1))
+        self.nexts[n:] = array('q', [Null]) * (self.capacity - n)
+        self.dnexts[:] = array('q', [Null]) * self.capacity
+        if n:
+            self.nexts[n - 1] = Null
+        self.head = 0 if n else Null
+        self.tail = n - 1 if n else Null
+        self.current = cur
+        self.max = n - 1
+        self.deleted = Null
+
+    def memory_usage(self) -> float:
+        # 원소 하나당 바이트 (비어 있는 슬롯까지 세 열 전부, 데이터 객체 자체는 빼고 센다)
+        size = sys.getsizeof(self.data) + sys.getsizeof(self.nexts) + sys.getsizeof(self.dnexts)
+        return size / self.no if self.no else 0.0
+
     def remove_first(self) -> None:
         if self.head != Null:
-            ptr = self.n[self.head].next
+            ptr = self.nexts[self.head]
             self.deleted_index(self.head)
             self.head = self.current = ptr
-            self.no -=1
+            if ptr == Null:
+                self.tail = Null
+            self.no -= 1
+
     def remove_last(self) -> None:
         if self.head != Null:
-            if self.n[self.head].next == Null:
+            if self.head == self.tail:
                 self.remove_first()
             else:
-                ptr = self.head
+                # 앞쪽 포인터가 없으므로 꼬리 바로 앞 노드는 훑어서 찾는다
                 pre = self.head
-
-                while self.n[ptr].next !=Null:
-                    pre = ptr
-                    ptr = self.n[ptr].next
-                self.n[pre].next = Null
-                self.deleted_index(ptr)
-                self.current = pre
+                while self.nexts[pre] != self.tail:
+                    pre = self.nexts[pre]
+                self.nexts[pre] = Null
+                self.deleted_index(self.tail)
+                self.tail = self.current = pre
                 self.no -= 1
-    def remove(self, p:int) -> None:
+
+    def remove(self, p: int) -> None:
         if self.head != Null:
             if p == self.head:
                 self.remove_first()
             else:
                 ptr = self.head
-                
-                while self.n[ptr].next !=p:
-                    ptr = self.n[ptr].next
+                while self.nexts[ptr] != p:
+                    ptr = self.nexts[ptr]
                     if ptr == Null:
                         return
-                self.n[ptr].next == Null
+                self.nexts[ptr] = self.nexts[p]
+                if p == self.tail:
+                    self.tail = ptr
                 self.deleted_index(p)
-                self.n[ptr].next = self.n[p].next
                 self.current = ptr
                 self.no -= 1
-    def remove_current_node(self) ->None:
+
+    def remove_current_node(self) -> None:
         self.remove(self.current)
-        
-    def clear(self) ->None:
+
+    def clear(self) -> None:
         while self.head != Null:
             self.remove_first()
         self.current = Null
+
     def next(self) -> bool:
-        if self.current == Null or self.n[self.current].next == Null:
+        if self.current == Null or self.nexts[self.current] == Null:
             return False
-        self.current = self.n[self.current].next
+        self.current = self.nexts[self.current]
         return True
-    
+
     def print_current_node(self) -> None:
         if self.current == Null:
             print('주목 노드가 없습니다.')
         else:
-            print(self.n[self.current].data)
-    
-    def print(self) ->None:
+            print(self.data[self.current])
+
+    def print(self) -> None:
         ptr = self.head
-        
         while ptr != Null:
-            print(self.n[ptr].data)
-            ptr = self.n[ptr].next
+            print(self.data[ptr])
+            ptr = self.nexts[ptr]
+
     def dump(self) -> None:
-        for i in self.n:
-            print(f'[{i}]  {i.data} {i.next} {i.dnext}')
+        for i in range(self.capacity):
+            print(f'[{i}]  {self.data[i]} {self.nexts[i]} {self.dnexts[i]}')
+
     def __iter__(self) -> ArrayLinkedListIterator:
-        return ArrayLinkedListIterator(self.n, self.head)
+        return ArrayLinkedListIterator(self.data, self.nexts, self.head)
+
+
 class ArrayLinkedListIterator:
-    
-    def __init__(self, n:int, head:int):
-        self.n = n
+
+    def __init__(self, data: list, nexts: array, head: int):
+        self.data = data
+        self.nexts = nexts
         self.current = head
-        
+
     def __iter__(self) -> ArrayLinkedListIterator:
         return self
-    
+
     def __next__(self) -> Any:
         if self.current == Null:
             raise StopIteration
         else:
-            data = self.n[self.current].data
-            self.current = self.n[self.current].next
+            data = self.data[self.current]
+            self.current = self.nexts[self.current]
             return data
-        
\ No newline at end of file
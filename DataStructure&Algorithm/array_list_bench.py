@@ -0,0 +1,240 @@
+from __future__ import annotations
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from array_list import ArrayLinkedList, Null
+
+class Node:
+    # 원래 array_list.py의 노드 그대로 (__slots__ 없음: 예전 메모리 비용을 그대로 잰다)
+    def __init__(self, data = Null, next = Null, dnext = Null):
+        self.data = data
+        self.next = next
+        self.dnext = dnext
+
+class NodeArrayLinkedList:
+    # 슬롯마다 Node 객체를 두는 커서 연결 리스트 (병렬 배열 이전의 ArrayLinkedList, 비교용)
+    def __init__(self, capacity: int):
+        self.head = Null
+        self.current = Null
+        self.max = Null
+        self.deleted = Null
+        self.capacity = capacity
+        self.n = [Node() for _ in range(self.capacity)]
+        self.no = 0
+
+    def __len__(self) -> int:
+        return self.no
+    def get_insert_index(self):
+        if self.deleted == Null:
+            if self.max + 1 < self.capacity:
+                self.max += 1
+                return self.max
+            else:
+                return Null
+
+        else:
+            rec = self.deleted
+            self.deleted = self.n[rec].dnext
+            return rec
+
+    def deleted_index(self,idx: int) -> None:
+        if self.deleted == Null:
+            self.deleted = idx
+            self.n[idx].dnext = Null
+        else:
+            rec = self.deleted
+            self.deleted = idx
+            self.n[idx].dnext = rec
+    def search(self, data: Any) -> int:
+        cnt = 0
+        ptr = self.head
+        while ptr != Null:
+            if self.n[ptr].data == data:
+                self.current = ptr
+                return cnt
+            cnt += 1
+            ptr = self.n[ptr].next
+        return Null
+    def __contains__(self,data:Any) -> bool:
+        return self.search(data) >= 0
+
+    def add_first(self, data: Any):
+        ptr = self.head
+        rec = self.get_insert_index()
+        if rec != Null:
+            self.head = self.current = rec
+            self.n[self.head] = Node(data, ptr)
+            self.no += 1
+
+    def add_last(self,data: Any)-> None:
+        if self.head == Null:
+            self.add_first(data)
+        else:
+            ptr= self.head
+            while self.n[ptr].next != Null:
+                ptr= self.n[ptr].next
+            rec = self.get_insert_index()
+
+            if rec != Null:
+                self.n[ptr].next = self.current = rec
+                self.n[rec] = Node(data)
+                self.no += 1
+    def remove_first(self) -> None:
+        if self.head != Null:
+            ptr = self.n[self.head].next
+            self.deleted_index(self.head)
+            self.head = self.current = ptr
+            self.no -=1
+    def remove_last(self) -> None:
+        if self.head != Null:
+            if self.n[self.head].next == Null:
+                self.remove_first()
+            else:
+                ptr = self.head
+                pre = self.head
+
+                while self.n[ptr].next !=Null:
+                    pre = ptr
+                    ptr = self.n[ptr].next
+                self.n[pre].next = Null
+                self.deleted_index(ptr)
+                self.current = pre
+                self.no -= 1
+    def remove(self, p:int) -> None:
+        if self.head != Null:
+            if p == self.head:
+                self.remove_first()
+            else:
+                ptr = self.head
+
+                while self.n[ptr].next !=p:
+                    ptr = self.n[ptr].next
+                    if ptr == Null:
+                        return
+                self.n[ptr].next == Null
+                self.deleted_index(p)
+                self.n[ptr].next = self.n[p].next
+                self.current = ptr
+                self.no -= 1
+    def remove_current_node(self) ->None:
+        self.remove(self.current)
+
+    def clear(self) ->None:
+        while self.head != Null:
+            self.remove_first()
+        self.current = Null
+    def next(self) -> bool:
+        if self.current == Null or self.n[self.current].next == Null:
+            return False
+        self.current = self.n[self.current].next
+        return True
+
+    def print_current_node(self) -> None:
+        if self.current == Null:
+            print('주목 노드가 없습니다.')
+        else:
+            print(self.n[self.current].data)
+
+    def print(self) ->None:
+        ptr = self.head
+
+        while ptr != Null:
+            print(self.n[ptr].data)
+            ptr = self.n[ptr].next
+    def dump(self) -> None:
+        for i, node in enumerate(self.n):
+            print(f'[{i}]  {node.data} {node.next} {node.dnext}')
+    def __iter__(self) -> NodeArrayLinkedListIterator:
+        return NodeArrayLinkedListIterator(self.n, self.head)
+class NodeArrayLinkedListIterator:
+
+    def __init__(self, n:list, head:int):
+        self.n = n
+        self.current = head
+
+    def __iter__(self) -> NodeArrayLinkedListIterator:
+        return self
+
+    def __next__(self) -> Any:
+        if self.current == Null:
+            raise StopIteration
+        else:
+            data = self.n[self.current].data
+            self.current = self.n[self.current].next
+            return data
+
+
+def timed(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+def build_first(cls: type, n: int):
+    lst = cls(n)
+    for i in range(n):
+        lst.add_first(i)
+    return lst
+
+def build_last(cls: Callable[[int], object], n: int):
+    lst = cls(n)
+    for i in range(n):
+        lst.add_last(i)
+    return lst
+
+def shuffled(n: int) -> ArrayLinkedList:
+    # 슬롯 순서와 리스트 순서가 뒤섞인 리스트: 머리에서 절반을 지운 뒤 그 슬롯에 다시 꼬리 삽입
+    lst = ArrayLinkedList(n)
+    lst.extend(range(n))
+    for _ in range(n // 2):
+        lst.remove_first()
+    for i in range(n // 2):
+        lst.add_last(i)
+    return lst
+
+def memory(cls: type, n: int) -> int:
+    tracemalloc.start()
+    lst = build_first(cls, n)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del lst
+    return size
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    small = min(n, 5000)  # NodeArrayLinkedList.add_last는 꼬리까지 훑으므로 O(n^2)
+    print(f'원소 수 {n:,} (add_last 비교는 {small:,})')
+    print(f'{"":<22} {"Node 객체":>12} {"병렬 배열":>12}')
+    rows = []
+    for cls in (NodeArrayLinkedList, ArrayLinkedList):
+        lst = build_first(cls, n)
+        rows.append((
+            timed(lambda: build_first(cls, n)) / n * 1e9,
+            timed(lambda: build_last(cls, small)) / small * 1e9,
+            timed(lambda: build_last(cls, n)) / n * 1e9 if cls is ArrayLinkedList else None,
+            timed(lambda: sum(lst)) / n * 1e9,
+            timed(lambda: lst.search(-1)) / n * 1e9,
+            memory(cls, n) / n,
+        ))
+    labels = ['add_first ns/개', f'add_last ns/개 ({small:,})', f'add_last ns/개 ({n:,})',
+              '순회 ns/개', '검색(실패) ns/개', '메모리 바이트/개']
+    for i, label in enumerate(labels):
+        old, new = rows[0][i], rows[1][i]
+        old = '-' if old is None else f'{old:.1f}'
+        print(f'{label:<22} {old:>12} {new:>12.1f}')
+
+    print(f'ArrayLinkedList 대량 삽입/정리 ({n:,}개)')
+    grown = timed(lambda: build_last(lambda _: ArrayLinkedList(1), n)) / n * 1e9
+    presized = timed(lambda: build_last(ArrayLinkedList, n)) / n * 1e9
+    bulk = timed(lambda: ArrayLinkedList(1).extend(range(n))) / n * 1e9
+    print(f'add_last 용량 1에서 늘리며 {grown:.1f} ns/개, 미리 잡은 용량 {presized:.1f} ns/개, '
+          f'extend {bulk:.1f} ns/개')
+    lst = shuffled(n)
+    before = timed(lambda: sum(lst)) / n * 1e9
+    spent = timed(lst.compact) / n * 1e9
+    after = timed(lambda: sum(lst)) / n * 1e9
+    print(f'순회: 뒤섞인 슬롯 {before:.1f} ns/개, compact {spent:.1f} ns/개, 정리 후 {after:.1f} ns/개')
+
+if __name__ == '__main__':
+    main()
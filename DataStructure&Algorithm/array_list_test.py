@@ -4,7 +4,7 @@ from array_list import ArrayLinkedList
 Menu = Enum('Menu', ['머리에노드삽입','꼬리에노드삽입', '머리노드삭제',
                      '꼬리노드삭제', '주목노드출력', '주목노드이동',
                      '주목노드삭제', '모든노드삭제', '검색', '멤버십판단',
-                     '모든노드출력', '스캔', '종료'])
+                     '모든노드출력', '스캔', '꼬리에여러노드삽입', '슬롯정리', '종료'])
 
 def select_Menu() ->Menu:
     s = [f'({m.value}){m.name}' for m in Menu]
@@ -58,5 +58,12 @@ while True:
     elif menu == Menu.스캔:
         for e in lst:
             print(e)
+
+    elif menu == Menu.꼬리에여러노드삽입:
+        lst.extend(int(x) for x in input('꼬리 노드에 넣을 값들을 공백으로 구분해 입력하세요.: ').split())
+
+    elif menu == Menu.슬롯정리:
+        lst.compact()
+        lst.dump()
     else:
         break
\ No newline at end of file
@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import Any, Type
+import sys
 
 class Node:
+    __slots__ = ('key', 'value', 'left', 'right')
+
     def __init__(self, key: Any, value: Any, left: Node = None, right:Node = None):
         self.key = key
         self.value = value
@@ -23,25 +26,23 @@ class BinarySearchTree:
             else:
                 p = p.right
     def add(self, key: Any, value:Any) -> bool:
-        def add_node(node: Node, key: Any, value: Any)->None:
-            if key == node.key:
-                return False
-            elif key < node.key:
-                if node.left is None:
-                    node.left = Node(key, value, None, None)
-                else:
-                    add_node(node.left, key, value)
-            else:
-                if node.right is None:
-                    node.right = Node(key, value, None, None)
-                else:
-                    add_node(node.right, key, value)
-            return True
         if self.root is None:
             self.root = Node(key, value, None, None)
             return True
-        else:
-            return add_node(self.root, key, value)
+        p = self.root
+        while True:
+            if key == p.key:
+                return False
+            elif key < p.key:
+                if p.left is None:
+                    p.left = Node(key, value, None, None)
+                    return True
+                p = p.left
+            else:
+                if p.right is None:
+                    p.right = Node(key, value, None, None)
+                    return True
+                p = p.right
     def remove(self, key:Any) -> bool:
         p = self.root
         parent = None
@@ -103,17 +104,144 @@ class BinarySearchTree:
         while p.right is not None:
             p = p.right
         return p.key
+    def memory_usage(self) -> float:
+        # 원소 하나당 바이트 (노드만, 키와 값 객체 자체는 빼고 센다)
+        size = no = 0
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            p = stack.pop()
+            size += sys.getsizeof(p)
+            no += 1
+            if p.left is not None:
+                stack.append(p.left)
+            if p.right is not None:
+                stack.append(p.right)
+        return size / no if no else 0.0
     def dump(self, reverse = False) -> None:
-        def print_subtree(node: Node):
-            if node is not None:
-                print_subtree(node.left)
-                print(f'{node.key}  {node.value}')
-                print_subtree(node.right)
+        stack = []
+        p = self.root
+        while stack or p is not None:
+            if p is not None:
+                stack.append(p)
+                p = p.right if reverse else p.left
+            else:
+                p = stack.pop()
+                print(f'{p.key}  {p.value}')
+                p = p.left if reverse else p.right
+
+class AVLNode(Node):
+    __slots__ = ('height',)
+
+    def __init__(self, key: Any, value: Any, left: AVLNode = None, right: AVLNode = None):
+        super().__init__(key, value, left, right)
+        self.height = 1
+
+class AVLTree(BinarySearchTree):
+    # 좌우 서브트리의 높이 차가 1 이하가 되도록 삽입/삭제 뒤 회전하는 이진 검색 트리 (높이 O(log n))
+    # search, min_key, max_key, dump는 BinarySearchTree 것을 그대로 쓴다
+    def add(self, key: Any, value: Any) -> bool:
+        path = []
+        p = self.root
+        while p is not None:
+            if key == p.key:
+                return False
+            path.append(p)
+            p = p.left if key < p.key else p.right
+        node = AVLNode(key, value)
+        if not path:
+            self.root = node
+        elif key < path[-1].key:
+            path[-1].left = node
+        else:
+            path[-1].right = node
+        self.rebalance(path)
+        return True
+
+    def remove(self, key: Any) -> bool:
+        path = []
+        p = self.root
+        while p is not None and key != p.key:
+            path.append(p)
+            p = p.left if key < p.key else p.right
+        if p is None:
+            return False
+        if p.left is not None and p.right is not None:
+            path.append(p)
+            left = p.left
+            while left.right is not None:
+                path.append(left)
+                left = left.right
+            p.key = left.key
+            p.value = left.value
+            p = left
+        child = p.left if p.left is not None else p.right
+        if not path:
+            self.root = child
+        elif path[-1].left is p:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self.rebalance(path)
+        return True
+
+    def rebalance(self, path: list) -> None:
+        # 바뀐 곳에서 루트 쪽으로 거슬러 올라가며 높이를 고치고 회전한다. 서브트리 높이가 그대로면 멈춘다
+        for i in range(len(path) - 1, -1, -1):
+            p = path[i]
+            old = p.height
+            lh = p.left.height if p.left is not None else 0
+            rh = p.right.height if p.right is not None else 0
+            if -1 <= lh - rh <= 1:
+                p.height = (lh if lh > rh else rh) + 1
+                if p.height == old:
+                    break
+                continue
+            q = self.balance(p)
+            if q is not p:
+                if i == 0:
+                    self.root = q
+                elif path[i - 1].left is p:
+                    path[i - 1].left = q
+                else:
+                    path[i - 1].right = q
+            if q.height == old:
+                break
+
+    def balance(self, p: AVLNode) -> AVLNode:
+        self.update(p)
+        diff = self.height(p.left) - self.height(p.right)
+        if diff > 1:
+            if self.height(p.left.left) < self.height(p.left.right):
+                p.left = self.rotate_left(p.left)
+            return self.rotate_right(p)
+        if diff < -1:
+            if self.height(p.right.right) < self.height(p.right.left):
+                p.right = self.rotate_right(p.right)
+            return self.rotate_left(p)
+        return p
+
+    @staticmethod
+    def height(node: AVLNode) -> int:
+        return node.height if node is not None else 0
+
+    @staticmethod
+    def update(node: AVLNode) -> None:
+        node.height = max(AVLTree.height(node.left), AVLTree.height(node.right)) + 1
 
-        def print_subtree_rev(node: Node):
-            if node is not None:
-                print_subtree_rev(node.right)
-                print(f'{node.key}  {node.value}')
-                print_subtree_rev(node.left)
+    @staticmethod
+    def rotate_right(node: AVLNode) -> AVLNode:
+        left = node.left
+        node.left = left.right
+        left.right = node
+        AVLTree.update(node)
+        AVLTree.update(left)
+        return left
 
-        print_subtree_rev(self.root) if reverse else print_subtree(self.root)
\ No newline at end of file
+    @staticmethod
+    def rotate_left(node: AVLNode) -> AVLNode:
+        right = node.right
+        node.right = right.left
+        right.left = node
+        AVLTree.update(node)
+        AVLTree.update(right)
+        return right
\ No newline at end of file
@@ -0,0 +1,55 @@
+from __future__ import annotations
+import random
+import sys
+import time
+
+from bst import AVLTree, BinarySearchTree
+
+def tree_height(tree: BinarySearchTree) -> int:
+    best = 0
+    stack = [(tree.root, 1)] if tree.root is not None else []
+    while stack:
+        p, depth = stack.pop()
+        best = max(best, depth)
+        for child in (p.left, p.right):
+            if child is not None:
+                stack.append((child, depth + 1))
+    return best
+
+def streams(n: int) -> dict:
+    keys = list(range(n))
+    shuffled = keys[:]
+    random.Random(0).shuffle(shuffled)
+    return {'정렬': keys, '역순': keys[::-1], '무작위': shuffled}
+
+def run(cls: type, keys: list) -> tuple:
+    tree = cls()
+    t0 = time.perf_counter()
+    for k in keys:
+        tree.add(k, k)
+    build = time.perf_counter() - t0
+    h = tree_height(tree)
+    probes = keys[::max(1, len(keys) // 1000)]
+    t0 = time.perf_counter()
+    for k in probes:
+        tree.search(k)
+    search = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for k in keys:
+        tree.remove(k)
+    remove = time.perf_counter() - t0
+    return h, build / len(keys) * 1e6, search / len(probes) * 1e6, remove / len(keys) * 1e6
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    small = min(n, 3000)  # 정렬/역순 키로 만든 BinarySearchTree는 한 줄이 되어 삽입이 O(n)
+    print(f'키 {n:,}개 (정렬/역순 BinarySearchTree는 {small:,}개)')
+    print(f'{"":<8} {"":<26} {"높이":>6} {"삽입 us/개":>10} {"검색 us/개":>10} {"삭제 us/개":>10}')
+    for name, keys in streams(n).items():
+        for cls in (BinarySearchTree, AVLTree):
+            use = keys if cls is AVLTree or name == '무작위' else streams(small)[name]
+            h, build, search, remove = run(cls, use)
+            print(f'{name:<8} {cls.__name__ + f" ({len(use):,})":<26} {h:>6} {build:>10.2f} {search:>10.2f} {remove:>10.2f}')
+
+if __name__ == '__main__':
+    main()
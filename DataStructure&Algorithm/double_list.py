@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import Any, Type
+import sys
 
 class Node:
+    __slots__ = ('data', 'prev', 'next')
+
     def __init__(self, data: Any = None,  prev:Node = None, next:Node = None) -> None:
         
         self.data = data
@@ -96,6 +99,14 @@ class DoubleLinkedList:
         while not self.is_empty():
             self.remove_first()
         self.no = 0
+    def memory_usage(self) -> float:
+        # 원소 하나당 바이트 (머리 노드 포함, 데이터 객체 자체는 빼고 센다)
+        size = sys.getsizeof(self.head)
+        ptr = self.head.next
+        while ptr is not self.head:
+            size += sys.getsizeof(ptr)
+            ptr = ptr.next
+        return size / self.no if self.no else 0.0
     def __iter__(self) -> DoubleLinkedListIterator:
         return DoubleLinkedListIterator(self.head)
     def __reversed__(self) -> DoubleLinkedListIterator:
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from typing import Any, Type
+import sys
 
 class Node:
-
+    __slots__ = ('data', 'next')
 
     def __init__(self, data: Any = None, next: Node = None):
         """초기화"""
@@ -11,21 +12,53 @@ class Node:
 
 
 class LinkedList:
+    # tail: 꼬리 노드 (add_last가 O(1))
+    # index: index=True로 만들면 데이터 -> 그 데이터를 가진 노드 (같은 데이터가 여럿이면 노드들의 딕셔너리)
+    #        데이터는 해시 가능해야 한다
 
-
-    def __init__(self) -> None:
+    def __init__(self, index: bool = False) -> None:
 
         self.no = 0         
         self.head = None   
         self.current = None  
+        self.tail = None
+        self.index = {} if index else None
 
     def __len__(self) -> int:
 
         return self.no
 
+    def index_add(self, node: Node) -> None:
+
+        if self.index is not None:
+            nodes = self.index.get(node.data)
+            if nodes is None:
+                self.index[node.data] = node
+            elif type(nodes) is dict:
+                nodes[node] = None
+            else:
+                self.index[node.data] = {nodes: None, node: None}
+
+    def index_remove(self, node: Node) -> None:
+
+        if self.index is not None:
+            nodes = self.index[node.data]
+            if nodes is node:
+                del self.index[node.data]
+            else:
+                del nodes[node]
+                if len(nodes) == 1:
+                    self.index[node.data] = next(iter(nodes))
+
+    def indexed(self, node: Node) -> bool:
+
+        nodes = self.index.get(node.data)
+        return nodes is node or type(nodes) is dict and node in nodes
 
     def search(self, data: Any) -> int:
 
+        if self.index is not None and data not in self.index:
+            return -1
         cnt = 0
         ptr = self.head
         while ptr is not None:
@@ -38,6 +71,8 @@ class LinkedList:
 
     def __contains__(self, data: Any) -> bool:
 
+        if self.index is not None:
+            return data in self.index
         return self.search(data) >= 0
 
 
@@ -45,6 +80,9 @@ class LinkedList:
      
         ptr = self.head 
         self.head = self.current = Node(data, ptr)
+        if ptr is None:
+            self.tail = self.head
+        self.index_add(self.head)
         self.no += 1
 
 
@@ -53,18 +91,21 @@ class LinkedList:
         if self.head is None :    
             self.add_first(data)  
         else:
-            ptr = self.head
-            while ptr.next is not None:
-                ptr = ptr.next  
-            ptr.next = self.current = Node(data, None)
+            node = Node(data, None)
+            self.tail.next = node
+            self.tail = self.current = node
+            self.index_add(node)
             self.no += 1
 
 
     def remove_first(self) -> None:
         
         if self.head is not None: 
+            self.index_remove(self.head)
             self.head = self.current = self.head.next
-        self.no -= 1
+            if self.head is None:
+                self.tail = None
+            self.no -= 1
 
 
     def remove_last(self):
@@ -73,22 +114,23 @@ class LinkedList:
             if self.head.next is None :  
                 self.remove_first()      
             else:
-                ptr = self.head  
                 pre = self.head  
 
-                while ptr.next is not None:
-                    pre = ptr
-                    ptr = ptr.next 
+                while pre.next is not self.tail:
+                    pre = pre.next
+                self.index_remove(self.tail)
                 pre.next = None  
-                self.current = pre
+                self.tail = self.current = pre
                 self.no -= 1
 
 
     def remove(self, p: Node) -> None:
 
-        if self.head is not None:
+        if self.head is not None and p is not None:
             if p is self.head:      
                 self.remove_first() 
+            elif self.index is not None and not self.indexed(p):
+                return  # 리스트에 없는 노드: 앞 노드를 찾아 끝까지 훑지 않는다
             else:
                 ptr = self.head
 
@@ -97,19 +139,34 @@ class LinkedList:
                     if ptr is None:
                         return 
                 ptr.next = p.next
+                if p is self.tail:
+                    self.tail = ptr
+                self.index_remove(p)
                 self.current = ptr
                 self.no -= 1
 
+    def memory_usage(self) -> float:
+        # 원소 하나당 바이트 (노드와 색인, 데이터 객체 자체는 빼고 센다)
+        size = 0
+        ptr = self.head
+        while ptr is not None:
+            size += sys.getsizeof(ptr)
+            ptr = ptr.next
+        if self.index is not None:
+            size += sys.getsizeof(self.index) + sum(sys.getsizeof(nodes) for nodes in self.index.values()
+                                                    if type(nodes) is dict)
+        return size / self.no if self.no else 0.0
+
     def remove_current_node(self) -> None:
 
         self.remove(self.current)
 
     def clear(self) -> None:
 
-        while self.head is not None:  
-            self.remove_first()      
-        self.current = None
+        self.head = self.current = self.tail = None
         self.no = 0
+        if self.index is not None:
+            self.index.clear()
 
     def next(self) -> bool:
  
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from array_list import ArrayLinkedList
+from bst import AVLTree, BinarySearchTree
+from double_list import DoubleLinkedList
+from linked_list import LinkedList
+
+def build_linked(keys: list):
+    lst = LinkedList()
+    for k in keys:
+        lst.add_last(k)
+    return lst
+
+def build_indexed(keys: list):
+    lst = LinkedList(index=True)
+    for k in keys:
+        lst.add_last(k)
+    return lst
+
+def build_double(keys: list):
+    lst = DoubleLinkedList()
+    for k in keys:
+        lst.add_last(k)
+    return lst
+
+def build_bst(keys: list):
+    tree = BinarySearchTree()
+    for k in keys:
+        tree.add(k, k)
+    return tree
+
+def build_avl(keys: list):
+    tree = AVLTree()
+    for k in keys:
+        tree.add(k, k)
+    return tree
+
+def build_array(keys: list):
+    lst = ArrayLinkedList(1)
+    lst.extend(keys)
+    return lst
+
+def build_list(keys: list):
+    return list(keys)
+
+BUILDERS = {
+    'LinkedList': build_linked,
+    'LinkedList(index)': build_indexed,
+    'DoubleLinkedList': build_double,
+    'BinarySearchTree': build_bst,
+    'AVLTree': build_avl,
+    'ArrayLinkedList': build_array,
+    'list': build_list,
+}
+
+def peak_rss() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # 리눅스는 KB 단위
+
+def child(name: str, n: int) -> None:
+    # 자료구조 하나만 만들고 (최대 RSS 증가분, 만든 시간, memory_usage) 출력
+    keys = list(range(n))
+    if name == 'BinarySearchTree':
+        random.Random(0).shuffle(keys)  # 정렬된 키는 한쪽으로 치우친 트리가 된다 (AVLTree는 정렬된 그대로)
+    base = peak_rss()
+    t0 = time.perf_counter()
+    built = BUILDERS[name](keys)
+    elapsed = time.perf_counter() - t0
+    usage = built.memory_usage() if hasattr(built, 'memory_usage') else sys.getsizeof(built) / n
+    print(peak_rss() - base, elapsed, usage)
+
+def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], int(sys.argv[3]))
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    print(f'원소 수 {n:,} (자료구조마다 따로 프로세스를 띄워 잰다)')
+    print(f'{"":<18} {"만든 시간 s":>10} {"최대 RSS 증가 MB":>16} {"RSS 바이트/개":>13} {"memory_usage":>12}')
+    for name in BUILDERS:
+        out = subprocess.run([sys.executable, __file__, '--child', name, str(n)],
+                             capture_output=True, text=True, check=True).stdout.split()
+        rss, elapsed, usage = int(out[0]), float(out[1]), float(out[2])
+        print(f'{name:<18} {elapsed:>10.2f} {rss / 2 ** 20:>16.1f} {rss / n:>13.1f} {usage:>12.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# Programmatic controllers for the 2P arena (game.py)
+# A controller is any callable controller(arena, me, other, now_ms) -> IN_* bits; set it as player.controller
+# or pass bot names to game.py (--p1/--p2) and tournament.py.
+import random
+
+import game
+from game import IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_SWING, IN_BOOST, PLAYER_SIZE, SWORD_LENGTH, SWORD_THICKNESS
+
+# Centre offsets (along, across the facing axis) at which the sword overlaps the opponent
+REACH = PLAYER_SIZE + SWORD_LENGTH
+ACROSS = (PLAYER_SIZE + SWORD_THICKNESS) // 2
+FACING = {"right": (1, 0), "left": (-1, 0), "down": (0, 1), "up": (0, -1)}
+
+
+def sign(v):
+    return (v > 0) - (v < 0)
+
+
+def move_bits(dx, dy):
+    bits = 0
+    if dx < 0:
+        bits |= IN_LEFT
+    elif dx > 0:
+        bits |= IN_RIGHT
+    if dy < 0:
+        bits |= IN_UP
+    elif dy > 0:
+        bits |= IN_DOWN
+    return bits
+
+
+def in_reach(me, other):
+    # Would a sword swung now (in the current facing) overlap the opponent?
+    fx, fy = FACING[me.facing]
+    dx = other.rect.centerx - me.rect.centerx
+    dy = other.rect.centery - me.rect.centery
+    along = dx * fx + dy * fy
+    across = dy * fx - dx * fy
+    return 0 < along < REACH and abs(across) < ACROSS
+
+
+def can_swing(me, now_ms):
+    return not me.sword_active and now_ms - me.last_attack_time >= game.ATTACK_COOLDOWN_MS  # may be tuned at runtime
+
+
+class IdleBot:
+    # Stands still; a baseline opponent
+    def __init__(self, seed=None):
+        pass
+
+    def __call__(self, arena, me, other, now_ms):
+        return 0
+
+
+class RandomBot:
+    # Holds a random direction for `hold` ticks, swings and boosts at random
+    def __init__(self, seed=None, hold=20, swing_chance=0.05, boost_chance=0.01):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.swing_chance = swing_chance
+        self.boost_chance = boost_chance
+        self.ticks = 0
+        self.move = 0
+
+    def __call__(self, arena, me, other, now_ms):
+        rng = self.rng
+        if self.ticks % self.hold == 0:
+            self.move = move_bits(rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+        self.ticks += 1
+        bits = self.move
+        if rng.random() < self.swing_chance:
+            bits |= IN_SWING
+        if rng.random() < self.boost_chance:
+            bits |= IN_BOOST
+        return bits
+
+
+class ChaseBot:
+    # Closes in from the side, swings once the opponent is in reach and boosts across long gaps.
+    # Below heal_below HP it goes for the nearest item instead (if there is one).
+    # Horizontal steps decide facing (see Player.apply_input), so it lines up vertically while stepping sideways.
+    # With probability `hesitate` a tick repeats the previous input (seeded), so mirrored bots don't always tie.
+    def __init__(self, seed=None, boost_range=300, heal_below=0, hesitate=0.2):
+        self.rng = random.Random(seed)
+        self.boost_range = boost_range
+        self.heal_below = heal_below
+        self.hesitate = hesitate
+        self.last = 0
+
+    def __call__(self, arena, me, other, now_ms):
+        if self.rng.random() < self.hesitate:
+            return self.last & ~IN_SWING
+        self.last = bits = self.decide(arena, me, other, now_ms)
+        return bits
+
+    def decide(self, arena, me, other, now_ms):
+        mx, my = me.rect.center
+        if me.hp < self.heal_below and arena.items:
+            item = min(arena.items, key=lambda i: abs(i.rect.centerx - mx) + abs(i.rect.centery - my))
+            return move_bits(item.rect.centerx - mx, item.rect.centery - my)
+
+        dx = other.rect.centerx - mx
+        dy = other.rect.centery - my
+        bits = 0
+        if in_reach(me, other):
+            if can_swing(me, now_ms) and not other.invincible:
+                bits |= IN_SWING
+            # Stay in the sweet spot; standing still keeps the facing
+            if abs(dy) < ACROSS // 2 and abs(dx) > PLAYER_SIZE // 2:
+                return bits
+        want_x = sign(dx)
+        want_y = sign(dy) if abs(dy) >= ACROSS // 2 else 0
+        bits |= move_bits(want_x, want_y)
+        if abs(dx) + abs(dy) > self.boost_range:
+            bits |= IN_BOOST
+        return bits
+
+
+class KiteBot(ChaseBot):
+    # ChaseBot that backs off while its sword is on cooldown and heals when hurt
+    def __init__(self, seed=None, boost_range=300, heal_below=30, hesitate=0.2):
+        super().__init__(seed, boost_range, heal_below, hesitate)
+
+    def decide(self, arena, me, other, now_ms):
+        if can_swing(me, now_ms) or (me.hp < self.heal_below and arena.items):
+            return super().decide(arena, me, other, now_ms)
+        dx = other.rect.centerx - me.rect.centerx
+        dy = other.rect.centery - me.rect.centery
+        return move_bits(-sign(dx), -sign(dy))
+
+
+BOTS = {"idle": IdleBot, "random": RandomBot, "chase": ChaseBot, "kite": KiteBot}
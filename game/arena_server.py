@@ -0,0 +1,425 @@
+# Networked 2P Sword Arena: an asyncio TCP server owns every match and steps them all on one fixed-rate tick.
+# Clients only send their IN_* input bits (when they change, plus swing presses); after each tick the server sends
+# both players a delta frame with just the fields that changed (a full keyframe every KEYFRAME_TICKS).
+# Clients rebuild the match in a mirror Arena, so the same bots (arena_bots.py) and drawing code work on it.
+# Usage:
+#   python arena_server.py serve [--port 7777]
+#   python arena_server.py bots --matches 100 --seconds 10 [--connect HOST:PORT]   (in-process server unless --connect)
+#   python arena_server.py play --connect HOST:PORT                                (WASD + SPACE + F)
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import struct
+import time
+
+import pygame
+
+from game import Arena, Item, FPS, IN_SWING, P1_CONTROLS, KeyboardController
+from arena_bots import BOTS
+
+MSG_JOIN = 1    # server -> client: side (0 = P1, 1 = P2), match id, tick rate
+MSG_STATE = 2   # server -> client: tick, changed-field mask, changed fields in FIELDS order
+MSG_INPUT = 3   # client -> server: input bits
+
+FRAME = struct.Struct("<B")  # every message is prefixed with its length
+JOIN = struct.Struct("<BBIB")
+STATE = struct.Struct("<BIH")
+INPUT = struct.Struct("<BB")
+
+# Per player: position, facing + flags, hp, boost cooldown end (match ms, changes only when a boost starts);
+# then items and game over
+PLAYER_FIELDS = (struct.Struct("<hh"), struct.Struct("<B"), struct.Struct("<h"), struct.Struct("<I"))
+ITEM_POS = struct.Struct("<hh")
+OVER = struct.Struct("<B")
+N_FIELDS = 2 * len(PLAYER_FIELDS) + 2
+ALL_FIELDS = (1 << N_FIELDS) - 1
+FACINGS = ("up", "down", "left", "right")
+KEYFRAME_TICKS = FPS * 2
+RESTART_TICKS = FPS * 3  # pause after a KO before the next round
+
+
+def player_values(p):
+    flags = FACINGS.index(p.facing) | p.sword_active << 2 | p.is_boosting << 3 | p.invincible << 4 | p.visible << 5
+    return (PLAYER_FIELDS[0].pack(*p.rect.topleft), PLAYER_FIELDS[1].pack(flags), PLAYER_FIELDS[2].pack(p.hp),
+            PLAYER_FIELDS[3].pack(p.boost_cd_until))
+
+
+def state_fields(arena):
+    # Every field packed on its own, in FIELDS order; deltas compare these byte strings
+    items = bytes([len(arena.items)]) + b"".join(ITEM_POS.pack(*i.rect.topleft) for i in arena.items)
+    return player_values(arena.p1) + player_values(arena.p2) + (items, OVER.pack(arena.game_over))
+
+
+def frame(payload):
+    return FRAME.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    size = (await reader.readexactly(1))[0]
+    return await reader.readexactly(size)
+
+
+def no_delay(writer):
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class Match:
+    # One arena and its two connections; inputs are held until the next tick, swing presses until a tick uses them
+    def __init__(self, match_id, writers, seed):
+        self.id = match_id
+        self.arena = Arena(0, random.Random(seed))
+        self.writers = writers
+        self.held = [0, 0]
+        self.swing = [0, 0]
+        self.sent = None   # fields of the last frame sent
+        self.tick = 0
+        self.over_ticks = 0
+        self.bytes_out = 0
+
+    def set_input(self, side, bits):
+        self.held[side] = bits & ~IN_SWING
+        self.swing[side] |= bits & IN_SWING
+
+    def step(self):
+        self.tick += 1
+        now = self.tick * 1000 // FPS
+        arena = self.arena
+        if arena.game_over:
+            self.over_ticks += 1
+            if self.over_ticks >= RESTART_TICKS:
+                arena.restart()
+                self.over_ticks = 0
+        arena.step(now, self.held[0] | self.swing[0], self.held[1] | self.swing[1])
+        self.swing = [0, 0]
+
+        fields = state_fields(arena)
+        if self.sent is None or self.tick % KEYFRAME_TICKS == 0:
+            mask = ALL_FIELDS
+        else:
+            mask = 0
+            for i, (new, old) in enumerate(zip(fields, self.sent)):
+                if new != old:
+                    mask |= 1 << i
+        self.sent = fields
+        msg = frame(STATE.pack(MSG_STATE, self.tick, mask) + b"".join(f for i, f in enumerate(fields) if mask >> i & 1))
+        for w in self.writers:
+            w.write(msg)
+        self.bytes_out += len(msg) * len(self.writers)
+
+
+class ArenaServer:
+    def __init__(self, rate=FPS, seed=0):
+        self.rate = rate
+        self.seed = seed
+        self.matches = {}
+        self.waiting = None  # (writer, joined future) of a client without an opponent yet
+        self.next_id = 0
+        self.handlers = set()
+        # Stats since the last report
+        self.tick_cpu = []   # server CPU seconds per tick (all matches)
+        self.match_ticks = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.late = 0
+
+    async def handle(self, reader, writer):
+        # Pair connections two by two; each connection then just feeds its input bits into its match
+        no_delay(writer)
+        self.handlers.add(asyncio.current_task())
+        if self.waiting is None:
+            joined = asyncio.get_running_loop().create_future()
+            self.waiting = (writer, joined)
+            # Keep reading while unpaired so a client that hangs up is dropped instead of handed to the next one
+            read = asyncio.ensure_future(read_message(reader))
+            while not joined.done():
+                await asyncio.wait((joined, read), return_when=asyncio.FIRST_COMPLETED)
+                if joined.done():
+                    break
+                if read.exception() is None:  # input before the match starts has nothing to steer
+                    read = asyncio.ensure_future(read_message(reader))
+                    continue
+                self.waiting = None
+                writer.close()
+                self.handlers.discard(asyncio.current_task())
+                return
+            match, side = joined.result()
+            if match is None:  # server closing
+                read.cancel()
+                self.handlers.discard(asyncio.current_task())
+                return
+        else:
+            other, joined = self.waiting
+            self.waiting = None
+            match = Match(self.next_id, [other, writer], self.seed + self.next_id)
+            self.next_id += 1
+            self.matches[match.id] = match
+            for s, w in enumerate(match.writers):
+                w.write(frame(JOIN.pack(MSG_JOIN, s, match.id, self.rate)))
+            joined.set_result((match, 0))
+            side = 1
+            read = None
+        try:
+            while True:
+                msg = await (read or read_message(reader))
+                read = None
+                self.bytes_in += len(msg) + 1
+                if msg[0] == MSG_INPUT:
+                    match.set_input(side, INPUT.unpack(msg)[1])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # Either player leaving ends the match for both
+            self.handlers.discard(asyncio.current_task())
+            if self.matches.pop(match.id, None) is not None:
+                for w in match.writers:
+                    w.close()
+
+    async def close(self):
+        # Hang up on everyone and let the connection handlers finish
+        if self.waiting is not None:
+            writer, joined = self.waiting
+            self.waiting = None
+            writer.close()
+            joined.set_result((None, None))
+        for match in list(self.matches.values()):
+            for w in match.writers:
+                w.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+
+    async def run(self):
+        # Fixed-rate ticker; when a tick overruns, later ticks start late instead of bunching up
+        loop = asyncio.get_running_loop()
+        dt = 1 / self.rate
+        deadline = loop.time()
+        while True:
+            cpu = time.process_time()
+            for match in list(self.matches.values()):
+                match.step()
+                self.match_ticks += 1
+                self.bytes_out += match.bytes_out
+                match.bytes_out = 0
+            self.tick_cpu.append(time.process_time() - cpu)
+            deadline += dt
+            delay = deadline - loop.time()
+            if delay < 0:
+                self.late += 1
+                deadline = loop.time()
+            await asyncio.sleep(max(0.0, delay))
+
+    def report(self, seconds):
+        # One line of stats for the last `seconds`, then reset them
+        cpu_ms = sorted(t * 1000 for t in self.tick_cpu) or [0.0]
+        match_ticks = self.match_ticks or 1
+        print(f"{len(self.matches):>4} matches  {len(self.tick_cpu) / seconds:>5.1f} ticks/s  "
+              f"tick cpu {statistics.fmean(cpu_ms):.3f} ms (p99 {cpu_ms[int(len(cpu_ms) * 0.99)]:.3f}, "
+              f"{statistics.fmean(cpu_ms) * self.rate / 10:.1f}% of a core)  "
+              f"out {self.bytes_out / match_ticks:.1f} B/tick/match  in {self.bytes_in / match_ticks:.2f} B/tick/match  "
+              f"late {self.late}")
+        self.tick_cpu.clear()
+        self.match_ticks = self.bytes_out = self.bytes_in = self.late = 0
+
+
+class ArenaMirror:
+    # Client-side copy of one match, rebuilt from the server's frames (positions, flags, hp, items, game over)
+    def __init__(self):
+        self.arena = Arena(0)
+        self.side = None
+        self.match_id = None
+        self.tick = 0
+        self.now = 0
+
+    def players(self):
+        # (me, other)
+        p1, p2 = self.arena.p1, self.arena.p2
+        return (p1, p2) if self.side == 0 else (p2, p1)
+
+    def apply(self, msg):
+        if msg[0] == MSG_JOIN:
+            _, self.side, self.match_id, _ = JOIN.unpack(msg)
+            return
+        _, self.tick, mask = STATE.unpack_from(msg)
+        self.now = self.tick * 1000 // FPS
+        pos = STATE.size
+        arena = self.arena
+        for i in range(N_FIELDS):
+            if not mask >> i & 1:
+                continue
+            if i < 2 * len(PLAYER_FIELDS):
+                p = arena.p1 if i < len(PLAYER_FIELDS) else arena.p2
+                kind = i % len(PLAYER_FIELDS)
+                values = PLAYER_FIELDS[kind].unpack_from(msg, pos)
+                pos += PLAYER_FIELDS[kind].size
+                if kind == 0:
+                    p.prev_pos = p.rect.topleft
+                    p.rect.topleft = values
+                elif kind == 1:
+                    flags = values[0]
+                    sword = bool(flags & 4)
+                    if sword and not p.sword_active:
+                        p.last_attack_time = self.now  # bots check the attack cooldown with it
+                    p.facing = FACINGS[flags & 3]
+                    p.sword_active, p.is_boosting = sword, bool(flags & 8)
+                    p.invincible, p.visible = bool(flags & 16), bool(flags & 32)
+                elif kind == 2:
+                    p.hp = values[0]
+                else:
+                    p.boost_cd_until = values[0]
+            elif i == N_FIELDS - 2:
+                n = msg[pos]
+                pos += 1
+                arena.items = [Item(ITEM_POS.unpack_from(msg, pos + k * ITEM_POS.size)) for k in range(n)]
+                pos += n * ITEM_POS.size
+            else:
+                arena.game_over = bool(OVER.unpack_from(msg, pos)[0])
+                pos += OVER.size
+
+
+async def connect(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    no_delay(writer)
+    return reader, writer
+
+
+async def bot_client(host, port, bot, stats):
+    # Loopback load-test client: answers every frame with the bot's input (sent only when it changes)
+    reader, writer = await connect(host, port)
+    mirror = ArenaMirror()
+    last = None
+    try:
+        while True:
+            msg = await read_message(reader)
+            stats["bytes"] += len(msg) + 1
+            mirror.apply(msg)
+            if msg[0] != MSG_STATE:
+                continue
+            me, other = mirror.players()
+            bits = bot(mirror.arena, me, other, mirror.now)
+            if bits != last or bits & IN_SWING:
+                writer.write(frame(INPUT.pack(MSG_INPUT, bits)))
+                last = bits
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_bots(matches, seconds, bot_names, connect_to=None, seed=0):
+    # 2 * matches bot clients in this process, against an in-process server unless connect_to is given
+    server = ticker = None
+    if connect_to:
+        host, port = connect_to
+    else:
+        server = ArenaServer(seed=seed)
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        host, port = listener.sockets[0].getsockname()[:2]
+        ticker = asyncio.create_task(server.run())
+    stats = {"bytes": 0}
+    rng = random.Random(seed)
+    clients = [asyncio.create_task(bot_client(host, port, BOTS[bot_names[k % 2]](rng.getrandbits(32)), stats))
+               for k in range(2 * matches)]
+    start = time.perf_counter()
+    cpu = time.process_time()
+    for _ in range(int(seconds)):
+        await asyncio.sleep(1)
+        if server:
+            server.report(1)
+    elapsed = time.perf_counter() - start
+    print(f"{2 * matches} clients received {stats['bytes'] / elapsed / 1024:.1f} KiB/s; process cpu "
+          f"{(time.process_time() - cpu) / elapsed:.0%} of a core (server + clients)")
+    for task in clients:
+        task.cancel()
+    await asyncio.gather(*clients, return_exceptions=True)
+    if server:
+        ticker.cancel()
+        listener.close()
+        await server.close()
+
+
+async def serve(port, seed):
+    server = ArenaServer(seed=seed)
+    listener = await asyncio.start_server(server.handle, "0.0.0.0", port)
+    print(f"arena server on port {port}, {FPS} ticks/s")
+    ticker = asyncio.create_task(server.run())
+    async with listener:
+        while True:
+            await asyncio.sleep(5)
+            server.report(5)
+            if ticker.done():
+                ticker.result()
+
+
+async def play(host, port):
+    # Keyboard client: one player per machine (WASD, SPACE swing, F boost), the mirror is drawn with Arena.draw()
+    from game import WIDTH, HEIGHT
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("2P Sword Arena (online)")
+    font = pygame.font.SysFont("consolas", 18)
+    big_font = pygame.font.SysFont("consolas", 32, bold=True)
+    reader, writer = await connect(host, port)
+    mirror = ArenaMirror()
+    controller = KeyboardController(P1_CONTROLS)
+    last = None
+    try:
+        while True:
+            msg = await read_message(reader)
+            mirror.apply(msg)
+            if msg[0] != MSG_STATE:
+                pygame.display.set_caption(f"2P Sword Arena (online) - match {mirror.match_id}, P{mirror.side + 1}")
+                continue
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return
+                if event.type == pygame.KEYDOWN:
+                    controller.key_down(event.key)
+            me, other = mirror.players()
+            me.controls = P1_CONTROLS
+            bits = controller(mirror.arena, me, other, mirror.now)
+            if bits != last or bits & IN_SWING:
+                writer.write(frame(INPUT.pack(MSG_INPUT, bits)))
+                last = bits
+            mirror.arena.draw(screen, font, big_font, mirror.now)
+            pygame.display.flip()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        print("disconnected")
+    finally:
+        writer.close()
+        pygame.quit()
+
+
+def parse_address(text):
+    host, port = text.rsplit(":", 1)
+    return host, int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="2P Sword Arena network server")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    p = sub.add_parser("serve")
+    p.add_argument("--port", type=int, default=7777)
+    p.add_argument("--seed", type=int, default=0)
+    p = sub.add_parser("bots", help="load test with bot clients in this process")
+    p.add_argument("--matches", type=int, default=50)
+    p.add_argument("--seconds", type=int, default=10)
+    p.add_argument("--p1", choices=BOTS, default="chase")
+    p.add_argument("--p2", choices=BOTS, default="kite")
+    p.add_argument("--connect", type=parse_address, metavar="HOST:PORT", help="use a running server instead")
+    p.add_argument("--seed", type=int, default=0)
+    p = sub.add_parser("play")
+    p.add_argument("--connect", type=parse_address, metavar="HOST:PORT", default=("127.0.0.1", 7777))
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(serve(args.port, args.seed))
+    elif args.mode == "bots":
+        asyncio.run(run_bots(args.matches, args.seconds, (args.p1, args.p2), args.connect, args.seed))
+    else:
+        asyncio.run(play(*args.connect))
+
+
+if __name__ == "__main__":
+    main()
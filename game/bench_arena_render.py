@@ -0,0 +1,69 @@
+# 2P arena rendering: full redraw + flip() vs dirty rects + display.update(rects)
+# Plays the same scripted match (moving, swinging, boosting) through both paths and reports
+# frame time and pixels pushed to the display per frame.
+# Usage: python bench_arena_render.py [frames]
+# (with SDL_VIDEODRIVER=dummy flip/update don't reach a real screen; run in a window for real numbers)
+import random
+import sys
+import time
+
+import pygame
+
+from game import Arena, DirtyRenderer, IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_SWING, IN_BOOST, WIDTH, HEIGHT, FPS
+
+MOVES = [IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_UP | IN_LEFT, IN_DOWN | IN_RIGHT, IN_RIGHT | IN_BOOST, 0]
+
+
+def play(frames, draw):
+    # Steps one seeded match and times draw(arena, now) per frame
+    random.seed(1)
+    rng = random.Random(1)
+    arena = Arena(0)
+    now = 0
+    bits = [0, 0]
+    elapsed = 0.0
+    for f in range(frames):
+        if f % 30 == 0:
+            bits = [rng.choice(MOVES), rng.choice(MOVES)]
+        now += 1000 // FPS
+        swing = [IN_SWING if rng.random() < 0.03 else 0 for _ in range(2)]
+        if arena.game_over:
+            arena.restart()
+        arena.step(now, bits[0] | swing[0], bits[1] | swing[1])
+        t0 = time.perf_counter()
+        draw(arena, now)
+        elapsed += time.perf_counter() - t0
+    return elapsed / frames * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = pygame.font.SysFont("consolas", 18)
+    big_font = pygame.font.SysFont("consolas", 32, bold=True)
+
+    def full(arena, now):
+        arena.draw(screen, font, big_font, now)
+        pygame.display.flip()
+
+    renderer = DirtyRenderer(screen, Arena().rect)
+    pixels = []
+
+    def dirty(arena, now):
+        pygame.display.update(renderer.render(arena, font, big_font, now))
+        pixels.append(renderer.pixels)
+
+    full_ms = play(frames, full)
+    dirty_ms = play(frames, dirty)
+    total = WIDTH * HEIGHT
+    print(f'{frames} frames, video driver {pygame.display.get_driver()}')
+    print(f'{"path":<22} {"ms/frame":>9} {"px/frame":>10} {"of window":>10}')
+    print(f'{"full redraw + flip":<22} {full_ms:>9.3f} {total:>10} {1:>10.0%}')
+    avg = sum(pixels) / len(pixels)
+    print(f'{"dirty rects + update":<22} {dirty_ms:>9.3f} {avg:>10.0f} {avg / total:>10.1%}')
+    print(f'speedup {full_ms / dirty_ms:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
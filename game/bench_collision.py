@@ -0,0 +1,79 @@
+# 총알/몬스터 수에 따른 프레임 시간 측정: 충돌 검사 방식별
+#   scalar: numpy 없이 쌍마다 파이썬 / all pairs: 모든 쌍을 numpy로 / grid: 공간 격자로 후보를 줄인다
+#   auto  : 기본값 (쌍 수가 SCALAR_MAX_PAIRS 이하면 scalar, GRID_MIN_PAIRS 이상이면 grid, 그 사이는 all pairs)
+# 초반 웨이브(총 1정)와 총 7정 두 경우를 잰다. 값은 Game.update() 한 틱 전체 시간
+# 사용법: python bench_collision.py [프레임 수]
+import sys
+import time
+import random
+import math
+
+import defence
+from defence import Game, Monster, Bullet, MAP_WIDTH, MAP_HEIGHT, SCALAR_MAX_PAIRS, GRID_MIN_PAIRS
+
+MONSTER_COUNTS = [1, 3, 10, 25, 50, 100, 200, 400, 800, 1600, 3200, 6400]
+BULLET_COUNTS = [120 // 12, 7 * 120 // 12]  # 총알 수명 120, 연사 간격 12, 총 1정 / 7정
+SCALAR_LIMIT = 4096  # 쌍 수가 이보다 많으면 scalar는 재지 않는다 (너무 느리다)
+
+# 이름 -> (SCALAR_MAX_PAIRS, GRID_MIN_PAIRS)
+REGIMES = {
+    'scalar': (math.inf, math.inf),
+    'all pairs': (-1, math.inf),
+    'grid': (-1, 0),
+    'auto': (SCALAR_MAX_PAIRS, GRID_MIN_PAIRS),
+}
+
+
+def setup(n, seed):
+    random.seed(seed)
+    game = Game()
+    game.start_wave()
+    game.plan_cursor = len(game.plan.tick)  # 계획표 스폰은 끄고 아래에서 깐 몬스터만
+    px, py = game.player.x, game.player.y
+    for _ in range(n):
+        # 플레이어와 닿지 않을 만큼 떨어진 곳에 배치
+        while True:
+            x, y = random.uniform(0, MAP_WIDTH), random.uniform(0, MAP_HEIGHT)
+            if math.hypot(x - px, y - py) > 300:
+                break
+        Monster.spawn(game.monsters, 1, x, y, 10**9, 0.0, 1)
+    return game
+
+
+def refill_bullets(game, count):
+    while len(game.bullets) < count:
+        angle = random.uniform(0, 2 * math.pi)
+        x, y = random.uniform(0, MAP_WIDTH), random.uniform(0, MAP_HEIGHT)
+        Bullet.spawn(game.bullets, x, y, math.cos(angle) * 10, math.sin(angle) * 10, 8)
+
+
+def frame_time(regime, n, bullets, frames):
+    defence.SCALAR_MAX_PAIRS, defence.GRID_MIN_PAIRS = REGIMES[regime]
+    game = setup(n, seed=n)
+    total = 0.0
+    for _ in range(frames):
+        refill_bullets(game, bullets)
+        t0 = time.perf_counter()
+        game.update()
+        total += time.perf_counter() - t0
+    defence.SCALAR_MAX_PAIRS, defence.GRID_MIN_PAIRS = REGIMES['auto']
+    return total / frames * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    print(f'{frames}프레임 평균 ms, SCALAR_MAX_PAIRS {SCALAR_MAX_PAIRS}, GRID_MIN_PAIRS {GRID_MIN_PAIRS}')
+    print(f'{"bullets":>8} {"monsters":>9} {"pairs":>7} ' + ' '.join(f'{name:>10}' for name in REGIMES))
+    for bullets in BULLET_COUNTS:
+        for n in MONSTER_COUNTS:
+            row = []
+            for regime in REGIMES:
+                if regime == 'scalar' and bullets * n > SCALAR_LIMIT:
+                    row.append(f'{"-":>10}')
+                else:
+                    row.append(f'{frame_time(regime, n, bullets, frames):>10.3f}')
+            print(f'{bullets:>8} {n:>9} {bullets * n:>7} ' + ' '.join(row))
+
+
+if __name__ == '__main__':
+    main()
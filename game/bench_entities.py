@@ -0,0 +1,43 @@
+# 살아있는 엔티티 수에 따른 Game.update 시간 측정 (60 FPS 예산 16.7ms 기준)
+# 사용법: python bench_entities.py [프레임 수]
+import sys
+import time
+import random
+import math
+
+from defence import Game, Monster, Bullet, Gem, MAP_WIDTH, MAP_HEIGHT, FPS
+
+ENTITY_COUNTS = [500, 1000, 2000, 4000, 8000]
+
+
+def setup(n):
+    # 몬스터, 총알, 보석을 각각 n/3씩 배치
+    random.seed(n)
+    game = Game()
+    game.start_wave()
+    game.plan_cursor = len(game.plan.tick)  # 계획표 스폰은 끄고 아래에서 깐 엔티티만
+    px, py = game.player.x, game.player.y
+    for _ in range(n // 3):
+        angle = random.uniform(0, 2 * math.pi)
+        dist = random.uniform(400, 1000)
+        Monster.spawn(game.monsters, 1, px + dist * math.cos(angle), py + dist * math.sin(angle), 10**9, 1.0, 1)
+        Bullet.spawn(game.bullets, px, py, math.cos(angle) * 10, math.sin(angle) * 10, 8)
+        Gem.spawn(game.gems, random.uniform(0, MAP_WIDTH), random.uniform(0, MAP_HEIGHT))
+    return game
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    print(f'{"entities":>9} {"update ms":>10} {"fps budget":>11} {"allocs":>7}')
+    for n in ENTITY_COUNTS:
+        game = setup(n)
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            game.update()
+            for _ in game.bullets: pass  # 그리기처럼 뷰를 순회
+        ms = (time.perf_counter() - t0) / frames * 1000
+        print(f'{n:>9} {ms:>10.3f} {ms / (1000 / FPS):>10.0%} {game.allocation_count():>7}')
+
+
+if __name__ == '__main__':
+    main()
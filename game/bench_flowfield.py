@@ -0,0 +1,103 @@
+# 몬스터 5000마리 길찾기 비용 비교 (60 FPS 예산 16.7ms 기준)
+#   per-monster homing : 원래 Monster.update처럼 몬스터마다 math.hypot으로 방향 계산 (장애물 무시)
+#   vectorized homing  : home()으로 모든 몬스터를 한꺼번에 (장애물 무시)
+#   per-monster search : 장애물을 피하려고 몬스터마다 길찾기를 한 번씩 돌린다면 (탐색 1회 시간 x 몬스터 수, 추정)
+#   flow field         : EntityStore.follow() + 칸이 바뀔 때 다시 만드는 흐름장 (장애물 회피, 재계산 비용 포함)
+# 사용법: python bench_flowfield.py [틱 수] [몬스터 수]
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from defence import Game, Monster, MAP_WIDTH, MAP_HEIGHT, FLOW_CELL, FPS
+from flowfield import FlowField
+
+# 맵 가운데를 둘러싼 벽 몇 개
+OBSTACLES = [(600, 300, 40, 1000), (1360, 300, 40, 1000), (700, 300, 300, 40), (1000, 1260, 300, 40)]
+
+
+def setup(n):
+    random.seed(n)
+    game = Game()
+    px, py = game.player.x, game.player.y
+    for _ in range(n):
+        angle = random.uniform(0, 2 * math.pi)
+        dist = random.uniform(300, 1000)
+        Monster.spawn(game.monsters, 1, px + dist * math.cos(angle), py + dist * math.sin(angle), 100, 1.0, 1)
+    return game
+
+
+def player_path(tick):
+    # 플레이어가 원을 그리며 움직여 몇 틱마다 흐름장 칸이 바뀐다
+    a = tick * 0.02
+    return MAP_WIDTH / 2 + 250 * math.cos(a), MAP_HEIGHT / 2 + 250 * math.sin(a)
+
+
+def per_monster(game, ticks):
+    for t in range(ticks):
+        px, py = player_path(t)
+        for m in game.monsters:
+            dx, dy = px - m.x, py - m.y
+            dist = math.hypot(dx, dy)
+            if dist > 0:
+                m.x += dx / dist * m.speed
+                m.y += dy / dist * m.speed
+
+
+def home(store, tx, ty):
+    # 모든 행의 속도를 목표 지점을 향하도록 맞춘 뒤 이동 (follow()에서 흐름장을 뺀 것)
+    dx = tx - store['x']
+    dy = ty - store['y']
+    dist = np.hypot(dx, dy)
+    scale = np.divide(store['speed'], dist, out=np.zeros(store.n), where=dist > 0)
+    store['vx'] = dx * scale
+    store['vy'] = dy * scale
+    store.move()
+
+
+def vectorized(game, ticks):
+    for t in range(ticks):
+        home(game.monsters, *player_path(t))
+
+
+def flow(game, ticks):
+    field = FlowField(MAP_WIDTH, MAP_HEIGHT, FLOW_CELL, OBSTACLES)
+    for t in range(ticks):
+        px, py = player_path(t)
+        field.update(px, py)
+        game.monsters.follow(field, px, py)
+    return field.rebuilds
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    budget = 1000 / FPS
+
+    field = FlowField(MAP_WIDTH, MAP_HEIGHT, FLOW_CELL, OBSTACLES, budget=10**9)
+    search, _ = timed(field.update, *player_path(0))
+    cells = field.rows * field.cols
+
+    print(f'{n} monsters, {ticks} ticks, flow field {field.cols}x{field.rows} cells of {FLOW_CELL}px')
+    print(f'{"method":<22} {"ms/tick":>9} {"fps budget":>11}')
+    rows = [('per-monster homing', timed(per_monster, setup(n), ticks)[0] / ticks),
+            ('vectorized homing', timed(vectorized, setup(n), ticks)[0] / ticks),
+            ('per-monster search', search * n)]
+    seconds, rebuilds = timed(flow, setup(n), ticks)
+    rows.append(('flow field', seconds / ticks))
+    for name, sec in rows:
+        print(f'{name:<22} {sec * 1000:>9.3f} {sec * 1000 / budget:>10.0%}')
+    print(f'full field rebuild {search * 1000:.2f}ms for {cells} cells, {rebuilds} rebuilds in {ticks} ticks '
+          f'(spread over ticks, {FlowField.__init__.__defaults__[-1]} cells per tick by default)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# 몬스터 겹침 풀기(separation) 비용 (60 FPS 예산 16.7ms 기준)
+#   naive : 모든 쌍의 거리를 한 번에 계산하는 O(M²) 방식 (numpy 브로드캐스트)
+#   grid  : EntityStore.separate() - 격자 이웃 칸의 쌍만 검사
+#   update: 그 웨이브의 몬스터가 모두 플레이어 주위에 몰려 있을 때 Game.update() 한 틱 전체 (겹침 풀기 포함)
+# 웨이브 w의 몬스터 수는 5 + w*2 (+ 10웨이브마다 보스 w//10)
+# 사용법: python bench_separation.py [틱 수]
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+import defence
+from defence import Game, Monster, FPS, MAP_WIDTH, MAP_HEIGHT, MONSTER_MAX_SIZE, SEPARATION
+from spatial import SpatialGrid
+
+WAVES = [10, 50, 100, 250, 500]
+
+
+def wave_count(wave):
+    return 5 + wave * 2 + (wave // 10 if wave % 10 == 0 else 0)
+
+
+def setup(wave):
+    # 그 웨이브의 몬스터를 모두 꺼내 플레이어 둘레 좁은 고리에 몰아 둔다 (가장 많이 겹치는 상황)
+    random.seed(wave)
+    game = Game()
+    game.wave = wave - 1
+    game.start_wave()
+    px, py = game.player.x, game.player.y
+    p = game.plan
+    ring = 60 + 2 * math.sqrt(len(p.tick))
+    for t, hp, speed, dmg in zip(p.type.tolist(), p.hp.tolist(), p.speed.tolist(), p.damage.tolist()):
+        angle = random.uniform(0, 2 * math.pi)
+        dist = random.uniform(ring, ring * 3)
+        Monster.spawn(game.monsters, t, px + dist * math.cos(angle), py + dist * math.sin(angle), hp, speed, dmg)
+    game.plan_cursor = len(p.tick)
+    game.player.size = 0  # 닿아도 게임 오버가 되지 않게
+    return game
+
+
+def naive_separate(store, strength=0.5):
+    x, y, size = store['x'], store['y'], store['size']
+    dx = x[:, None] - x[None, :]
+    dy = y[:, None] - y[None, :]
+    dist = np.hypot(dx, dy)
+    reach = (size[:, None] + size[None, :]) / 2
+    hit = (dist < reach) & (dist > 0)
+    push = np.where(hit, strength * (reach - dist) / np.where(hit, dist, 1) * size[None, :] / (size[:, None] + size[None, :]), 0)
+    store['x'] += (dx * push).sum(1)
+    store['y'] += (dy * push).sum(1)
+
+
+def stacked(store):
+    # 지름의 절반 이상 겹친 쌍 수
+    grid = SpatialGrid(MAP_WIDTH, MAP_HEIGHT, MONSTER_MAX_SIZE)
+    x, y, size = store['x'], store['y'], store['size']
+    grid.build(x, y)
+    i, j = grid.pairs(x, y)
+    keep = i < j
+    i, j = i[keep], j[keep]
+    return int(np.count_nonzero(np.hypot(x[i] - x[j], y[i] - y[j]) < (size[i] + size[j]) / 4))
+
+
+def per_tick(fn, ticks):
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        fn()
+    return (time.perf_counter() - t0) / ticks * 1000
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    budget = 1000 / FPS
+    print(f'{"wave":>5} {"monsters":>9} {"naive ms":>9} {"grid ms":>8} {"update ms":>10} {"fps budget":>11} '
+          f'{"stacked off":>12} {"on":>5}')
+    for wave in WAVES:
+        n = wave_count(wave)
+        game = setup(wave)
+        naive = per_tick(lambda: naive_separate(game.monsters, SEPARATION), ticks)
+        game = setup(wave)
+        grid = per_tick(lambda: game.monsters.separate(game.crowd_grid, SEPARATION), ticks)
+
+        # 겹침 풀기를 끈 채 / 켠 채로 같은 틱 수만큼 돌린 뒤 뭉친 정도 비교
+        defence.SEPARATION = 0
+        game = setup(wave)
+        per_tick(game.update, ticks)
+        off = stacked(game.monsters)
+        defence.SEPARATION = SEPARATION
+        game = setup(wave)
+        full = per_tick(game.update, ticks)
+        on = stacked(game.monsters)
+        print(f'{wave:>5} {n:>9} {naive:>9.3f} {grid:>8.3f} {full:>10.3f} {full / budget:>10.0%} {off:>12} {on:>5}')
+    print('stacked = 지름의 절반 이상 겹친 쌍 수, update = 겹침 풀기를 포함한 Game.update() 한 틱')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# Game 스냅샷(snapshot.py) 크기와 저장/복원 시간, 복원 직후 체크섬이 같은지, 복원 후 같은 입력이면 같은 결과가 나오는지 확인
+# 사용법: python bench_snapshot.py [반복 수]
+import math
+import random
+import sys
+import time
+
+from defence import Game, Bullet, Monster, Gem, MAP_WIDTH, MAP_HEIGHT, STATE_PLAYING
+from headless import RandomInput, START
+
+# (이름, 몬스터, 총알, 보석)
+SCENES = [('lobby', 0, 0, 0), ('wave 5', 30, 40, 10), ('wave 20', 150, 120, 40), ('wave 50', 600, 300, 120),
+          ('stress', 3000, 2000, 500)]
+# 실제로 플레이한 게임에서 복원 직후 체크섬을 비교할 시점 (시드 3, 무작위 입력)
+PLAYED_TICKS = range(0, 12001, 500)
+
+
+def scene(monsters, bullets, gems, seed=0):
+    random.seed(seed)
+    game = Game()
+    if not monsters:
+        return game
+    game.start_wave()
+    rng = random.Random(seed)
+    for _ in range(monsters):
+        Monster.spawn(game.monsters, rng.choice((1, 2)), rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT),
+                      rng.randint(20, 60), rng.uniform(0.8, 1.5), 1)
+    for _ in range(bullets):
+        a = rng.uniform(0, 2 * math.pi)
+        Bullet.spawn(game.bullets, rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT),
+                     10 * math.cos(a), 10 * math.sin(a), 8)
+    for _ in range(gems):
+        Gem.spawn(game.gems, rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT))
+    return game
+
+
+def timed(fn, reps):
+    best = math.inf
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def play(game, ticks, seed):
+    policy = RandomInput(seed)
+    for tick in range(ticks):
+        game.step(policy(game, tick))
+    return game.checksum()
+
+
+def same_checksum(game, data):
+    # 제자리 복원과 새 Game으로의 복원 모두 곧바로 원래 체크섬과 같아야 한다 (int/float 타입까지)
+    expected = game.checksum()
+    fork = Game()
+    fork.restore(data)
+    game.restore(data)
+    return game.checksum() == expected == fork.checksum()
+
+
+def played_checksums():
+    random.seed(3)
+    game = Game()
+    policy = RandomInput(3)
+    for tick in range(PLAYED_TICKS[-1] + 1):
+        if tick in PLAYED_TICKS:
+            assert same_checksum(game, game.snapshot()), f'tick {tick} ({game.state}, wave {game.wave})'
+        game.step(policy(game, tick) if game.state == STATE_PLAYING else START)
+    return len(PLAYED_TICKS)
+
+
+def main():
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f'{"scene":<8} {"entities":>8} {"bytes":>8} {"dump ms":>8} {"load ms":>8} {"replay":>7}')
+    for name, monsters, bullets, gems in SCENES:
+        game = scene(monsters, bullets, gems)
+        dump_s, data = timed(game.snapshot, reps)
+        assert same_checksum(game, data), name
+        load_s, _ = timed(lambda: game.restore(data), reps)
+        # 같은 스냅샷에서 같은 입력으로 두 번 (제자리 복원 / 새 Game으로 분기) 돌리면 결과가 같아야 한다
+        first = play(game, 300, seed=1)
+        game.restore(data)
+        again = play(game, 300, seed=1)
+        fork = Game()
+        fork.restore(data)
+        forked = play(fork, 300, seed=1)
+        assert first == again == forked, name
+        print(f'{name:<8} {monsters + bullets + gems:>8} {len(data):>8} {dump_s * 1000:>8.3f} {load_s * 1000:>8.3f} '
+              f'{"ok":>7}')
+    print(f'플레이 중 {played_checksums()}곳에서 복원 직후 체크섬 일치')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# 엔티티 그리기 방식별 초당 스프라이트 수: pygame.draw 도형 / 따로 만든 변환 안 한 표면 / 아틀라스(sprite_atlas.py)
+# 화면 안에 몬스터(절반은 HP 바 포함), 총알, 보석을 깔고 같은 프레임을 세 방식으로 반복해 그린다.
+# 사용법: python bench_sprites.py [프레임 수]
+# (SDL_VIDEODRIVER=dummy 화면은 기본 표면과 픽셀 형식이 같아 convert() 이득이 없다. 실제 창에서는 형식이 다르면 변환 안 한 표면이 더 느려진다)
+import math
+import random
+import sys
+import time
+
+import pygame
+
+from defence import (Game, Bullet, Gem, Monster, monster_color, YELLOW, BLACK, GREEN, WIDTH, HEIGHT,
+                     MONSTER_MAX_SIZE)
+from sprite_atlas import ATLAS
+
+# (이름, 몬스터, 총알, 보석)
+SCENES = [('wave 20', 150, 120, 40), ('wave 50', 600, 300, 120), ('stress', 3000, 2000, 500)]
+
+
+def scene(monsters, bullets, gems, seed=0):
+    # 전부 카메라(0, 0) 화면 안에 놓는다
+    game = Game()
+    game.camera.x = game.camera.y = 0
+    rng = random.Random(seed)
+    for _ in range(monsters):
+        hp = rng.randint(20, 200)
+        i = Monster.spawn(game.monsters, 1, rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), hp, 1.0, 1)
+        if rng.random() < 0.5:
+            game.monsters['hp'][i] = rng.uniform(1, hp)
+    for _ in range(bullets):
+        a = rng.uniform(0, 2 * math.pi)
+        Bullet.spawn(game.bullets, rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), 10 * math.cos(a), 10 * math.sin(a), 8)
+    for _ in range(gems):
+        Gem.spawn(game.gems, rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))
+    return game
+
+
+def sprite_count(game):
+    m = game.monsters
+    n = len(m)
+    return len(game.bullets) + len(game.gems) + n + 2 * int((m['hp'][:n] < m['max_hp'][:n]).sum())
+
+
+def draw_primitives(surf, game):
+    # 엔티티마다 pygame.draw 호출
+    cam = game.camera
+    b = game.bullets
+    for x, y in zip(b['x'][:len(b)].tolist(), b['y'][:len(b)].tolist()):
+        pygame.draw.circle(surf, YELLOW, (int(x - cam.x), int(y - cam.y)), 4)
+    g = game.gems
+    for x, y in zip(g['x'][:len(g)].tolist(), g['y'][:len(g)].tolist()):
+        pygame.draw.rect(surf, YELLOW, (x - 4 - cam.x, y - 4 - cam.y, 8, 8))
+    m = game.monsters
+    n = len(m)
+    for x, y, size, hp, max_hp in zip(m['x'][:n].tolist(), m['y'][:n].tolist(), m['size'][:n].tolist(),
+                                      m['hp'][:n].tolist(), m['max_hp'][:n].tolist()):
+        x, y, w = x - size // 2 - cam.x, y - size // 2 - cam.y, int(size)
+        pygame.draw.rect(surf, monster_color(max_hp), (x, y, w, w))
+        if hp < max_hp:
+            pygame.draw.rect(surf, BLACK, (x, y - 8, w, 6))
+            pygame.draw.rect(surf, GREEN, (x, y - 8, int(size * hp / max_hp), 6))
+
+
+STAMPS = {}
+def stamp(shape, color, w, h):
+    # 아틀라스 이전 방식: 모양마다 따로 만든 표면, 화면 형식으로 변환하지 않는다
+    key = (shape, color, w, h)
+    s = STAMPS.get(key)
+    if s is None:
+        if shape == 'circle':
+            s = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.circle(s, color, (w // 2, h // 2), w // 2)
+        else:
+            s = pygame.Surface((w, h))
+            s.fill(color)
+        STAMPS[key] = s
+    return s
+
+
+def draw_stamps(surf, game):
+    cam = game.camera
+    b, g, m = game.bullets, game.gems, game.monsters
+    s = stamp('circle', YELLOW, 8, 8)
+    surf.blits([(s, (x - 4 - cam.x, y - 4 - cam.y)) for x, y in
+                zip(b['x'][:len(b)].tolist(), b['y'][:len(b)].tolist())], doreturn=False)
+    s = stamp('rect', YELLOW, 8, 8)
+    surf.blits([(s, (x - 4 - cam.x, y - 4 - cam.y)) for x, y in
+                zip(g['x'][:len(g)].tolist(), g['y'][:len(g)].tolist())], doreturn=False)
+    n = len(m)
+    seq = []
+    for x, y, size, hp, max_hp in zip(m['x'][:n].tolist(), m['y'][:n].tolist(), m['size'][:n].tolist(),
+                                      m['hp'][:n].tolist(), m['max_hp'][:n].tolist()):
+        x, y, w = x - size // 2 - cam.x, y - size // 2 - cam.y, int(size)
+        seq.append((stamp('rect', monster_color(max_hp), w, w), (x, y)))
+        if hp < max_hp:
+            seq.append((stamp('rect', BLACK, w, 6), (x, y - 8)))
+            seq.append((stamp('rect', GREEN, w, 6), (x, y - 8), (0, 0, int(size * hp / max_hp), 6)))
+    surf.blits(seq, doreturn=False)
+
+
+def draw_atlas(surf, game):
+    Gem.draw_all(surf, game.gems, game.camera)
+    Bullet.draw_all(surf, game.bullets, game.camera)
+    Monster.draw_all(surf, game.monsters, game.camera)
+
+
+def timed(surf, game, draw, frames):
+    draw(surf, game)  # 캐시 채우기
+    best = math.inf
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            draw(surf, game)
+        best = min(best, (time.perf_counter() - t0) / frames)
+    return best
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    print(f'video driver {pygame.display.get_driver()}, {frames} frames, 화면 {WIDTH}x{HEIGHT}')
+    print(f'{"scene":<9} {"sprites":>8} {"draw ms":>8} {"stamp ms":>9} {"atlas ms":>9} '
+          f'{"draw /s":>10} {"stamp /s":>10} {"atlas /s":>10}')
+    for name, monsters, bullets, gems in SCENES:
+        game = scene(monsters, bullets, gems)
+        n = sprite_count(game)
+        ms = [timed(screen, game, draw, frames) * 1000 for draw in (draw_primitives, draw_stamps, draw_atlas)]
+        print(f'{name:<9} {n:>8} ' + ' '.join(f'{t:>8.2f}' for t in ms) + ' '
+              + ' '.join(f'{n / t * 1000:>10,.0f}' for t in ms))
+    pages = sum(len(p) for p in ATLAS.pages.values())
+    print(f'아틀라스: 스프라이트 {len(ATLAS.sprites)}개, 페이지 {pages}장 (구운 횟수 {ATLAS.misses}), '
+          f'몬스터 최대 크기 {MONSTER_MAX_SIZE}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+# 끝 위치만 보는 충돌 판정과 스윕(연속) 판정 비교
+#   총알 vs 몬스터 (defence.py): 격자 후보 + 거리 비교  vs  격자 후보 + 선분-원 판정
+#   칼 vs 플레이어 (game.py)   : Rect.colliderect()    vs  swept_rects_hit()
+#   실제 봇 대전의 check_sword_hit() 호출: 예전 끝 위치 판정 vs 지금 판정 (누군가 부스트 중일 때만 스윕)
+# 틱당 이동량을 늘려 가며 (= 시뮬레이션 틱 수를 줄인 것과 같다) 끝 위치 판정이 놓치는 충돌 수도 센다.
+# 사용법: python bench_swept.py [반복 수]
+import copy
+import gc
+import math
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+
+import game
+from defence import Game, Bullet, Monster, MAP_WIDTH, MAP_HEIGHT
+from swept import circle_sweep_hits, swept_rects_hit
+from timer_wheel import TimerWheel
+from tournament import play_match
+
+SPEEDS = [10, 20, 40, 80]  # 틱당 이동 (px)
+
+
+def bullet_scene(n_bullets, n_monsters, speed, seed=0):
+    rng = random.Random(seed)
+    game = Game()
+    for _ in range(n_monsters):
+        Monster.spawn(game.monsters, 1, rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT), 10, 1.0, 1)
+    for _ in range(n_bullets):
+        a = rng.uniform(0, 2 * math.pi)
+        Bullet.spawn(game.bullets, rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT),
+                     speed * math.cos(a), speed * math.sin(a), 8)
+    return game
+
+
+def point_hits(game):
+    # 예전 방식: 틱 끝 위치의 거리만 비교
+    b, m = game.bullets, game.monsters
+    game.grid.build(m['x'], m['y'])
+    bi, mj = game.grid.pairs(b['x'], b['y'])
+    hit = np.hypot(b['x'][bi] - m['x'][mj], b['y'][bi] - m['y'][mj]) < b['size'][bi] + m['size'][mj] / 2
+    return bi[hit], mj[hit]
+
+
+def swept_hits(game):
+    # Game.collide_bullets()의 판정 부분
+    b, m = game.bullets, game.monsters
+    bx, by, bvx, bvy = b['x'], b['y'], b['vx'], b['vy']
+    game.grid.build(m['x'], m['y'])
+    bi, mj = game.grid.pairs(bx - bvx / 2, by - bvy / 2)
+    hit = circle_sweep_hits(bx[bi] - m['x'][mj], by[bi] - m['y'][mj], bvx[bi] - m['vx'][mj], bvy[bi] - m['vy'][mj],
+                            b['size'][bi] + m['size'][mj] / 2)
+    return bi[hit], mj[hit]
+
+
+def timed(fn, arg, reps):
+    # 가장 빠른 회차 (다른 프로세스 때문에 튀는 값은 버린다)
+    best = math.inf
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        out = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def bench_bullets(reps):
+    print('bullets vs monsters (1000 bullets, 1000 monsters)')
+    print(f'{"px/tick":>8} {"point ms":>9} {"swept ms":>9} {"point hits":>11} {"swept hits":>11}')
+    times = {}
+    for speed in SPEEDS:
+        game = bullet_scene(1000, 1000, speed)
+        game.bullets.move()
+        point_s, point = timed(point_hits, game, reps)
+        swept_s, swept = timed(swept_hits, game, reps)
+        point, swept = set(zip(*map(np.ndarray.tolist, point))), set(zip(*map(np.ndarray.tolist, swept)))
+        assert point <= swept  # 끝 위치에서 맞은 것은 스윕에서도 맞는다
+        print(f'{speed:>8} {point_s * 1000:>9.3f} {swept_s * 1000:>9.3f} {len(point):>11} {len(swept):>11}')
+        times[speed] = point_s, swept_s
+    # 같은 총알 속도(초당 600px)를 60Hz 끝 위치 판정으로 돌릴 때와 30Hz 스윕 판정으로 돌릴 때의 초당 비용
+    print(f'per second at 600 px/s: point @60 Hz {times[10][0] * 60000:.1f} ms, '
+          f'swept @30 Hz {times[20][1] * 30000:.1f} ms')
+
+
+def sword_scene(n, speed, seed=0):
+    # 아레나 안 아무 곳의 칼과 상대, 칼은 이번 틱에 speed만큼 움직였다: (칼, 칼 이전 좌상단, 상대, 상대 이전 좌상단)
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(n):
+        d = pygame.Rect(rng.randint(60, 700), rng.randint(60, 700), 42, 42)
+        a = rng.uniform(0, 2 * math.pi)
+        vx, vy = round(speed * math.cos(a)), round(speed * math.sin(a))
+        sword = pygame.Rect(rng.randint(60, 700), rng.randint(60, 700), 34, 10)
+        cases.append((sword, (sword.x - vx, sword.y - vy), d, d.topleft))
+    return cases
+
+
+def crossing_scene(n, speed, seed=0):
+    # 칼이 상대를 가로질러 지나가는 경우만: 끝 위치 판정이 얼마나 놓치는지
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(n):
+        d = pygame.Rect(300, 300, 42, 42)
+        sword = pygame.Rect(d.centerx + rng.randint(-60, 60), d.y + rng.randint(0, 32), 34, 10)
+        start = sword.x - speed
+        cases.append((sword, (start, sword.y), d, d.topleft))
+    return cases
+
+
+def bench_sword(reps):
+    print('sword vs player (10000 checks: anywhere in the arena / crossing the player)')
+    print(f'{"px/tick":>8} {"point us":>9} {"swept us":>9} {"cross point":>12} {"cross swept":>12}')
+    point_check = lambda cs: sum(s.colliderect(d) for s, _, d, _ in cs)
+    swept_check = lambda cs: sum(swept_rects_hit(s, sp, d, dp) for s, sp, d, dp in cs)
+    for speed in [7] + SPEEDS:
+        cases = sword_scene(10000, speed)
+        point_s, _ = timed(point_check, cases, reps)
+        swept_s, _ = timed(swept_check, cases, reps)
+        crossing = crossing_scene(10000, speed)
+        n = len(cases)
+        print(f'{speed:>8} {point_s / n * 1e6:>9.3f} {swept_s / n * 1e6:>9.3f} '
+              f'{point_check(crossing):>12} {swept_check(crossing):>12}')
+
+
+def point_sword_hit(attacker, defender, now_ms):
+    # 스윕 이전의 check_sword_hit() (끝 위치만 본다)
+    if not attacker.sword_active or attacker.sword_has_hit or defender.invincible:
+        return False
+    srect = attacker.sword_rect()
+    if srect and srect.colliderect(defender.rect):
+        dmg = game.DAMAGE_PER_HIT_BOOST if attacker.is_boosting else game.DAMAGE_PER_HIT
+        defender.hp -= dmg
+        defender.invincible = True
+        defender.invincible_until = now_ms + 1000
+        defender.invincible_timer = defender.restart_timer(defender.invincible_timer, defender.invincible_until,
+                                                           defender.end_invincible)
+        defender.last_blink = now_ms
+        attacker.sword_has_hit = True
+        return True
+    return False
+
+
+def clone(player):
+    c = copy.copy(player)
+    c.rect = player.rect.copy()
+    return c
+
+
+def recorded_checks(matches):
+    # chase vs kite 봇 대전에서 check_sword_hit()에 들어온 (공격자, 방어자, 시각)을 그 순간 그대로 복제해 모은다
+    calls = []
+    real = game.check_sword_hit
+
+    def record(attacker, defender, now_ms):
+        calls.append((clone(attacker), clone(defender), now_ms))
+        return real(attacker, defender, now_ms)
+
+    game.check_sword_hit = record
+    try:
+        for seed in range(matches):
+            play_match('chase', 'kite', seed, game.FPS * 60)
+    finally:
+        game.check_sword_hit = real
+    return calls
+
+
+def fresh(player, timers):
+    c = clone(player)
+    c.timers = timers
+    c.invincible_timer = None
+    return c
+
+
+def timed_checks(checks, calls, reps):
+    # 맞으면 상태(hp, 무적 타이머)가 바뀌므로 회차마다 새 타이머 휠과 새로 복제한 것으로 잰다 (복제는 시간에서 뺀다)
+    # 판정 함수들을 번갈아 돌려 머신 상태가 한쪽에만 몰리지 않게 한다
+    best = [math.inf] * len(checks)
+    for _ in range(reps):
+        for k, check in enumerate(checks):
+            timers = TimerWheel()
+            cases = [(fresh(a, timers), fresh(d, timers), now) for a, d, now in calls]
+            gc.disable()
+            t0 = time.perf_counter()
+            for a, d, now in cases:
+                check(a, d, now)
+            best[k] = min(best[k], time.perf_counter() - t0)
+            gc.enable()
+            del cases
+    return best
+
+
+def bench_matches(reps):
+    calls = recorded_checks(50)
+    active = [c for c in calls if c[0].sword_active and not c[0].sword_has_hit and not c[1].invincible]
+    boosted = [c for c in active if c[0].is_boosting or c[1].is_boosting]
+    print('check_sword_hit() calls from 50 chase vs kite matches')
+    print(f'{"calls":<28} {"count":>7} {"point us":>9} {"now us":>9}')
+    times = {}
+    for name, cases in (('all', calls), ('sword out', active), ('sword out, someone boosting', boosted)):
+        point_s, now_s = timed_checks((point_sword_hit, game.check_sword_hit), cases, reps)
+        n = max(1, len(cases))
+        print(f'{name:<28} {len(cases):>7} {point_s / n * 1e6:>9.3f} {now_s / n * 1e6:>9.3f}')
+        times[name] = point_s / n, now_s / n
+    point_s, now_s = times['all']
+    change = now_s / point_s - 1
+    verdict = 'not slower than' if change <= 0.05 else 'SLOWER than'
+    print(f'whole matches: {verdict} the point test ({change:+.0%} per call)')
+    point_s, now_s = times['sword out, someone boosting']
+    print(f'a check that sweeps (someone boosting) costs {(now_s - point_s) * 1e6:+.2f} us over the point test')
+
+
+def main():
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bench_bullets(reps)
+    print()
+    bench_sword(max(1, reps // 4))
+    print()
+    bench_matches(reps)
+
+
+if __name__ == '__main__':
+    main()
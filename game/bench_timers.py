@@ -0,0 +1,202 @@
+# 타이머 휠(timer_wheel.py) 확인과 벤치마크
+# 1) 매 틱 1씩 깎는 카운트다운(예전 방식)과 같은 틱, 같은 순서로 만기가 나는지 무작위 예약/취소/재예약으로 비교
+# 2) 대기 중인 타이머 수별 틱당 비용: 파이썬 카운트다운 / numpy 열 카운트다운 / 타이머 휠 (만기마다 다시 예약)
+# 3) EntityStore 수명 열 (6틱마다 연사, 수명 120틱): 매 틱 life -= 1 후 kill(life <= 0) (예전 방식) /
+#    사라질 시각 + 시각마다 소멸 타이머 하나
+# 사용법: python bench_timers.py [틱 수]
+import random
+import sys
+import time
+
+import numpy as np
+
+from entity_store import EntityStore
+from timer_wheel import TimerWheel
+
+TIMER_COUNTS = [100, 1000, 10000, 100000]
+PERIOD = (30, 600)  # 쿨다운/수명 길이 범위 (틱)
+
+
+class Countdown:
+    # 참조 구현 (예전 방식): 타이머마다 남은 틱을 두고 매 틱 1씩 깎아 0이 된 것을 등록 순서대로 부른다.
+    # 먼 지연도 확인할 수 있도록 아무것도 0이 되지 않는 틱들은 한꺼번에 깎는다 (결과는 같다).
+    def __init__(self, now, on_fire):
+        self.now = now
+        self.left = {}  # key -> 남은 틱 (dict는 등록 순서를 지킨다)
+        self.on_fire = on_fire
+
+    def schedule(self, delay, key):
+        self.left[key] = delay
+
+    def cancel(self, key):
+        del self.left[key]
+
+    def advance_to(self, t):
+        while self.now < t:
+            step = min(min(self.left.values(), default=t), t - self.now)
+            self.now += step
+            due = []
+            for key in self.left:
+                self.left[key] -= step
+                if self.left[key] == 0:
+                    due.append(key)
+            for key in due:
+                del self.left[key]
+                self.on_fire(self, key)
+
+
+class Wheel:
+    # TimerWheel을 Countdown과 같은 모양으로 감싼다
+    def __init__(self, now, on_fire):
+        self.wheel = TimerWheel(now)
+        self.handles = {}
+        self.on_fire = on_fire
+
+    @property
+    def now(self):
+        return self.wheel.now
+
+    def schedule(self, delay, key):
+        self.handles[key] = self.wheel.schedule(delay, self.fire, key)
+
+    def fire(self, key):
+        del self.handles[key]
+        self.on_fire(self, key)
+
+    def cancel(self, key):
+        self.wheel.cancel(self.handles.pop(key))
+
+    def advance_to(self, t):
+        self.wheel.advance_to(t)
+
+
+def check(seed, ops=20000):
+    # 같은 무작위 예약/취소/진행 순서를 두 구현에 주고 (시각, 타이머) 만기 기록을 비교한다.
+    # 콜백의 3분의 1은 그 자리에서 다시 예약한다 (반복 쿨다운). 먼 지연은 윗단계 휠과 overflow를 거친다.
+    rng = random.Random(seed)
+    start = rng.randrange(1 << 20)
+    logs = ([], [])
+
+    def on_fire(side, key):
+        logs[side is wheel].append((side.now, key))
+        if hash(key) % 3 == 0:
+            side.schedule(1 + hash(key) % 200, (key, 1))
+
+    ref, wheel = Countdown(start, on_fire), Wheel(start, on_fire)
+    for key in range(ops):
+        r = rng.random()
+        if r < 0.45:
+            delay = rng.choice((rng.randint(1, 70), rng.randint(1, 5000), rng.randint(1, 300000),
+                                rng.randint(1 << 24, 1 << 25)))
+            ref.schedule(delay, key)
+            wheel.schedule(delay, key)
+        elif r < 0.55 and ref.left:
+            victim = rng.choice(list(ref.left))
+            ref.cancel(victim)
+            wheel.cancel(victim)
+        else:
+            t = ref.now + (1 if r < 0.9 else rng.randint(2, 3000))
+            ref.advance_to(t)
+            wheel.advance_to(t)
+    end = ref.now + (1 << 26)
+    ref.advance_to(end)
+    wheel.advance_to(end)
+    return logs[0] == logs[1] and not ref.left and not wheel.handles, len(logs[1])
+
+
+def first_expiry(n, rng):
+    # 처음 남은 틱은 고르게 퍼뜨린다 (계속 돌던 게임처럼 매 틱 비슷한 수가 만기)
+    return [rng.randint(1, PERIOD[1]) for _ in range(n)]
+
+
+def bench_countdown(n, ticks, rng):
+    cool = first_expiry(n, rng)
+    t0 = time.perf_counter()
+    fired = 0
+    for _ in range(ticks):
+        for i in range(n):
+            cool[i] -= 1
+            if cool[i] == 0:
+                cool[i] = rng.randint(*PERIOD)
+                fired += 1
+    return time.perf_counter() - t0, fired
+
+
+def bench_numpy(n, ticks, rng):
+    life = np.array(first_expiry(n, rng), dtype=float)
+    t0 = time.perf_counter()
+    fired = 0
+    for _ in range(ticks):
+        life -= 1
+        done = np.flatnonzero(life <= 0)
+        if len(done):
+            life[done] = [rng.randint(*PERIOD) for _ in done]
+            fired += len(done)
+    return time.perf_counter() - t0, fired
+
+
+def bench_wheel(n, ticks, rng):
+    wheel = TimerWheel()
+    count = [0]
+
+    def again():
+        count[0] += 1
+        wheel.schedule(rng.randint(*PERIOD), again)
+
+    for delay in first_expiry(n, rng):
+        wheel.schedule(delay, again)
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        wheel.advance()
+    return time.perf_counter() - t0, count[0]
+
+
+def bench_store(n, ticks, timers, volley=6, life=120):
+    # 총알처럼 volley틱마다 한 무더기씩 생기고 life틱 뒤에 사라지는 행 n개 (게임의 연사와 같은 모양).
+    # 만기 처리(삭제 표시)만 재고, 정리와 다시 채우기는 빼고 잰다
+    store = EntityStore(timers=timers)
+    per_volley = n * volley // life
+    for k in range(life // volley):
+        for _ in range(per_volley):
+            store.add(life=(k + 1) * volley)
+    elapsed = 0.0
+    for tick in range(1, ticks + 1):
+        t0 = time.perf_counter()
+        if timers is None:
+            store['life'] -= 1
+            store.kill(store['life'] <= 0)
+        else:
+            timers.advance()
+        elapsed += time.perf_counter() - t0
+        store.compact()
+        if tick % volley == 0:
+            for _ in range(per_volley):
+                store.add(life=life)
+    return elapsed
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    results = [check(seed) for seed in range(5)]
+    ok = all(same for same, _ in results)
+    fired = sum(n for _, n in results)
+    print(f'카운트다운과 비교: {"ok" if ok else "MISMATCH"} ({fired}개 만기, 시드 {len(results)}개)')
+    print(f'{"timers":>7} {"list us/tick":>13} {"numpy us/tick":>14} {"wheel us/tick":>14} {"expiries/tick":>14}')
+    for n in TIMER_COUNTS:
+        t = min(ticks, max(20, 2_000_000 // n))  # 파이썬 카운트다운은 n에 비례해 느리다
+        rows = []
+        for bench in (bench_countdown, bench_numpy, bench_wheel):
+            seconds, fired = bench(n, t, random.Random(n))
+            rows.append(seconds / t * 1e6)
+        print(f'{n:>7} {rows[0]:>13.1f} {rows[1]:>14.1f} {rows[2]:>14.1f} {fired / t:>14.1f}')
+    print(f'{"rows":>7} {"countdown us/tick":>18} {"expiry timers us/tick":>22}')
+    for n in TIMER_COUNTS:
+        countdown = bench_store(n, ticks, None) / ticks * 1e6
+        timed = bench_store(n, ticks, TimerWheel()) / ticks * 1e6
+        print(f'{n:>7} {countdown:>18.1f} {timed:>22.1f}')
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
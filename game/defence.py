@@ -1,29 +1,67 @@
+import argparse
 import pygame
 import sys
 import random
 import math
-from collections import deque
-
-# 초기화
-pygame.init()
+import zlib
+from collections import namedtuple
+import numpy as np
+from spatial import SpatialGrid
+from flowfield import FlowField
+from swept import circle_sweep, circle_sweep_hits, circle_sweep_time
+from wave_planner import WavePlanner
+from entity_store import EntityStore, EntityView, column
+from timer_wheel import TimerWheel
+from profiler import PROFILER
+from text_cache import TEXT_CACHE, HudPanel
+from sprite_atlas import ATLAS
+from replay import DefenceRecorder
+import snapshot
+from fixed_step import FixedStep
+
+# 초기화 (화면은 실제로 그릴 때 get_window()에서 만든다)
 WIDTH, HEIGHT = 1000, 800
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Survival Defense - Pygame")
+WIN = None
 FPS = 60
 CLOCK = pygame.time.Clock()
 
 # 맵 크기
 MAP_WIDTH, MAP_HEIGHT = 2000, 1600
+GRID_CELL = 64  # 충돌 검사용 공간 격자 칸 크기
+# 총알 수 x 몬스터 수에 따른 충돌 검사 방식 (몇 마리 안 될 때는 격자를 만드는 numpy 호출이 검사보다 비싸다)
+SCALAR_MAX_PAIRS = 32   # 이하: numpy 없이 쌍마다 파이썬으로
+GRID_MIN_PAIRS = 8192   # 이상: 격자로 후보를 줄인다. 그 사이는 모든 쌍을 numpy로
+FLOW_CELL = 32  # 몬스터 길찾기 흐름장 칸 크기
+OBSTACLES = ()  # 몬스터가 돌아가야 하는 맵 위 사각형 (x, y, w, h)
+SAVE_PATH = 'defence_save.snap'  # F5/F9 저장 슬롯
+
+def get_window():
+    global WIN
+    if WIN is None:
+        pygame.init()
+        WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Survival Defense - Pygame")
+    return WIN
 
 # 폰트 설정
-try:
-    FONT = pygame.font.SysFont('malgungothic', 24)
-    BIGFONT = pygame.font.SysFont('malgungothic', 40)
-    SMALLFONT = pygame.font.SysFont('malgungothic', 18)
-except:
-    FONT = pygame.font.SysFont(None, 24)
-    BIGFONT = pygame.font.SysFont(None, 40)
-    SMALLFONT = pygame.font.SysFont(None, 18)
+class LazyFont:
+    # 처음 글자를 그릴 때 폰트를 만든다 (헤드리스 실행에서는 폰트를 만들지 않음)
+    def __init__(self, size):
+        self.size = size
+        self.font = None
+
+    def __getattr__(self, name):
+        if self.font is None:
+            pygame.font.init()
+            try:
+                self.font = pygame.font.SysFont('malgungothic', self.size)
+            except:
+                self.font = pygame.font.SysFont(None, self.size)
+        return getattr(self.font, name)
+
+FONT = LazyFont(24)
+BIGFONT = LazyFont(40)
+SMALLFONT = LazyFont(18)
 
 # 색
 WHITE = (255,255,255)
@@ -59,6 +97,8 @@ MONSTER_TYPES = {
     2: {'name':'Brute', 'base_hp':40, 'base_speed':1.1, 'damage':1, 'exp': 18},
     3: {'name':'Boss', 'base_hp':300, 'base_speed':0.9, 'damage':1, 'exp': 130}
 }
+MONSTER_MAX_SIZE = 40  # 체력 보너스를 다 받은 몬스터 크기 (격자 질의 반경에 사용)
+SEPARATION = 0.5  # 겹친 몬스터끼리 한 틱에 풀어 주는 겹침 비율 (0이면 겹쳐도 그대로)
 
 # 상점 아이템 (요구사항에 맞춰 비용 수정)
 SHOP_ITEMS = {
@@ -71,24 +111,67 @@ STATE_LOBBY = 'lobby'
 STATE_PLAYING = 'playing'
 STATE_INTERMISSION = 'intermission'  # (불필요하지만 여전히 정의)
 
+# 한 틱 분량의 입력 (키보드/마우스, 헤드리스 정책, 리플레이가 모두 이 형태로 넘긴다)
+# start: 로비에서 시작, reload: R키, buy: 상점에서 산 아이템 키 (없으면 None)
+TickInput = namedtuple('TickInput', 'dx dy aim firing start reload buy', defaults=(False, False, None))
+
 # 유틸 함수
-def draw_text(surf, text, x, y, font=FONT, color=WHITE, center=False):
-    img = font.render(text, True, color)
+def text_item(text, x, y, font=FONT, color=WHITE, center=False):
+    # 캐시된 글자 표면과 그 위치 (blit/blits 인자 형태)
+    img = TEXT_CACHE.render(font, text, color)
     rect = img.get_rect()
     if center:
         rect.center = (x, y)
     else:
         rect.topleft = (x, y)
-    surf.blit(img, rect)
+    return img, rect
+
+def draw_text(surf, text, x, y, font=FONT, color=WHITE, center=False):
+    surf.blit(*text_item(text, x, y, font, color, center))
 
 def clamp(v,a,b):
     return max(a,min(b,v))
 
+# 플레이어 스프라이트: 몸통과 조준선을 조준 각도 AIM_STEPS 단계마다 한 장씩 아틀라스에 구워 둔다
+AIM_STEPS = 128
+AIM_LEN = 25
+
+def player_sprite(size, aim_angle):
+    # (페이지, 영역, 몸 중심까지의 오프셋)
+    step = round(aim_angle / (2 * math.pi) * AIM_STEPS) % AIM_STEPS
+    r = size // 2
+    half_w, top, bottom = max(r, AIM_LEN) + 2, max(size, AIM_LEN) + 2, max(size, AIM_LEN) + 2
+    def paint(s):
+        angle = step * 2 * math.pi / AIM_STEPS
+        pygame.draw.circle(s, BLUE, (half_w, top - r), r)
+        pygame.draw.line(s, BLUE, (half_w, top - r // 2), (half_w, top + size), 4)
+        end = (half_w + AIM_LEN * math.cos(angle), top + AIM_LEN * math.sin(angle))
+        pygame.draw.line(s, RED, (half_w, top), end, 3)
+    page, area = ATLAS.get(('player', size, step), half_w * 2, top + bottom, paint)
+    return page, area, (half_w, top)
+
+# 맵 전체 배경을 한 번만 그려 두고 화면에 보이는 부분만 복사한다
+BACKGROUND = None
+def get_background():
+    global BACKGROUND
+    if BACKGROUND is None:
+        BACKGROUND = pygame.Surface((MAP_WIDTH, MAP_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            BACKGROUND = BACKGROUND.convert()
+        BACKGROUND.fill(GRASS_COLOR)
+        for rect in OBSTACLES:
+            pygame.draw.rect(BACKGROUND, GRAY, rect)
+    return BACKGROUND
+
 # 클래스 정의
 class Player:
-    def __init__(self):
+    # 쿨다운과 아이템 효과는 매 틱 깎는 카운트다운 대신 timers 시각 기준의 만기 틱으로 둔다.
+    # fire_cool, reloading, items_active는 예전처럼 남은 틱 수로 읽힌다 (HUD, 체크섬, 스냅샷).
+    def __init__(self, timers):
+        self.timers = timers
         self.x = MAP_WIDTH // 2
         self.y = MAP_HEIGHT // 2
+        self.prev_x, self.prev_y = self.x, self.y  # 직전 틱 위치 (그리기 보간용)
         self.size = PLAYER_SIZE
         self.base_speed = BASE_PLAYER_SPEED
         self.strength = STARTING_STR
@@ -98,10 +181,10 @@ class Player:
         self.gems = 10
         self.stat_points = 0
         self.weapon_id = 1 # Light MG로 고정
-        self.fire_cool = 0
+        self.fire_ready_at = 0  # 다음 발사가 가능한 틱
         self.mag = WEAPONS[self.weapon_id]['mag']
-        self.reloading = 0
-        self.items_active = {'atk_boost':0}
+        self.reload_timer = None  # 재장전이 끝나면 탄창을 채우는 타이머
+        self.items_until = {'atk_boost':0}  # 아이템 효과가 끝나는 틱
         self.num_guns = 1
         self.aim_angle = 0
 
@@ -115,10 +198,42 @@ class Player:
     @property
     def damage(self):
         base = self.strength
-        if self.items_active['atk_boost'] > 0:
+        if self.items_until['atk_boost'] > self.timers.now:
             base += 6
         return base
 
+    @property
+    def fire_cool(self):
+        return max(0, self.fire_ready_at - self.timers.now)
+
+    @fire_cool.setter
+    def fire_cool(self, ticks):
+        self.fire_ready_at = self.timers.now + ticks
+
+    @property
+    def reloading(self):
+        return self.timers.remaining(self.reload_timer) if self.reload_timer else 0
+
+    @reloading.setter
+    def reloading(self, ticks):
+        if self.reload_timer:
+            self.timers.cancel(self.reload_timer)
+        self.reload_timer = self.timers.schedule(ticks, self.finish_reload) if ticks > 0 else None
+
+    def finish_reload(self):
+        self.reload_timer = None
+        self.mag = WEAPONS[self.weapon_id]['mag']
+
+    @property
+    def items_active(self):
+        # 아이템별 남은 틱
+        now = self.timers.now
+        return {k: max(0, t - now) for k, t in self.items_until.items()}
+
+    def add_item(self, key, ticks):
+        # 효과가 남아 있으면 그 뒤로 이어 붙인다
+        self.items_until[key] = max(self.items_until.get(key, 0), self.timers.now) + ticks
+
     def give_exp(self, e):
         self.exp += e
         while self.exp >= self.exp_to_level:
@@ -127,11 +242,6 @@ class Player:
             self.strength += 1
             self.exp_to_level = int(self.exp_to_level * 1.4)
 
-    def update_items(self):
-        for k in list(self.items_active.keys()):
-            if self.items_active[k] > 0:
-                self.items_active[k] -= 1
-
     def reload_weapon(self):
         if self.weapon_id is None or self.reloading > 0: return
         w = WEAPONS[self.weapon_id]
@@ -148,85 +258,105 @@ class Player:
         self.mag -= 1
         return True
 
-    def update(self):
-        if self.fire_cool > 0:
-            self.fire_cool -= 1
-        if self.reloading > 0:
-            self.reloading -= 1
-            if self.reloading == 0:
-                self.mag = WEAPONS[self.weapon_id]['mag']
-        self.update_items()
-
-    def draw(self, surf, camera):
-        # 플레이어 몸통
-        body_x, body_y = self.x - camera.x, self.y - camera.y
-        head_r = self.size // 2
-        pygame.draw.circle(surf, BLUE, (int(body_x), int(body_y - head_r)), head_r)
-        pygame.draw.line(surf, BLUE, (int(body_x), int(body_y - head_r//2)), (int(body_x), int(body_y + self.size)), 4)
-        
-        # 조준선
-        indicator_len = 25
-        end_x = body_x + indicator_len * math.cos(self.aim_angle)
-        end_y = body_y + indicator_len * math.sin(self.aim_angle)
-        pygame.draw.line(surf, RED, (body_x, body_y), (end_x, end_y), 3)
-
-class Bullet:
-    def __init__(self, x, y, vx, vy, dmg):
-        self.x, self.y = x, y
-        self.vx, self.vy = vx, vy
-        self.r, self.dmg = 4, dmg
-        self.life = 120
+    def lerp(self, alpha):
+        # 직전 틱과 현재 틱 사이 alpha 지점의 위치
+        return self.prev_x + (self.x - self.prev_x) * alpha, self.prev_y + (self.y - self.prev_y) * alpha
+
+    def draw(self, surf, camera, alpha=1.0):
+        # 몸통 + 조준선 (아틀라스에 구워 둔 스프라이트 한 장)
+        x, y = self.lerp(alpha)
+        page, area, (ox, oy) = player_sprite(self.size, self.aim_angle)
+        surf.blit(page, (int(x - camera.x) - ox, int(y - camera.y) - oy), area)
+
+# 총알/보석/몬스터는 EntityStore의 한 행이고, 아래 클래스는 그 행을 가리키는 그리기용 뷰다.
+class Bullet(EntityView):
+    __slots__ = ()
+    r = column('size')
+    dmg = column('dmg')
+
+    @staticmethod
+    def spawn(store, x, y, vx, vy, dmg):
+        return store.add(x=x, y=y, vx=vx, vy=vy, size=4, dmg=dmg, life=120)
+
+    @staticmethod
+    def draw_all(surf, store, camera, alpha=1.0):
+        # 화면 안의 총알만 한 번의 blits()로 그린다
+        idx = camera.visible(store, 4)
+        page, area = ATLAS.circle(YELLOW, 8)
+        x, y = render_xy(store, idx, alpha)
+        xs = (x - 4 - camera.x).astype(int).tolist()
+        ys = (y - 4 - camera.y).astype(int).tolist()
+        if xs:
+            surf.blits([(page, p, area) for p in zip(xs, ys)], doreturn=False)
+        return len(xs), len(store) - len(xs)
+
+class Gem(EntityView):
+    __slots__ = ()
+
+    @staticmethod
+    def spawn(store, x, y):
+        return store.add(x=x, y=y, size=8, life=600) # 10초
+
+    @staticmethod
+    def draw_all(surf, store, camera, alpha=1.0):
+        idx = camera.visible(store, 8)
+        page, area = ATLAS.rect(YELLOW, 8, 8)
+        xs = (store['x'][idx] - 4 - camera.x).tolist()  # 보석은 움직이지 않는다
+        ys = (store['y'][idx] - 4 - camera.y).tolist()
+        if xs:
+            surf.blits([(page, p, area) for p in zip(xs, ys)], doreturn=False)
+        return len(xs), len(store) - len(xs)
+
+class Monster(EntityView):
+    __slots__ = ()
+    type = column('type')
+    max_hp = column('max_hp')
+    speed = column('speed')
+    damage = column('damage')
+
+    @staticmethod
+    def spawn(store, mtype, x, y, hp, speed, damage):
+        # 체력에 따라 크기 결정
+        size_bonus = min(MONSTER_MAX_SIZE - 20, hp / 20)
+        return store.add(type=mtype, x=x, y=y, hp=hp, max_hp=hp, speed=speed, damage=damage, size=20 + size_bonus)
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-
-    def draw(self, surf, camera):
-        pygame.draw.circle(surf, YELLOW, (int(self.x - camera.x), int(self.y - camera.y)), self.r)
-
-class Gem:
-    def __init__(self, x, y):
-        self.x, self.y = x, y
-        self.size = 8
-        self.life = 600 # 10초
-
-    def update(self):
-        self.life -= 1
-
-    def draw(self, surf, camera):
-        pygame.draw.rect(surf, YELLOW, (self.x - self.size//2 - camera.x, self.y - self.size//2 - camera.y, self.size, self.size))
-
-class Monster:
-    def __init__(self, mtype, x, y, hp, speed, damage):
-        self.type = mtype
-        self.x, self.y = x, y
-        self.max_hp, self.hp = hp, hp
-        self.speed, self.damage = speed, damage
-        
-        # 체력에 따라 크기와 색 결정
-        size_bonus = min(20, self.max_hp / 20)
-        self.size = 20 + size_bonus
-        
-        red_intensity = min(255, 50 + self.max_hp)
-        self.color = (red_intensity, 50, 50)
-
-
-    def update(self, target_x, target_y):
-        dx, dy = target_x - self.x, target_y - self.y
-        dist = math.hypot(dx,dy)
-        if dist > 0:
-            self.x += (dx / dist) * self.speed
-            self.y += (dy / dist) * self.speed
-
-    def draw(self, surf, camera):
-        pygame.draw.rect(surf, self.color, (self.x - self.size//2 - camera.x, self.y - self.size//2 - camera.y, self.size, self.size))
-        # HP Bar
-        if self.hp < self.max_hp:
-            ratio = self.hp / self.max_hp
-            bar_y = self.y - self.size//2 - 8 - camera.y
-            pygame.draw.rect(surf, BLACK, (self.x-self.size//2 - camera.x, bar_y, self.size, 6))
-            pygame.draw.rect(surf, GREEN, (self.x-self.size//2- camera.x, bar_y, int(self.size*ratio), 6))
+    @property
+    def color(self):
+        return monster_color(self.max_hp)
+
+    @staticmethod
+    def draw_all(surf, store, camera, alpha=1.0):
+        # 몸통과 HP 바를 그리는 순서대로 한 목록에 모아 한 번의 blits()로 그린다
+        # 몸통은 (크기, 색)마다, HP 바는 너비마다 아틀라스에 한 번 구운 것을 찍는다
+        idx = camera.visible(store, MONSTER_MAX_SIZE)
+        size = store['size'][idx]
+        x, y = render_xy(store, idx, alpha)
+        xs = (x - size//2 - camera.x).tolist()
+        ys = (y - size//2 - camera.y).tolist()
+        seq = []
+        for x, y, size, hp, max_hp in zip(xs, ys, size.tolist(), store['hp'][idx].tolist(), store['max_hp'][idx].tolist()):
+            w = int(size)
+            page, area = ATLAS.rect(monster_color(max_hp), w, w)
+            seq.append((page, (x, y), area))
+            # HP Bar
+            if hp < max_hp:
+                seq.extend(ATLAS.bar_items(BLACK, GREEN, w, 6, int(size * hp / max_hp), (x, y - 8)))
+        if seq:
+            surf.blits(seq, doreturn=False)
+        return len(seq), len(store) - len(idx)
+
+def render_xy(store, idx, alpha):
+    # 마지막 틱에 (vx, vy)만큼 움직였으므로 직전 틱 위치는 x - vx. 그 사이 alpha 지점을 그린다.
+    x, y = store['x'][idx], store['y'][idx]
+    if alpha >= 1.0:
+        return x, y
+    back = alpha - 1.0
+    return x + store['vx'][idx] * back, y + store['vy'][idx] * back
+
+def monster_color(max_hp):
+    # 체력에 따라 색 결정
+    red_intensity = int(min(255, 50 + max_hp))
+    return (red_intensity, 50, 50)
 
 class Camera:
     def __init__(self):
@@ -234,24 +364,50 @@ class Camera:
         self.y = 0
 
     def update(self, target):
-        self.x = target.x - WIDTH // 2
-        self.y = target.y - HEIGHT // 2
+        self.follow(target.x, target.y)
+
+    def follow(self, x, y):
+        self.x = x - WIDTH // 2
+        self.y = y - HEIGHT // 2
         self.x = clamp(self.x, 0, MAP_WIDTH - WIDTH)
         self.y = clamp(self.y, 0, MAP_HEIGHT - HEIGHT)
 
+    def visible(self, store, margin):
+        # 화면 사각형(가장자리 margin 포함) 안에 있는 행 번호
+        x, y = store['x'], store['y']
+        return np.flatnonzero((x >= self.x - margin) & (x <= self.x + WIDTH + margin)
+                              & (y >= self.y - margin) & (y <= self.y + HEIGHT + margin))
+
 class Game:
     def __init__(self):
         self.state = STATE_LOBBY
-        self.player = Player()
+        # 플레이 중 업데이트 틱마다 한 칸씩 가는 시계. 재장전 완료, 총알/보석 소멸은 여기에 예약한다
+        self.timers = TimerWheel()
+        self.player = Player(self.timers)
         self.camera = Camera()
-        self.bullets = []
-        self.monsters = []
-        self.gems = []
+        self.view = Camera()  # 그리기 전용: 보간한 위치를 따라간다 (시뮬레이션과 스냅샷은 self.camera만 본다)
+        self.bullets = EntityStore(Bullet, extra=('dmg',), timers=self.timers)
+        self.monsters = EntityStore(Monster, extra=('type', 'max_hp', 'speed', 'damage'))
+        self.grid = SpatialGrid(MAP_WIDTH, MAP_HEIGHT, GRID_CELL)
+        self.crowd_grid = SpatialGrid(MAP_WIDTH, MAP_HEIGHT, MONSTER_MAX_SIZE)  # 몬스터끼리 겹침 검사용 (칸이 작을수록 후보 쌍이 적다)
+        self.flow = FlowField(MAP_WIDTH, MAP_HEIGHT, FLOW_CELL, OBSTACLES)
+        self.gems = EntityStore(Gem, timers=self.timers)
         self.wave = 0
         self.interm_time = 0
-        self.spawn_queue = deque()
+        # 웨이브 스폰 계획 (시드는 전역 random에서 뽑으므로 random.seed()로 재현된다)
+        self.planner = WavePlanner(random.getrandbits(32), MONSTER_TYPES, max(WIDTH, HEIGHT))
+        self.plan = None
+        self.plan_tick = 0     # 이번 웨이브 시작부터 지난 틱 수
+        self.plan_cursor = 0   # 다음에 낼 계획표 행
+        self.wave_origin = (0, 0)
         self.shop_open = False
-        self.wave_clear_timer = 0
+        self.next_wave_at = 0  # 웨이브 클리어 후 다음 웨이브를 시작할 틱 (0 = 클리어 전)
+        self.stats = {'kills': 0, 'gems': 0, 'waves_cleared': 0}  # 시뮬레이션 집계용
+        # 마지막 프레임의 월드 그리기 집계: blit/blits() 호출 수, 찍은 스프라이트 수 (HP 바 포함), 화면 밖이라 뺀 엔티티 수
+        self.draw_calls = 0
+        self.draw_sprites = 0
+        self.draw_culled = 0
+        self.status_panel = HudPanel()
         # shop rects (화면 고정 위치)
         self.shop_item_rects = {
             'atk_boost': pygame.Rect(50, 200, 280, 80),
@@ -263,77 +419,88 @@ class Game:
         self.wave += 1
         self.monsters.clear()
         self.bullets.clear()
-        self.spawn_queue.clear()
-        self.wave_clear_timer = 0
-        base_count = 5 + self.wave * 2
-        spawn_list = []
-        for _ in range(base_count):
-            t = 1 if random.random() < 0.7 else 2
-            spawn_list.append(t)
-        if self.wave % 10 == 0 and self.wave > 0:
-            for _ in range(self.wave // 10):
-                spawn_list.append(3)
-        for t in spawn_list:
-            m_info = MONSTER_TYPES[t]
-            hp = int(m_info['base_hp'] * (1 + self.wave * 0.25))
-            speed = m_info['base_speed'] * (1 + (self.wave - 1) * 0.03)
-            # 맵 밖에서 스폰
-            angle = random.uniform(0, 2 * math.pi)
-            spawn_dist = max(WIDTH, HEIGHT)
-            x = self.player.x + spawn_dist * math.cos(angle)
-            y = self.player.y + spawn_dist * math.sin(angle)
-            self.spawn_queue.append((t, x, y, hp, max(0.4, speed), m_info['damage']))
+        self.next_wave_at = 0
+        # 스폰 위치는 웨이브 시작 때 플레이어 위치 기준 (맵 밖)
+        self.plan = self.planner.get(self.wave)
+        self.plan_tick = 0
+        self.plan_cursor = 0
+        self.wave_origin = (self.player.x, self.player.y)
         self.state = STATE_PLAYING
 
-    def spawn_from_queue(self):
-        if self.spawn_queue and random.random() < 0.05:
-             t,x,y,hp,speed,dmg = self.spawn_queue.popleft()
-             self.monsters.append(Monster(t,x,y,hp,speed,dmg))
+    @property
+    def wave_clear_timer(self):
+        # 다음 웨이브까지 남은 틱 (클리어 전이면 0)
+        return max(0, self.next_wave_at - self.timers.now) if self.next_wave_at else 0
+
+    @wave_clear_timer.setter
+    def wave_clear_timer(self, ticks):
+        self.next_wave_at = self.timers.now + ticks if ticks else 0
+
+    def spawns_left(self):
+        return len(self.plan.tick) - self.plan_cursor if self.plan else 0
+
+    def spawn_from_plan(self):
+        # 계획표에서 이번 틱 차례인 몬스터를 낸다
+        p, i = self.plan, self.plan_cursor
+        while i < len(p.tick) and p.tick[i] <= self.plan_tick:
+            ox, oy = self.wave_origin
+            Monster.spawn(self.monsters, p.type[i], ox + p.dx[i], oy + p.dy[i], p.hp[i], p.speed[i], p.damage[i])
+            i += 1
+        self.plan_cursor = i
+        self.plan_tick += 1
 
     def update(self):
         if self.state == STATE_PLAYING:
-            self.player.update()
-            self.camera.update(self.player)
-            self.spawn_from_queue()
-
-            for b in self.bullets[:]:
-                b.update()
-                if b.life <= 0: self.bullets.remove(b)
-
-            for m in self.monsters[:]:
-                m.update(self.player.x, self.player.y)
-                if math.hypot(m.x - self.player.x, m.y - self.player.y) < self.player.size:
+            prof = PROFILER
+            with prof.section('update/spawn'):
+                self.timers.advance()  # 이번 틱에 만기인 타이머 (총알/보석 소멸은 여기서 삭제 표시만 된다)
+                self.camera.update(self.player)
+                self.spawn_from_plan()
+                px, py = self.player.x, self.player.y
+
+            # 총알: 이동 (수명이 다한 총알은 타이머가 이미 표시해 두었다)
+            with prof.section('update/bullets'):
+                self.bullets.move()
+
+            # 플레이어 칸이 바뀌면 흐름장을 다시 만든다 (여러 틱에 나눠서)
+            with prof.section('update/flow'):
+                self.flow.update(px, py)
+
+            # 몬스터: 흐름장을 따라 플레이어 추적, 닿으면 게임 오버
+            with prof.section('update/monsters'):
+                m = self.monsters
+                m.follow(self.flow, px, py)
+                m.separate(self.crowd_grid, SEPARATION)
+                if m.n and (np.hypot(m['x'] - px, m['y'] - py) < self.player.size).any():
                     self.reset_game()
                     return
 
-            for g in self.gems[:]:
-                g.update()
-                if g.life <= 0: self.gems.remove(g)
-                elif math.hypot(g.x - self.player.x, g.y - self.player.y) < self.player.size + 20:
-                    self.player.gems += 1
-                    self.gems.remove(g)
-
-            for b in self.bullets[:]:
-                for m in self.monsters[:]:
-                    if math.hypot(b.x-m.x, b.y-m.y) < (b.r + m.size/2):
-                        m.hp -= b.dmg
-                        if b in self.bullets: self.bullets.remove(b)
-                        if m.hp <= 0:
-                            self.player.give_exp(MONSTER_TYPES[m.type]['exp'])
-                            if random.random() < 0.20:
-                                self.gems.append(Gem(m.x, m.y))
-                            if m in self.monsters: self.monsters.remove(m)
-                        break
-
-            # 웨이브 클리어 처리: 몬스터와 스폰큐가 비었을 때 6초간 "Wave Clear!"를 보여주고 자동으로 다음 웨이브 시작
-            if not self.spawn_queue and not self.monsters:
-                if self.wave_clear_timer == 0:
-                    self.wave_clear_timer = 6 * FPS
+            # 보석: 가까이 가면 획득 (수명이 다한 보석은 타이머가 이미 표시해 두었다)
+            with prof.section('update/gems'):
+                g = self.gems
+                if g.n:
+                    picked = g.alive() & (np.hypot(g['x'] - px, g['y'] - py) < self.player.size + 20)
+                    self.player.gems += int(picked.sum())
+                    self.stats['gems'] += int(picked.sum())
+                    g.kill(picked)
+
+            with prof.section('update/collisions'):
+                self.collide_bullets()
+
+            # 이번 틱에 죽은 엔티티를 한꺼번에 정리
+            with prof.section('update/compact'):
+                self.bullets.compact()
+                self.monsters.compact()
+                self.gems.compact()
+
+            # 웨이브 클리어 처리: 몬스터와 남은 스폰 계획이 없을 때 6초간 "Wave Clear!"를 보여주고 자동으로 다음 웨이브 시작
+            if not self.spawns_left() and not self.monsters:
+                if not self.next_wave_at:
+                    self.next_wave_at = self.timers.now + 6 * FPS
                     self.player.stat_points += 1
-                else:
-                    self.wave_clear_timer -= 1
-                    if self.wave_clear_timer <= 0:
-                        self.start_wave()
+                    self.stats['waves_cleared'] += 1
+                elif self.timers.now >= self.next_wave_at:
+                    self.start_wave()
 
         elif self.state == STATE_INTERMISSION:
             # 이전 코드의 인터미션 루틴은 사용하지 않지만, 안전하게 대기
@@ -341,9 +508,124 @@ class Game:
             if self.interm_time <= 0:
                 self.start_wave()
 
+    def collide_bullets(self):
+        b, m = self.bullets, self.monsters
+        if not len(b) or not len(m):
+            return
+        pairs = len(b) * len(m)
+        hits = self.bullet_hits_scalar() if pairs <= SCALAR_MAX_PAIRS else self.bullet_hits(pairs)
+        spent, dead = b.dead, m.dead  # 수명이 다한 총알은 이미 표시되어 있다
+        hp, dmg = m['hp'], b['dmg']
+        for i, j in hits:
+            if spent[i] or dead[j]:
+                continue
+            b.remove(i)
+            hp[j] -= dmg[i]
+            if hp[j] <= 0:
+                m.remove(j)
+                self.kill_monster(j)
+
+    def bullet_hits(self, pairs):
+        # 맞은 (총알, 몬스터) 쌍을 총알 순서, 먼저 닿은 순서로 (총알 하나는 경로에서 처음 맞은 몬스터 하나만 때린다)
+        # 동시에 닿으면 몬스터 행 번호 순 (후보를 어떻게 얻든 같은 결과)
+        b, m = self.bullets, self.monsters
+        bx, by, bvx, bvy = b['x'], b['y'], b['vx'], b['vy']
+        if pairs < GRID_MIN_PAIRS:
+            bi, mj = np.divmod(np.arange(pairs), len(m))
+        else:
+            # 광역 단계: 이번 틱에 총알이 지나간 선분의 중점 기준 이웃 격자 칸의 몬스터만 후보로
+            # (선분 길이 절반 + 두 반지름이 격자 칸 크기 이하이면 빠지는 후보가 없다)
+            self.grid.build(m['x'], m['y'])
+            bi, mj = self.grid.pairs(bx - bvx / 2, by - bvy / 2)
+        # 정밀 단계: 몬스터 기준 상대 이동 선분이 원을 지났는지 (틱 끝 위치만 보면 빠른 총알이 건너뛴다)
+        ex = bx[bi] - m['x'][mj]
+        ey = by[bi] - m['y'][mj]
+        dx = bvx[bi] - m['vx'][mj]
+        dy = bvy[bi] - m['vy'][mj]
+        r = b['size'][bi] + m['size'][mj] / 2
+        hit = circle_sweep_hits(ex, ey, dx, dy, r)
+        if not hit.any():
+            return ()
+        bi, mj = bi[hit], mj[hit]
+        t = circle_sweep_time(ex[hit], ey[hit], dx[hit], dy[hit], r[hit])
+        order = np.lexsort((mj, t, bi))
+        return zip(bi[order].tolist(), mj[order].tolist())
+
+    def bullet_hits_scalar(self):
+        # bullet_hits()와 같은 결과를 numpy 호출 없이 쌍마다 파이썬 float로 (몇 쌍 안 될 때)
+        b, m = self.bullets, self.monsters
+        bullets = list(zip(b['x'].tolist(), b['y'].tolist(), b['vx'].tolist(), b['vy'].tolist(), b['size'].tolist()))
+        monsters = list(zip(m['x'].tolist(), m['y'].tolist(), m['vx'].tolist(), m['vy'].tolist(), m['size'].tolist()))
+        hits = []
+        for i, (bx, by, bvx, bvy, bs) in enumerate(bullets):
+            for j, (mx, my, mvx, mvy, ms) in enumerate(monsters):
+                t = circle_sweep(bx - mx, by - my, bvx - mvx, bvy - mvy, bs + ms / 2)
+                if t is not None:
+                    hits.append((i, t, j))
+        hits.sort()
+        return [(i, j) for i, _, j in hits]
+
+    def kill_monster(self, j):
+        m = self.monsters
+        self.stats['kills'] += 1
+        self.player.give_exp(MONSTER_TYPES[int(m['type'][j])]['exp'])
+        if random.random() < 0.20:
+            Gem.spawn(self.gems, m['x'][j], m['y'][j])
+
+    def allocation_count(self):
+        # 엔티티 저장소들이 지금까지 새로 할당한 횟수 (뷰 객체 + 배열 확장)
+        return self.bullets.allocations + self.monsters.allocations + self.gems.allocations
+
     def reset_game(self):
         self.__init__()
 
+    def snapshot(self):
+        # 지금 상태 전체를 바이트로 (되감기, 저장 슬롯, 분기 시뮬레이션용; 형식은 snapshot.py)
+        return snapshot.dump(self)
+
+    def restore(self, data):
+        snapshot.load(self, data)
+
+    def step(self, inp):
+        # 입력 적용 후 update() 한 번
+        self.player.prev_x, self.player.prev_y = self.player.x, self.player.y
+        if inp.start and self.state == STATE_LOBBY:
+            self.start_wave()
+        if self.state == STATE_PLAYING:
+            if inp.reload:
+                self.player.reload_weapon()
+            if inp.buy:
+                self.buy(inp.buy)
+            self.apply_input(inp.dx, inp.dy, inp.aim, inp.firing)
+        self.update()
+
+    def checksum(self):
+        # 이후 틱에 영향을 주는 상태 전체의 CRC (리플레이 검증용)
+        p = self.player
+        h = zlib.crc32(repr((self.state, self.wave, self.wave_clear_timer, self.planner.seed,
+                             self.plan_tick, self.plan_cursor, self.wave_origin,
+                             p.x, p.y, p.strength, p.level, p.exp, p.exp_to_level, p.gems, p.stat_points,
+                             p.fire_cool, p.mag, p.reloading, p.items_active, p.num_guns, p.aim_angle)).encode())
+        for store in (self.bullets, self.monsters, self.gems):
+            for name in store.names:
+                col = store[name]
+                if name == 'life' and store.timers is not None:
+                    col = col - self.timers.now  # 사라질 틱이 아니라 남은 틱으로
+                h = zlib.crc32(col.tobytes(), h)
+        return h
+
+    def apply_input(self, dx, dy, aim_angle, firing):
+        # 한 틱 분량의 이동/조준/사격 입력 (main 루프와 헤드리스 시뮬레이션이 같이 쓴다)
+        self.player.aim_angle = aim_angle
+        if dx != 0 or dy != 0:
+            mag = math.hypot(dx, dy)
+            self.player.x += (dx/mag) * self.player.speed
+            self.player.y += (dy/mag) * self.player.speed
+            self.player.x = clamp(self.player.x, 0, MAP_WIDTH)
+            self.player.y = clamp(self.player.y, 0, MAP_HEIGHT)
+        if firing:
+            self.shoot()
+
     def shoot(self):
         if self.player.fire():
             w = WEAPONS[self.player.weapon_id]
@@ -365,17 +647,33 @@ class Game:
             for angle in angles:
                 vx = math.cos(angle) * bs
                 vy = math.sin(angle) * bs
-                b = Bullet(self.player.x, self.player.y, vx, vy, self.player.damage)
-                self.bullets.append(b)
+                Bullet.spawn(self.bullets, self.player.x, self.player.y, vx, vy, self.player.damage)
 
     def handle_shop_click(self, pos):
         # 화면 고정 상점에서 클릭 처리
-        if self.shop_item_rects['atk_boost'].collidepoint(pos) and self.player.gems >= SHOP_ITEMS['atk_boost']['cost']:
-            self.player.gems -= SHOP_ITEMS['atk_boost']['cost']
-            self.player.items_active['atk_boost'] += 15 * FPS
-        if self.shop_item_rects['add_gun'].collidepoint(pos) and self.player.gems >= SHOP_ITEMS['add_gun']['cost'] and self.player.num_guns < 7:
-            self.player.gems -= SHOP_ITEMS['add_gun']['cost']
+        item_key = self.shop_item_at(pos)
+        if item_key:
+            self.buy(item_key)
+
+    def shop_item_at(self, pos):
+        for item_key, rect in self.shop_item_rects.items():
+            if rect.collidepoint(pos):
+                return item_key
+        return None
+
+    def buy(self, item_key):
+        # 보석이 충분하면 아이템 구매, 성공 여부를 돌려준다
+        cost = SHOP_ITEMS[item_key]['cost']
+        if self.player.gems < cost:
+            return False
+        if item_key == 'atk_boost':
+            self.player.add_item('atk_boost', 15 * FPS)
+        elif item_key == 'add_gun':
+            if self.player.num_guns >= 7:
+                return False
             self.player.num_guns += 1
+        self.player.gems -= cost
+        return True
 
     def draw_shop(self, surf):
         # 반투명 배경
@@ -400,12 +698,17 @@ class Game:
         draw_text(surf, "TAB으로 상점 닫기", WIDTH - 220, HEIGHT - 40)
 
     def draw_ui(self, surf):
-        draw_text(surf, f"웨이브: {self.wave}", 10, 10)
-        draw_text(surf, f"보석: {self.player.gems}", 10, 35)
-        draw_text(surf, f"레벨: {self.player.level} (EXP {self.player.exp}/{self.player.exp_to_level})", 10, 60)
-        w_name = WEAPONS[self.player.weapon_id]['name']
-        mag_status = "재장전중..." if self.player.reloading > 0 else str(self.player.mag)
-        draw_text(surf, f"무기: {w_name} | 탄약: {mag_status}", 10, 85)
+        p = self.player
+        w_name = WEAPONS[p.weapon_id]['name']
+        mag_status = "재장전중..." if p.reloading > 0 else str(p.mag)
+        # 왼쪽 상태 표시는 값이 바뀔 때만 글자를 다시 만든다
+        status = (self.wave, p.gems, p.level, p.exp, p.exp_to_level, w_name, mag_status)
+        self.status_panel.draw(surf, status, lambda: [
+            text_item(f"웨이브: {self.wave}", 10, 10),
+            text_item(f"보석: {p.gems}", 10, 35),
+            text_item(f"레벨: {p.level} (EXP {p.exp}/{p.exp_to_level})", 10, 60),
+            text_item(f"무기: {w_name} | 탄약: {mag_status}", 10, 85),
+        ])
         if self.player.items_active['atk_boost'] > 0:
             draw_text(surf, f"공격력 부스트! ({self.player.items_active['atk_boost']/FPS:.1f}s)", WIDTH-250, 10, color=RED)
         if self.wave_clear_timer > 0:
@@ -413,12 +716,20 @@ class Game:
             draw_text(surf, "Wave Clear!", WIDTH//2, HEIGHT//2 - 30, BIGFONT, center=True, color=YELLOW)
             draw_text(surf, f"다음 웨이브까지: {self.wave_clear_timer/FPS:.1f}s", WIDTH//2, HEIGHT//2 + 10, FONT, center=True)
 
-    def draw(self, surf):
-        surf.fill(GRASS_COLOR)
-        self.player.draw(surf, self.camera)
-        for g in self.gems: g.draw(surf, self.camera)
-        for b in self.bullets: b.draw(surf, self.camera)
-        for m in self.monsters: m.draw(surf, self.camera)
+    def draw(self, surf, alpha=1.0):
+        # alpha: 직전 틱과 마지막 틱 사이 어디를 그릴지 (고정 틱 루프의 보간 비율)
+        # 월드 그리기 호출 수: 배경 1 + 플레이어 1 + 화면 안에 하나라도 있는 종류마다 blits() 1
+        view = self.view
+        view.follow(*self.player.lerp(alpha))
+        surf.blit(get_background(), (0, 0), (view.x, view.y, WIDTH, HEIGHT))
+        self.player.draw(surf, view, alpha)
+        calls, sprites, culled = 2, 0, 0
+        for cls, store in ((Gem, self.gems), (Bullet, self.bullets), (Monster, self.monsters)):
+            drawn, skipped = cls.draw_all(surf, store, view, alpha)
+            calls += drawn > 0
+            sprites += drawn
+            culled += skipped
+        self.draw_calls, self.draw_sprites, self.draw_culled = calls, sprites, culled
         self.draw_ui(surf)
         if self.shop_open:
             self.draw_shop(surf)
@@ -441,7 +752,7 @@ def intermission_screen(win, game):
                 pos = ev.pos
                 if item_rects['atk_boost'].collidepoint(pos) and game.player.gems >= SHOP_ITEMS['atk_boost']['cost']:
                     game.player.gems -= SHOP_ITEMS['atk_boost']['cost']
-                    game.player.items_active['atk_boost'] += 15 * FPS
+                    game.player.add_item('atk_boost', 15 * FPS)
                 if item_rects['add_gun'].collidepoint(pos) and game.player.gems >= SHOP_ITEMS['add_gun']['cost'] and game.player.num_guns < 7:
                     game.player.gems -= SHOP_ITEMS['add_gun']['cost']
                     game.player.num_guns += 1
@@ -476,65 +787,115 @@ def intermission_screen(win, game):
         pygame.display.flip()
 
 
-def main():
+def main(record_path=None, render_fps=FPS):
+    # 게임 로직은 항상 FPS 틱/초로 돌고, 그리기는 render_fps(0이면 제한 없음)까지 한다
+    win = get_window()
+    recorder = None
+    if record_path:
+        recorder = DefenceRecorder(record_path)
+        random.seed(recorder.seed)
     game = Game()
     running = True
     mouse_down = False
+    prof = PROFILER
+    stepper = FixedStep(FPS)
+    start = reload = False  # 한 번만 적용되는 입력은 다음 틱이 돌 때까지 들고 있는다
+    buy = None
+    rewind = snapshot.Rewind(count=10, interval=FPS)
 
     while running:
-        CLOCK.tick(FPS)
-        mouse_pos = pygame.mouse.get_pos()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            # TAB으로 상점 열고 닫기
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
-                game.shop_open = not game.shop_open
-            if game.state == STATE_LOBBY:
-                if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                    game.start_wave()
-            elif game.state == STATE_PLAYING:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
-                    game.player.reload_weapon()
-                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    mouse_down = True
-                    # 상점이 열려있으면 클릭으로 구매 시도 (WASD 이동은 계속 가능)
-                    if game.shop_open:
-                        game.handle_shop_click(event.pos)
-                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                    mouse_down = False
-
-        if game.state == STATE_PLAYING:
-            # 조준 각도 업데이트 (플레이어는 화면 중앙)
+        with prof.section('wait'):
+            seconds = CLOCK.tick(render_fps) / 1000
+        with prof.section('events'):
+            mouse_pos = pygame.mouse.get_pos()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                # F3: 프레임 측정/오버레이 켜고 끄기, F4: 측정값 CSV/JSON 저장
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    prof.toggle()
+                    continue
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    print('프레임 측정값 저장:', prof.dump('defence_profile'))
+                    continue
+                # F5: 저장 슬롯에 저장, F9: 불러오기, BACKSPACE: 1초 전으로 되감기 (기록 중에는 끔)
+                if event.type == pygame.KEYDOWN and event.key in (pygame.K_F5, pygame.K_F9, pygame.K_BACKSPACE):
+                    if recorder:
+                        print('리플레이 기록 중에는 저장/불러오기/되감기를 쓸 수 없습니다')
+                    elif event.key == pygame.K_F5:
+                        with open(SAVE_PATH, 'wb') as f:
+                            f.write(game.snapshot())
+                    elif event.key == pygame.K_F9:
+                        try:
+                            with open(SAVE_PATH, 'rb') as f:
+                                game.restore(f.read())
+                            rewind.clear()
+                        except (OSError, ValueError) as e:
+                            print('불러오기 실패:', e)
+                    else:
+                        rewind.back(game)
+                    continue
+                # TAB으로 상점 열고 닫기
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+                    game.shop_open = not game.shop_open
+                if game.state == STATE_LOBBY:
+                    if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+                        start = True
+                elif game.state == STATE_PLAYING:
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                        reload = True
+                    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                        mouse_down = True
+                        # 상점이 열려있으면 클릭으로 구매 시도 (WASD 이동은 계속 가능)
+                        if game.shop_open:
+                            buy = game.shop_item_at(event.pos) or buy
+                    elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                        mouse_down = False
+
+        with prof.section('update'):
+            # 조준 각도 (플레이어는 화면 중앙)
             player_screen_x, player_screen_y = WIDTH//2, HEIGHT//2
-            game.player.aim_angle = math.atan2(mouse_pos[1] - player_screen_y, mouse_pos[0] - player_screen_x)
+            aim_angle = math.atan2(mouse_pos[1] - player_screen_y, mouse_pos[0] - player_screen_x)
 
             keys = pygame.key.get_pressed()
             dx = (keys[pygame.K_d] or keys[pygame.K_RIGHT]) - (keys[pygame.K_a] or keys[pygame.K_LEFT])
             dy = (keys[pygame.K_s] or keys[pygame.K_DOWN]) - (keys[pygame.K_w] or keys[pygame.K_UP])
-            if dx != 0 or dy != 0:
-                mag = math.hypot(dx, dy)
-                game.player.x += (dx/mag) * game.player.speed
-                game.player.y += (dy/mag) * game.player.speed
-                game.player.x = clamp(game.player.x, 0, MAP_WIDTH)
-                game.player.y = clamp(game.player.y, 0, MAP_HEIGHT)
-
-            if mouse_down:
-                game.shoot()
-
-        game.update()
-
-        if game.state == STATE_LOBBY:
-            WIN.fill((15,15,30))
-            draw_text(WIN, '서바이벌 디펜스', WIDTH//2, HEIGHT//2 - 50, BIGFONT, center=True)
-            draw_text(WIN, '아무 키나 눌러 시작', WIDTH//2, HEIGHT//2 + 20, FONT, center=True)
-        elif game.state == STATE_PLAYING:
-            game.draw(WIN)
-
-        pygame.display.flip()
-
+            # 밀린 시간만큼 틱을 돌린다 (그리기가 느리면 한 프레임에 여러 번)
+            for _ in range(stepper.advance(seconds)):
+                inp = TickInput(dx, dy, aim_angle, mouse_down, start, reload, buy)
+                if recorder:
+                    inp = recorder.record(game, inp)
+                game.step(inp)
+                if not recorder:
+                    rewind.tick(game)
+                start = reload = False
+                buy = None
+
+        with prof.section('draw'):
+            if game.state == STATE_LOBBY:
+                win.fill((15,15,30))
+                draw_text(win, '서바이벌 디펜스', WIDTH//2, HEIGHT//2 - 50, BIGFONT, center=True)
+                draw_text(win, '아무 키나 눌러 시작', WIDTH//2, HEIGHT//2 + 20, FONT, center=True)
+            elif game.state == STATE_PLAYING:
+                game.draw(win, stepper.alpha)
+            prof.draw(win, SMALLFONT, extra=stepper.stats() + [('entities', len(game.bullets) + len(game.monsters) + len(game.gems)),
+                                             ('draw calls', game.draw_calls),
+                                             ('sprites drawn/culled', f'{game.draw_sprites}/{game.draw_culled}'),
+                                             ('text cache hit/miss', f'{TEXT_CACHE.hits}/{TEXT_CACHE.misses}'),
+                                             ('hud panel hit/miss', f'{game.status_panel.hits}/{game.status_panel.misses}')])
+
+        with prof.section('flip'):
+            pygame.display.flip()
+        prof.end_frame()
+
+    if recorder:
+        recorder.close()
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Survival Defense')
+    parser.add_argument('--record', metavar='PATH', help='틱마다의 입력을 리플레이 파일로 기록')
+    parser.add_argument('--render-fps', type=int, default=FPS, help='그리기 프레임 제한 (0이면 제한 없음, 게임 속도와는 무관)')
+    args = parser.parse_args()
+    main(args.record, args.render_fps)
@@ -0,0 +1,205 @@
+# 구조체 배열(SoA) 엔티티 저장소
+# 엔티티 하나를 객체 하나로 두지 않고 속성마다 numpy 배열 한 줄(열)을 둔다.
+# 이동, 추적, 정리를 모든 엔티티에 대해 한 번의 배열 연산으로 처리한다.
+# 수명은 매 틱 깎지 않는다: 타이머 휠(timer_wheel.py)을 받으면 'life' 열에 사라질 시각을 넣고
+# 그 시각에 소멸 타이머 하나가 해당 행들을 삭제 표시한다 (같은 시각에 사라지는 행들은 타이머 하나를 같이 쓴다).
+# 삭제는 kill()/remove()로 표시만 해 두었다가 틱이 끝날 때 compact()에서
+# 마지막 행들을 빈자리로 옮겨 채운다 (swap-with-last). 빈 행과 뷰 객체는 재사용된다.
+import numpy as np
+
+BASE_COLUMNS = ('x', 'y', 'vx', 'vy', 'hp', 'life', 'size')
+
+
+def column(name):
+    # 뷰 클래스에서 저장소의 한 칸을 속성처럼 읽고 쓰기 위한 프로퍼티
+    def get(self):
+        return self.store.cols[name][self.i]
+
+    def set(self, v):
+        self.store.cols[name][self.i] = v
+
+    return property(get, set)
+
+
+class EntityView:
+    # 저장소의 i번째 행을 가리키는 얇은 뷰 (그리기용)
+    __slots__ = ('store', 'i')
+
+    x = column('x')
+    y = column('y')
+    vx = column('vx')
+    vy = column('vy')
+    hp = column('hp')
+    life = column('life')
+    size = column('size')
+
+    def __init__(self, store, i):
+        self.store = store
+        self.i = i
+
+
+class EntityStore:
+    def __init__(self, view=EntityView, extra=(), capacity=64, timers=None):
+        self.view = view
+        self.names = BASE_COLUMNS + tuple(extra)
+        self.capacity = capacity
+        self.n = 0
+        self.cols = {k: np.zeros(capacity) for k in self.names}
+        self.dead = np.zeros(capacity, dtype=bool)  # compact() 전까지 삭제 대기 중인 행
+        self.dirty = False      # 마지막 compact() 뒤에 remove()/kill()이 있었는지
+        self.views = []         # 행 번호별 뷰 객체 풀
+        self.allocations = 0    # 새로 만든 뷰 객체 수 + 배열 재할당 횟수
+        self.timers = timers    # 있으면 add(life=n)은 n틱 뒤에 사라질 행
+        self.expiries = {}      # 사라질 시각 -> 그 시각의 소멸 타이머
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, name):
+        # 살아있는 행만 담은 열 (원본 배열의 뷰이므로 바로 수정 가능)
+        return self.cols[name][:self.n]
+
+    def __setitem__(self, name, values):
+        self.cols[name][:self.n] = values
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield self.view_at(i)
+
+    def view_at(self, i):
+        # 행 번호마다 뷰 객체를 하나만 만들어 두고 계속 재사용한다
+        while len(self.views) <= i:
+            self.views.append(self.view(self, len(self.views)))
+            self.allocations += 1
+        return self.views[i]
+
+    def grow(self):
+        self.capacity *= 2
+        for k, c in self.cols.items():
+            bigger = np.zeros(self.capacity)
+            bigger[:self.n] = c[:self.n]
+            self.cols[k] = bigger
+        dead = np.zeros(self.capacity, dtype=bool)
+        dead[:self.n] = self.dead[:self.n]
+        self.dead = dead
+        self.allocations += 1
+
+    def add(self, **values):
+        if self.n == self.capacity:
+            self.grow()
+        i = self.n
+        for k in self.names:
+            self.cols[k][i] = values.get(k, 0.0)
+        if self.timers is not None and 'life' in values:
+            self.cols['life'][i] = self.expire_after(values['life'])
+        self.n += 1
+        return i
+
+    def expire_after(self, ticks):
+        # ticks 뒤의 시각. 그 시각의 소멸 타이머가 없으면 예약한다
+        at = self.timers.now + ticks
+        if at not in self.expiries:
+            self.expiries[at] = self.timers.schedule_at(at, self.expire, at)
+        return at
+
+    def expire(self, at):
+        del self.expiries[at]
+        self.kill(self['life'] <= at)
+
+    def rearm(self):
+        # 'life' 열에서 소멸 타이머를 다시 예약한다 (스냅샷 복원 뒤)
+        self.expiries = {}
+        for at in np.unique(self['life']).tolist():
+            self.expiries[at] = self.timers.schedule_at(at, self.expire, at)
+
+    def clear(self):
+        self.dead[:self.n] = False
+        self.dirty = False
+        self.n = 0
+
+    def alive(self):
+        return ~self.dead[:self.n]
+
+    def remove(self, i):
+        # O(1): 표시만 하고 실제 정리는 compact()에서
+        self.dead[i] = True
+        self.dirty = True
+
+    def kill(self, mask):
+        self.dead[:self.n] |= mask
+        self.dirty = True
+
+    def compact(self):
+        # 삭제 표시된 행을 뒤쪽의 살아있는 행으로 채운다 (순서는 유지되지 않음)
+        if not self.dirty:
+            return
+        self.dirty = False
+        dead = self.dead[:self.n]
+        k = int(np.count_nonzero(dead))
+        if k == 0:
+            return
+        m = self.n - k
+        holes = np.flatnonzero(dead[:m])
+        movers = np.flatnonzero(~dead[m:]) + m
+        for c in self.cols.values():
+            c[holes] = c[movers]
+        dead[:] = False
+        self.n = m
+
+    def move(self):
+        if not self.n:
+            return
+        self['x'] += self['vx']
+        self['y'] += self['vy']
+
+    def follow(self, field, tx, ty, speed='speed'):
+        # 흐름장(FlowField) 방향을 따라 이동. 목표까지 막힘이 없는 칸에서는 목표를 곧장 향한다.
+        if not self.n:
+            return
+        dx = tx - self['x']
+        dy = ty - self['y']
+        dist = np.hypot(dx, dy)
+        if field.open:
+            # 막힌 칸이 없으면 모든 칸이 clear: 흐름장을 읽지 않는다
+            scale = np.divide(self[speed], dist, out=np.zeros(self.n), where=dist > 0)
+            self['vx'] = dx * scale
+            self['vy'] = dy * scale
+        else:
+            ux, uy, clear = field.sample(self['x'], self['y'])
+            scale = np.divide(self[speed], dist, out=np.zeros(self.n), where=clear & (dist > 0))
+            self['vx'] = np.where(clear, dx * scale, ux * self[speed])
+            self['vy'] = np.where(clear, dy * scale, uy * self[speed])
+        self.move()
+
+    def separate(self, grid, strength=0.5):
+        # 겹친 행끼리 서로 밀어낸다. 이웃 후보는 격자(SpatialGrid)에서 얻으므로 O(M²)이 아니다.
+        # 겹친 깊이의 strength만큼을 한 틱에 풀고, 큰 쪽(size)은 덜 밀린다. 두 행 지름 평균이 격자 칸 이하여야 한다.
+        if self.n < 2 or not strength:
+            return
+        x, y, size = self['x'], self['y'], self['size']
+        if self.n <= 48:
+            # 몇 마리 안 될 때는 격자를 만드는 비용보다 모든 쌍을 보는 편이 싸다
+            i, j = np.divmod(np.arange(self.n * self.n), self.n)
+        else:
+            grid.build(x, y)
+            i, j = grid.pairs(x, y)
+        keep = i != j
+        i, j = i[keep], j[keep]
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        dist = np.hypot(dx, dy)
+        reach = (size[i] + size[j]) / 2
+        hit = dist < reach
+        if not hit.any():
+            return
+        i, j, dx, dy, dist, reach = i[hit], j[hit], dx[hit], dy[hit], dist[hit], reach[hit]
+        # 완전히 겹친 쌍은 행 번호로 정한 방향으로 떼어 낸다 (결정적)
+        same = dist == 0
+        if same.any():
+            angle = i[same] * 2.399963  # 황금각
+            dx[same] = np.cos(angle)
+            dy[same] = np.sin(angle)
+            dist[same] = 1.0
+        push = strength * (reach - dist) / dist * size[j] / (size[i] + size[j])
+        self['x'] += np.bincount(i, dx * push, self.n)
+        self['y'] += np.bincount(i, dy * push, self.n)
@@ -0,0 +1,53 @@
+# 고정 시간 간격(fixed timestep) 루프 도우미 (두 게임이 같이 쓴다)
+# 게임 로직은 항상 1/rate초짜리 틱으로만 진행하고, 그리기는 그 사이 어느 시점이든 될 수 있다.
+# 프레임마다 실제로 흐른 시간을 쌓아 두었다가 틱 길이만큼씩 꺼내 쓰므로, 그리기가 느려져도
+# 한 프레임에 틱을 여러 번 돌려 게임 속도(프레임 단위 타이머 포함)가 실제 시간과 맞는다.
+# 남은 시간의 비율(alpha)은 직전 틱과 마지막 틱 사이 보간에 쓴다.
+import time
+
+
+class FixedStep:
+    def __init__(self, rate=60, max_steps=8):
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.max_steps = max_steps  # 한 프레임에 돌릴 최대 틱 수 (이보다 밀리면 남는 시간은 버린다)
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.ticks = 0
+        self.dropped = 0.0          # 따라잡지 못해 버린 시간 (초)
+        # 최근 1초 동안의 틱/프레임 수
+        self.sim_rate = 0.0
+        self.render_rate = 0.0
+        self.window_start = time.perf_counter()
+        self.window_steps = 0
+        self.window_frames = 0
+
+    def advance(self, seconds):
+        # 이번 프레임에 흐른 시간을 쌓고, 돌려야 할 틱 수를 돌려준다
+        self.accumulator += seconds
+        steps = int(self.accumulator * self.rate)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+            self.accumulator = steps * self.dt
+        self.accumulator -= steps * self.dt
+        self.alpha = min(1.0, self.accumulator * self.rate)
+        self.ticks += steps
+        self.measure(steps)
+        return steps
+
+    def measure(self, steps):
+        self.window_steps += steps
+        self.window_frames += 1
+        now = time.perf_counter()
+        elapsed = now - self.window_start
+        if elapsed >= 1.0:
+            self.sim_rate = self.window_steps / elapsed
+            self.render_rate = self.window_frames / elapsed
+            self.window_start = now
+            self.window_steps = self.window_frames = 0
+
+    def stats(self):
+        # 프로파일러 오버레이에 덧붙일 (이름, 값) 목록
+        return [('sim / render Hz', f'{self.sim_rate:.0f} / {self.render_rate:.0f}'),
+                ('dropped ms', f'{self.dropped * 1000:.0f}')]
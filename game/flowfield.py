@@ -0,0 +1,154 @@
+# 흐름장(flow field) 길찾기
+# 맵을 칸으로 나누고 목표 칸(플레이어)에서 거꾸로 다익스트라를 돌려 칸마다 "목표 쪽 다음 칸" 방향을 저장한다.
+# 몬스터는 자기 칸의 방향 벡터를 읽기만 하면 되므로 몬스터 하나당 O(1)이다.
+# 목표 칸이 바뀌면 새 탐색을 시작하고 틱마다 budget 칸씩만 진행한다 (끝날 때까지는 이전 흐름장을 그대로 쓴다).
+# 목표까지의 사각형 안에 막힌 칸이 없는 칸(clear)에서는 흐름장 대신 목표를 곧장 향하면 된다.
+import heapq
+
+import numpy as np
+
+# (dx, dy, 비용) 대각선은 약 √2배
+STEPS = [(1, 0, 5), (-1, 0, 5), (0, 1, 5), (0, -1, 5), (1, 1, 7), (1, -1, 7), (-1, 1, 7), (-1, -1, 7)]
+UNREACHED = float('inf')
+
+
+class FlowField:
+    def __init__(self, width, height, cell_size=32, obstacles=(), budget=500):
+        self.cell_size = cell_size
+        self.cols = width // cell_size + 1
+        self.rows = height // cell_size + 1
+        self.budget = budget  # 틱마다 확정할 최대 칸 수
+        blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        for x, y, w, h in obstacles:
+            blocked[int(y // cell_size):int((y + h - 1) // cell_size) + 1,
+                    int(x // cell_size):int((x + w - 1) // cell_size) + 1] = True
+        self.blocked = blocked
+        self.open = not blocked.any()  # 막힌 칸이 없으면 모든 칸이 clear라 탐색할 필요가 없다
+        self.blocked_list = blocked.ravel().tolist()
+        # 2차원 누적합: 임의의 사각형 안에 막힌 칸이 몇 개인지 O(1)로 센다
+        self.blocked_sum = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int32)
+        self.blocked_sum[1:, 1:] = blocked.cumsum(0).cumsum(1)
+        # 지금 쓰는 흐름장 (첫 탐색이 끝나기 전에는 모든 칸이 목표를 곧장 향한다)
+        n = self.rows * self.cols
+        self.target = None
+        self.dir_x = np.zeros(n)
+        self.dir_y = np.zeros(n)
+        self.clear = np.ones(n, dtype=bool)
+        # 진행 중인 탐색
+        self.pending = None
+        self.dist = None
+        self.heap = []
+        self.settled = 0  # 진행 중인 탐색에서 지금까지 확정한 칸 수
+        self.rebuilds = 0
+
+    def cells_of(self, xs, ys):
+        # 맵 밖의 좌표는 가장자리 칸으로 모은다
+        cx = np.clip(np.floor_divide(xs, self.cell_size), 0, self.cols - 1).astype(np.intp)
+        cy = np.clip(np.floor_divide(ys, self.cell_size), 0, self.rows - 1).astype(np.intp)
+        return cy * self.cols + cx
+
+    def cell_at(self, x, y):
+        cx = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        cy = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return cy * self.cols + cx
+
+    def update(self, tx, ty):
+        # 목표 칸이 바뀌었으면 새 탐색을 시작하고, 진행 중인 탐색을 budget만큼 이어 간다
+        if self.open:
+            return
+        cell = self.cell_at(tx, ty)
+        if cell == self.target:
+            self.pending = None
+        elif cell != self.pending:
+            self.start(cell)
+        if self.pending is not None:
+            self.expand(self.budget)
+
+    def start(self, cell):
+        self.pending = cell
+        self.dist = [UNREACHED] * (self.rows * self.cols)
+        self.dist[cell] = 0
+        self.heap = [(0, cell)]
+        self.settled = 0
+
+    def expand(self, budget):
+        dist, heap, blocked = self.dist, self.heap, self.blocked_list
+        cols, rows = self.cols, self.rows
+        done = 0
+        while heap and done < budget:
+            d, c = heapq.heappop(heap)
+            if d > dist[c]:
+                continue
+            done += 1
+            cy, cx = divmod(c, cols)
+            for dx, dy, cost in STEPS:
+                nx, ny = cx + dx, cy + dy
+                if nx < 0 or nx >= cols or ny < 0 or ny >= rows:
+                    continue
+                nc = ny * cols + nx
+                if blocked[nc]:
+                    continue
+                # 막힌 칸의 모서리를 대각선으로 가로지르지 않는다
+                if dx and dy and (blocked[cy * cols + nx] or blocked[ny * cols + cx]):
+                    continue
+                nd = d + cost
+                if nd < dist[nc]:
+                    dist[nc] = nd
+                    heapq.heappush(heap, (nd, nc))
+        self.settled += done
+        if not heap:
+            self.finish()
+
+    def resume(self, target, pending, settled):
+        # 스냅샷에서 되살리기: 탐색은 결정적이므로 완성된 흐름장은 처음부터, 진행 중인 탐색은 같은 칸 수만큼 다시 돌린다
+        self.pending = None
+        if self.open:
+            return
+        if target is not None:
+            self.start(target)
+            self.expand(len(self.blocked_list))
+        if pending is not None:
+            self.start(pending)
+            self.expand(settled)
+
+    def finish(self):
+        # 거리장이 완성되면 칸마다 가장 가까운 이웃 쪽 단위 벡터와 clear 여부를 한꺼번에 계산해 교체한다
+        rows, cols = self.rows, self.cols
+        dist = np.array(self.dist).reshape(rows, cols)
+        padded = np.full((rows + 2, cols + 2), UNREACHED)
+        padded[1:-1, 1:-1] = dist
+        wall = np.ones((rows + 2, cols + 2), dtype=bool)
+        wall[1:-1, 1:-1] = self.blocked
+        best = dist.copy()
+        bx = np.zeros((rows, cols))
+        by = np.zeros((rows, cols))
+        for dx, dy, _ in STEPS:
+            nd = padded[1 + dy:rows + 1 + dy, 1 + dx:cols + 1 + dx]
+            if dx and dy:
+                cut = wall[1:-1, 1 + dx:cols + 1 + dx] | wall[1 + dy:rows + 1 + dy, 1:-1]
+                nd = np.where(cut, UNREACHED, nd)
+            better = nd < best
+            best = np.where(better, nd, best)
+            bx[better] = dx
+            by[better] = dy
+        norm = np.hypot(bx, by)
+        norm[norm == 0] = 1
+        self.dir_x = (bx / norm).ravel()
+        self.dir_y = (by / norm).ravel()
+
+        ty, tx = divmod(self.pending, cols)
+        cy, cx = np.mgrid[0:rows, 0:cols]
+        x0, x1 = np.minimum(cx, tx), np.maximum(cx, tx) + 1
+        y0, y1 = np.minimum(cy, ty), np.maximum(cy, ty) + 1
+        s = self.blocked_sum
+        self.clear = (s[y1, x1] - s[y0, x1] - s[y1, x0] + s[y0, x0] == 0).ravel()
+
+        self.target = self.pending
+        self.pending = None
+        self.dist = None
+        self.rebuilds += 1
+
+    def sample(self, xs, ys):
+        # 좌표마다 (방향 x, 방향 y, 곧장 가도 되는지)
+        c = self.cells_of(xs, ys)
+        return self.dir_x[c], self.dir_y[c], self.clear[c]
@@ -1,6 +1,16 @@
+import argparse
 import pygame
 import sys
 import random
+import zlib
+
+from profiler import PROFILER
+from text_cache import TEXT_CACHE, HudPanel
+from replay import ArenaRecorder
+from fixed_step import FixedStep
+from swept import swept_rects_hit
+from sprite_atlas import ATLAS
+from timer_wheel import TimerWheel
 
 # ------------------------------
 # Game Config
@@ -37,22 +47,56 @@ WHITE = (230, 230, 235)
 RED = (230, 70, 70)
 GREEN = (70, 210, 120)
 
+# Per-player input, one byte per tick (live keyboard, replays and bots all use this)
+IN_UP = 1
+IN_DOWN = 2
+IN_LEFT = 4
+IN_RIGHT = 8
+IN_SWING = 16  # pressed this tick
+IN_BOOST = 32
+INPUT_BITS = (("up", IN_UP), ("down", IN_DOWN), ("left", IN_LEFT), ("right", IN_RIGHT), ("boost", IN_BOOST))
+
+P1_CONTROLS = {"up":pygame.K_w,"down":pygame.K_s,"left":pygame.K_a,"right":pygame.K_d,"swing":pygame.K_SPACE,"boost":pygame.K_f}
+P2_CONTROLS = {"up":pygame.K_UP,"down":pygame.K_DOWN,"left":pygame.K_LEFT,"right":pygame.K_RIGHT,"swing":pygame.K_KP0,"boost":pygame.K_KP_PERIOD}
+
 # ------------------------------
 # Classes
 # ------------------------------
+class KeyboardController:
+    # Live play: held keys are read every tick, swing comes from KEYDOWN events and is held until a tick uses it.
+    # Any callable controller(arena, me, other, now_ms) -> IN_* bits can drive a Player (see arena_bots.py).
+    def __init__(self, controls):
+        self.controls = controls
+        self.swing = 0
+
+    def key_down(self, key):
+        if key == self.controls["swing"]:
+            self.swing = IN_SWING
+
+    def __call__(self, arena, me, other, now_ms):
+        bits = me.input_bits(pygame.key.get_pressed()) | self.swing
+        self.swing = 0
+        return bits
+
+
 class Player:
-    def __init__(self, pos, color, controls):
+    # Sword, boost and invincibility end as timer events on a ms clock (the Arena's, shared by both players)
+    def __init__(self, pos, color, controls, controller=None, timers=None):
+        self.timers = timers if timers is not None else TimerWheel()
         self.color = color
         self.rect = pygame.Rect(pos[0], pos[1], PLAYER_SIZE, PLAYER_SIZE)
+        self.prev_pos = self.rect.topleft  # position before the last tick, for render interpolation
         self.facing = "down"
         self.base_speed = BASE_SPEED
         self.boost_speed = BOOST_SPEED
         self.controls = controls
+        self.controller = controller or KeyboardController(controls)
 
         # Sword state
         self.sword_active = False
         self.sword_until = 0
         self.sword_has_hit = False
+        self.sword_timer = None
 
         # Combat state
         self.hp = START_HP
@@ -62,27 +106,56 @@ class Player:
         self.is_boosting = False
         self.boost_until = 0
         self.boost_cd_until = 0
+        self.boost_timer = None
 
         # Invincible state
         self.invincible = False
         self.invincible_until = 0
+        self.invincible_timer = None
         self.visible = True
         self.last_blink = 0
 
+    def restart_timer(self, timer, at, callback):
+        # A new swing/boost/hit replaces the pending end of the previous one
+        if timer:
+            self.timers.cancel(timer)
+        return self.timers.schedule_at(at, callback)
+
+    def end_swing(self):
+        self.sword_active = False
+
+    def end_boost(self):
+        self.is_boosting = False
+
+    def end_invincible(self):
+        self.invincible = False
+        self.visible = True
+
     def current_speed(self, now_ms):
         if self.is_boosting and now_ms < self.boost_until:
             return self.boost_speed
         return self.base_speed
 
+    def input_bits(self, keys):
+        # Held keys -> IN_* bitmask (swing comes from KEYDOWN events, not from here)
+        bits = 0
+        for name, bit in INPUT_BITS:
+            if keys[self.controls[name]]:
+                bits |= bit
+        return bits
+
     def handle_input(self, keys, now_ms, arena_rect):
+        self.apply_input(self.input_bits(keys), now_ms, arena_rect)
+
+    def apply_input(self, bits, now_ms, arena_rect):
         dx = dy = 0
-        if keys[self.controls["left"]]:
+        if bits & IN_LEFT:
             dx -= 1
-        if keys[self.controls["right"]]:
+        if bits & IN_RIGHT:
             dx += 1
-        if keys[self.controls["up"]]:
+        if bits & IN_UP:
             dy -= 1
-        if keys[self.controls["down"]]:
+        if bits & IN_DOWN:
             dy += 1
 
         if dx < 0:
@@ -100,13 +173,11 @@ class Player:
         self.rect.clamp_ip(arena_rect)
 
         # Boost activation
-        if keys[self.controls["boost"]] and now_ms >= self.boost_cd_until:
+        if bits & IN_BOOST and now_ms >= self.boost_cd_until:
             self.is_boosting = True
             self.boost_until = now_ms + BOOST_DURATION_MS
             self.boost_cd_until = now_ms + BOOST_DURATION_MS + BOOST_COOLDOWN_MS
-
-        if self.is_boosting and now_ms >= self.boost_until:
-            self.is_boosting = False
+            self.boost_timer = self.restart_timer(self.boost_timer, self.boost_until, self.end_boost)
 
     def start_swing(self, now_ms):
         if not self.sword_active and now_ms - self.last_attack_time >= ATTACK_COOLDOWN_MS:
@@ -114,15 +185,11 @@ class Player:
             self.sword_until = now_ms + SWORD_DURATION_MS
             self.sword_has_hit = False
             self.last_attack_time = now_ms
+            self.sword_timer = self.restart_timer(self.sword_timer, self.sword_until, self.end_swing)
 
     def update(self, now_ms):
-        # Sword 종료
-        if self.sword_active and now_ms >= self.sword_until:
-            self.sword_active = False
-        # Invincible 종료
-        if self.invincible and now_ms >= self.invincible_until:
-            self.invincible = False
-            self.visible = True
+        # Sword / boost / invincibility end (timer events; with a shared wheel the first update fires both players')
+        self.timers.advance_to(now_ms)
         # 깜빡임 처리
         if self.invincible:
             if now_ms - self.last_blink > 150:
@@ -143,24 +210,47 @@ class Player:
             return pygame.Rect(x + w // 2 - SWORD_THICKNESS // 2, y + h, SWORD_THICKNESS, SWORD_LENGTH)
         return None
 
-    def draw(self, surf):
-        if self.visible:
-            pygame.draw.rect(surf, self.color, self.rect, border_radius=8)
-        eye_size = 6
-        if self.facing == "left":
-            eye = pygame.Rect(self.rect.left + 4, self.rect.centery - 3, eye_size, eye_size)
-        elif self.facing == "right":
-            eye = pygame.Rect(self.rect.right - 4 - eye_size, self.rect.centery - 3, eye_size, eye_size)
-        elif self.facing == "up":
-            eye = pygame.Rect(self.rect.centerx - 3, self.rect.top + 4, eye_size, eye_size)
-        else:
-            eye = pygame.Rect(self.rect.centerx - 3, self.rect.bottom - 4 - eye_size, eye_size, eye_size)
-        pygame.draw.rect(surf, WHITE, eye, border_radius=3)
-
+    def render_offset(self, alpha):
+        # alpha blends between the previous and the current tick's position
+        return (round((self.prev_pos[0] - self.rect.x) * (1 - alpha)),
+                round((self.prev_pos[1] - self.rect.y) * (1 - alpha)))
+
+    def bounds(self, alpha=1.0):
+        # Screen area draw() touches: body plus sword
+        ox, oy = self.render_offset(alpha)
+        srect = self.sword_rect()
+        return self.rect.union(srect).move(ox, oy) if srect else self.rect.move(ox, oy)
+
+    def draw(self, surf, alpha=1.0):
+        ox, oy = self.render_offset(alpha)
+        page, area = player_sprite(self.color, self.facing, self.visible)
+        surf.blit(page, self.rect.move(ox, oy), area)
         if self.sword_active:
             srect = self.sword_rect()
             if srect:
-                pygame.draw.rect(surf, SWORD_COLOR, srect, border_radius=4)
+                page, area = ATLAS.round_rect(SWORD_COLOR, srect.w, srect.h, 4)
+                surf.blit(page, srect.move(ox, oy), area)
+
+
+def eye_rect(rect, facing):
+    eye_size = 6
+    if facing == "left":
+        return pygame.Rect(rect.left + 4, rect.centery - 3, eye_size, eye_size)
+    if facing == "right":
+        return pygame.Rect(rect.right - 4 - eye_size, rect.centery - 3, eye_size, eye_size)
+    if facing == "up":
+        return pygame.Rect(rect.centerx - 3, rect.top + 4, eye_size, eye_size)
+    return pygame.Rect(rect.centerx - 3, rect.bottom - 4 - eye_size, eye_size, eye_size)
+
+
+def player_sprite(color, facing, visible):
+    # Body (skipped while blinking) and eye, baked into the sprite atlas once per look
+    def paint(s):
+        rect = s.get_rect()
+        if visible:
+            pygame.draw.rect(s, color, rect, border_radius=8)
+        pygame.draw.rect(s, WHITE, eye_rect(rect, facing), border_radius=3)
+    return ATLAS.get(("arena_player", color, facing, visible), PLAYER_SIZE, PLAYER_SIZE, paint)
 
 
 class Item:
@@ -168,55 +258,177 @@ class Item:
         self.rect = pygame.Rect(pos[0], pos[1], ITEM_SIZE, ITEM_SIZE)
 
     def draw(self, surf):
-        pygame.draw.rect(surf, ITEM_COLOR, self.rect, border_radius=6)
+        page, area = ATLAS.round_rect(ITEM_COLOR, ITEM_SIZE, ITEM_SIZE, 6)
+        surf.blit(page, self.rect, area)
+
+
+BACKGROUND = None
+
+
+def get_background(arena_rect):
+    # The static arena is drawn once and blitted from then on
+    global BACKGROUND
+    if BACKGROUND is None:
+        BACKGROUND = pygame.Surface((WIDTH, HEIGHT))
+        if pygame.display.get_surface() is not None:
+            BACKGROUND = BACKGROUND.convert()
+        BACKGROUND.fill(BG)
+        pygame.draw.rect(BACKGROUND, ARENA_LINE, arena_rect, width=4, border_radius=12)
+    return BACKGROUND
 
 
 def draw_arena(surf, arena_rect):
-    surf.fill(BG)
-    pygame.draw.rect(surf, ARENA_LINE, arena_rect, width=4, border_radius=12)
+    surf.blit(get_background(arena_rect), (0, 0))
+
+
+HUD_BAR_W = 280
+HUD_BAR_H = 18
+HUD_PANELS = {}  # side -> HudPanel
+HUD_SIDES = (("P1", ARENA_PADDING), ("P2", WIDTH-ARENA_PADDING-HUD_BAR_W))
+
+
+def render_player_hud(label, x, hp, cd_left, font):
+    # One player's HP bar and texts as (surface, pos) pairs; rebuilt only when hp/cooldown change
+    bar = pygame.Surface((HUD_BAR_W, HUD_BAR_H), pygame.SRCALPHA)
+    ratio = max(hp, 0) / START_HP
+    pygame.draw.rect(bar, (60,60,65), (0, 0, HUD_BAR_W, HUD_BAR_H), border_radius=8)
+    pygame.draw.rect(bar, GREEN if hp>0 else RED, (0, 0, int(HUD_BAR_W * ratio), HUD_BAR_H), border_radius=8)
+    bottom = 16 + HUD_BAR_H
+    items = [(bar, (x, 16)), (TEXT_CACHE.render(font, f"{label} HP: {hp}", WHITE), (x, bottom + 4))]
+    if cd_left is not None:
+        items.append((TEXT_CACHE.render(font, f"Boost CD: {cd_left}s", WHITE), (x, bottom + 24)))
+    return items
+
+
+def hud_panel(label, x, p, font, now):
+    # (key, blit items) of one player's HUD; the items are rebuilt only when the key changes
+    cd_left = max(0,(p.boost_cd_until - now)//1000) if now < p.boost_cd_until else None
+    key = (p.hp, cd_left)
+    panel = HUD_PANELS.setdefault(label, HudPanel())
+    return key, panel.get(key, lambda: render_player_hud(label, x, p.hp, cd_left, font))
 
 
 def draw_hud(surf, p1, p2, font, now):
-    bar_w = 280
-    bar_h = 18
-
-    # P1 HP
-    p1_ratio = max(p1.hp, 0) / START_HP
-    p1_back = pygame.Rect(ARENA_PADDING, 16, bar_w, bar_h)
-    p1_hp = pygame.Rect(ARENA_PADDING, 16, int(bar_w * p1_ratio), bar_h)
-    pygame.draw.rect(surf, (60,60,65), p1_back, border_radius=8)
-    pygame.draw.rect(surf, GREEN if p1.hp>0 else RED, p1_hp, border_radius=8)
-    txt1 = font.render(f"P1 HP: {p1.hp}", True, WHITE)
-    surf.blit(txt1, (p1_back.left, p1_back.bottom + 4))
-
-    if now < p1.boost_cd_until:
-        cd_left = max(0,(p1.boost_cd_until - now)//1000)
-        cd_txt = font.render(f"Boost CD: {cd_left}s", True, WHITE)
-        surf.blit(cd_txt, (p1_back.left, p1_back.bottom + 24))
-
-    # P2 HP
-    p2_ratio = max(p2.hp,0)/START_HP
-    p2_back = pygame.Rect(WIDTH-ARENA_PADDING-bar_w,16,bar_w,bar_h)
-    p2_hp = pygame.Rect(WIDTH-ARENA_PADDING-bar_w,16,int(bar_w*p2_ratio),bar_h)
-    pygame.draw.rect(surf,(60,60,65),p2_back,border_radius=8)
-    pygame.draw.rect(surf, GREEN if p2.hp>0 else RED, p2_hp,border_radius=8)
-    txt2 = font.render(f"P2 HP: {p2.hp}", True, WHITE)
-    surf.blit(txt2, (p2_back.left, p2_back.bottom+4))
-    if now < p2.boost_cd_until:
-        cd_left = max(0,(p2.boost_cd_until - now)//1000)
-        cd_txt = font.render(f"Boost CD: {cd_left}s", True, WHITE)
-        surf.blit(cd_txt, (p2_back.left, p2_back.bottom + 24))
+    for (label, x), p in zip(HUD_SIDES, (p1, p2)):
+        surf.blits(hud_panel(label, x, p, font, now)[1], doreturn=False)
+
+
+def game_over_item(arena, big_font):
+    # (surface, pos) of the winner banner, or None while the match is on
+    if not arena.game_over:
+        return None
+    winner = arena.winner()
+    msg = TEXT_CACHE.render(big_font, f"{winner} WINS! Press R to restart" if winner else "DRAW! Press R to restart", WHITE)
+    return msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 - msg.get_height()//2)
+
+
+def items_rect(items):
+    rects = [surf.get_rect(topleft=pos) for surf, pos in items]
+    return rects[0].unionall(rects[1:]) if rects else None
+
+
+class DirtyRenderer:
+    # Dirty-rectangle renderer: instead of redrawing and flipping the whole window, restore the cached
+    # background only where something was or now is drawn, redraw what lies there and return just those
+    # rects for display.update().
+    # Sprites (players, items) are opaque, so drawing them twice is harmless and they are redrawn every
+    # frame. Layers (HUD, banner, overlay) have antialiased/translucent pixels and are only redrawn onto
+    # freshly restored background: when their key changes or a restored rect touches them.
+    def __init__(self, screen, arena_rect):
+        self.screen = screen
+        self.background = get_background(arena_rect)
+        self.sprites = []   # sprite bounds drawn last frame
+        self.layers = {}    # name -> (key, rect) drawn last frame
+        self.full = True    # first frame (or after invalidate()) repaints everything
+        self.pixels = 0     # pixels pushed by the last frame
+
+    def invalidate(self):
+        self.full = True
+
+    def render(self, arena, font, big_font, now, alpha=1.0, overlay=None):
+        # overlay(screen) draws a translucent box on top and returns its rect (or None); redrawn every frame
+        screen, background = self.screen, self.background
+        sprites = [arena.p1.bounds(alpha), arena.p2.bounds(alpha)] + [item.rect for item in arena.items]
+        layers = {}
+        for (label, x), p in zip(HUD_SIDES, (arena.p1, arena.p2)):
+            key, items = hud_panel(label, x, p, font, now)
+            layers[label] = (key, items)
+        banner = game_over_item(arena, big_font)
+        layers["banner"] = (banner, [banner] if banner else [])
+
+        if self.full:
+            screen.blit(background, (0, 0))
+            restored = [screen.get_rect()]
+            redraw = set(layers) | {"overlay"}
+        else:
+            restored = self.sprites + sprites
+            redraw = {name for name, (key, _) in layers.items() if key != self.layers.get(name, (None, None))[0]}
+            if overlay is not None or "overlay" in self.layers:
+                redraw.add("overlay")
+            # A restored rect wipes any layer under it, which then needs restoring and redrawing too
+            grown = True
+            while grown:
+                grown = False
+                for name, (_, rect) in self.layers.items():
+                    if name not in redraw and rect is not None and rect.collidelist(restored) != -1:
+                        redraw.add(name)
+                for name in redraw:
+                    old = self.layers.get(name, (None, None))[1]
+                    new = items_rect(layers[name][1]) if name in layers else None
+                    for r in (old, new):
+                        if r is not None and r not in restored:
+                            restored.append(r)
+                            grown = True
+            for r in restored:
+                screen.blit(background, r, r)
+
+        # Same order as Arena.draw
+        arena.p1.draw(screen, alpha)
+        arena.p2.draw(screen, alpha)
+        for item in arena.items:
+            item.draw(screen)
+        drawn = {}
+        for name, (key, items) in layers.items():
+            if name in redraw:
+                screen.blits(items, doreturn=False)
+            drawn[name] = (key, items_rect(items))
+        if overlay is not None:
+            rect = overlay(screen)
+            if rect is not None:
+                drawn["overlay"] = (None, rect)
+                restored.append(rect)
+
+        self.sprites = sprites
+        self.layers = drawn
+        self.full = False
+        self.pixels = sum(r.w * r.h for r in restored)
+        return restored
 
 
 def check_sword_hit(attacker: Player, defender: Player, now_ms):
     if not attacker.sword_active or attacker.sword_has_hit or defender.invincible:
         return False
     srect = attacker.sword_rect()
-    if srect and srect.colliderect(defender.rect):
+    if not srect:
+        return False
+    if attacker.is_boosting or defender.is_boosting:
+        # Swept test: a boosted pass can move far enough in one tick to skip over the other player.
+        # On the tick the swing starts the sword had no previous position, so it counts as standing still there.
+        if attacker.last_attack_time == now_ms:
+            sword_prev = srect.topleft
+        else:
+            px, py = attacker.prev_pos
+            sword_prev = (srect.x - attacker.rect.x + px, srect.y - attacker.rect.y + py)
+        hit = swept_rects_hit(srect, sword_prev, defender.rect, defender.prev_pos)
+    else:
+        hit = srect.colliderect(defender.rect)  # walking speed can't skip over anything
+    if hit:
         dmg = DAMAGE_PER_HIT_BOOST if attacker.is_boosting else DAMAGE_PER_HIT
         defender.hp -= dmg
         defender.invincible = True
         defender.invincible_until = now_ms + 1000
+        defender.invincible_timer = defender.restart_timer(defender.invincible_timer, defender.invincible_until,
+                                                           defender.end_invincible)
         defender.last_blink = now_ms
         attacker.sword_has_hit = True
         return True
@@ -234,7 +446,98 @@ def reset_round(p1, p2, arena_rect):
     p1.last_attack_time = p2.last_attack_time = 0
 
 
-def main():
+# One match: both players, items and the round state, stepped one tick at a time
+class Arena:
+    def __init__(self, now_ms=0, rng=random):
+        self.rect = pygame.Rect(ARENA_PADDING, ARENA_PADDING, WIDTH-2*ARENA_PADDING, HEIGHT-2*ARENA_PADDING)
+        self.timers = TimerWheel(now_ms)
+        self.p1 = Player((self.rect.left + 80, self.rect.centery - PLAYER_SIZE//2), P1_COLOR, P1_CONTROLS,
+                         timers=self.timers)
+        self.p2 = Player((self.rect.right - 80 - PLAYER_SIZE, self.rect.centery - PLAYER_SIZE//2), P2_COLOR, P2_CONTROLS,
+                         timers=self.timers)
+        self.items = []
+        self.last_item_spawn = now_ms
+        self.game_over = False
+        self.rng = rng  # item positions; seeded per match by the tournament runner
+
+    def restart(self):
+        reset_round(self.p1, self.p2, self.rect)
+        self.game_over = False
+        self.items.clear()
+
+    def poll(self, now):
+        # This tick's input bits from both players' controllers
+        p1, p2 = self.p1, self.p2
+        return p1.controller(self, p1, p2, now), p2.controller(self, p2, p1, now)
+
+    def step(self, now, p1_bits, p2_bits):
+        if self.game_over:
+            return
+        p1, p2, arena_rect, items = self.p1, self.p2, self.rect, self.items
+        p1.prev_pos = p1.rect.topleft
+        p2.prev_pos = p2.rect.topleft
+        if p1_bits & IN_SWING:
+            p1.start_swing(now)
+        if p2_bits & IN_SWING:
+            p2.start_swing(now)
+
+        p1.apply_input(p1_bits, now, arena_rect)
+        p2.apply_input(p2_bits, now, arena_rect)
+        p1.update(now)
+        p2.update(now)
+
+        check_sword_hit(p1,p2,now)
+        check_sword_hit(p2,p1,now)
+
+        if p1.hp <=0 or p2.hp <=0:
+            self.game_over = True
+
+        # Item spawn
+        if now - self.last_item_spawn > ITEM_SPAWN_INTERVAL and len(items)<3:
+            ix = self.rng.randint(arena_rect.left+40, arena_rect.right-40-ITEM_SIZE)
+            iy = self.rng.randint(arena_rect.top+40, arena_rect.bottom-40-ITEM_SIZE)
+            items.append(Item((ix,iy)))
+            self.last_item_spawn = now
+
+        for item in items[:]:
+            if p1.rect.colliderect(item.rect):
+                p1.hp = min(START_HP, p1.hp + HEAL_AMOUNT)
+                items.remove(item)
+            elif p2.rect.colliderect(item.rect):
+                p2.hp = min(START_HP, p2.hp + HEAL_AMOUNT)
+                items.remove(item)
+
+    def winner(self):
+        # "P1" / "P2" once the match is over, else None (also when both went down on the same tick)
+        if not self.game_over or (self.p1.hp<=0 and self.p2.hp<=0):
+            return None
+        return "P2" if self.p1.hp<=0 else "P1"
+
+    def checksum(self):
+        # CRC of everything that affects future ticks (used by replay verification)
+        fields = []
+        for p in (self.p1, self.p2):
+            fields += [*p.rect, p.facing, p.hp, p.sword_active, p.sword_until, p.sword_has_hit, p.last_attack_time,
+                       p.is_boosting, p.boost_until, p.boost_cd_until, p.invincible, p.invincible_until]
+        fields += [tuple(i.rect) for i in self.items] + [self.last_item_spawn, self.game_over]
+        return zlib.crc32(repr(fields).encode())
+
+    def draw(self, screen, font, big_font, now, alpha=1.0):
+        p1, p2 = self.p1, self.p2
+        draw_arena(screen, self.rect)
+        p1.draw(screen, alpha)
+        p2.draw(screen, alpha)
+        for item in self.items:
+            item.draw(screen)
+        draw_hud(screen, p1, p2, font, now)
+        banner = game_over_item(self, big_font)
+        if banner:
+            screen.blit(*banner)
+
+
+def main(record_path=None, render_fps=FPS, full_flip=False, bots=(None, None)):
+    # The match always advances in fixed 1/FPS ticks on a simulated clock; rendering runs up to render_fps (0 = uncapped)
+    # bots: arena_bots.BOTS names driving P1/P2 instead of the keyboard
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("2P Sword Arena")
@@ -242,85 +545,89 @@ def main():
     font = pygame.font.SysFont("consolas",18)
     big_font = pygame.font.SysFont("consolas",32,bold=True)
 
-    arena_rect = pygame.Rect(ARENA_PADDING, ARENA_PADDING, WIDTH-2*ARENA_PADDING, HEIGHT-2*ARENA_PADDING)
-
-    p1_controls = {"up":pygame.K_w,"down":pygame.K_s,"left":pygame.K_a,"right":pygame.K_d,"swing":pygame.K_SPACE,"boost":pygame.K_f}
-    p2_controls = {"up":pygame.K_UP,"down":pygame.K_DOWN,"left":pygame.K_LEFT,"right":pygame.K_RIGHT,"swing":pygame.K_KP0,"boost":pygame.K_KP_PERIOD}
-
-    p1 = Player((arena_rect.left + 80, arena_rect.centery - PLAYER_SIZE//2), P1_COLOR, p1_controls)
-    p2 = Player((arena_rect.right - 80 - PLAYER_SIZE, arena_rect.centery - PLAYER_SIZE//2), P2_COLOR, p2_controls)
-
-    items = []
-    last_item_spawn = pygame.time.get_ticks()
+    start_ms = now = pygame.time.get_ticks()
+    recorder = None
+    if record_path:
+        recorder = ArenaRecorder(record_path, start_ms=start_ms)
+        random.seed(recorder.seed)
+    arena = Arena(now)
+    p1, p2 = arena.p1, arena.p2
+    if any(bots):
+        from arena_bots import BOTS
+        for p, name in zip((p1, p2), bots):
+            if name:
+                p.controller = BOTS[name]()
 
     running = True
-    game_over = False
+    prof = PROFILER
+    stepper = FixedStep(FPS)
+    renderer = None if full_flip else DirtyRenderer(screen, arena.rect)
+    restart = False  # one-shot inputs are held until a tick consumes them
 
     while running:
-        dt = clock.tick(FPS)
-        now = pygame.time.get_ticks()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+        with prof.section("wait"):
+            seconds = clock.tick(render_fps) / 1000
+        with prof.section("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
                     running = False
-                if not game_over:
-                    if event.key == p1.controls["swing"]:
-                        p1.start_swing(now)
-                    if event.key == p2.controls["swing"]:
-                        p2.start_swing(now)
-                else:
-                    if event.key == pygame.K_r:
-                        reset_round(p1,p2,arena_rect)
-                        game_over = False
-                        items.clear()
-
-        if not game_over:
-            keys = pygame.key.get_pressed()
-            p1.handle_input(keys, now, arena_rect)
-            p2.handle_input(keys, now, arena_rect)
-            p1.update(now)
-            p2.update(now)
-
-            check_sword_hit(p1,p2,now)
-            check_sword_hit(p2,p1,now)
-
-            if p1.hp <=0 or p2.hp <=0:
-                game_over = True
-
-            # Item spawn
-            if now - last_item_spawn > ITEM_SPAWN_INTERVAL and len(items)<3:
-                ix = random.randint(arena_rect.left+40, arena_rect.right-40-ITEM_SIZE)
-                iy = random.randint(arena_rect.top+40, arena_rect.bottom-40-ITEM_SIZE)
-                items.append(Item((ix,iy)))
-                last_item_spawn = now
-
-            for item in items[:]:
-                if p1.rect.colliderect(item.rect):
-                    p1.hp = min(START_HP, p1.hp + HEAL_AMOUNT)
-                    items.remove(item)
-                elif p2.rect.colliderect(item.rect):
-                    p2.hp = min(START_HP, p2.hp + HEAL_AMOUNT)
-                    items.remove(item)
-
-        draw_arena(screen, arena_rect)
-        p1.draw(screen)
-        p2.draw(screen)
-        for item in items:
-            item.draw(screen)
-        draw_hud(screen, p1, p2, font, now)
-
-        if game_over:
-            winner = "P2" if p1.hp<=0 else "P1"
-            msg = big_font.render(f"{winner} WINS! Press R to restart", True, WHITE)
-            screen.blit(msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 - msg.get_height()//2))
-
-        pygame.display.flip()
-
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    # F3: toggle frame profiler overlay, F4: dump samples to CSV/JSON
+                    if event.key == pygame.K_F3:
+                        prof.toggle()
+                    if event.key == pygame.K_F4:
+                        print("profile saved:", prof.dump("arena_profile"))
+                    if not arena.game_over:
+                        for p in (p1, p2):
+                            if isinstance(p.controller, KeyboardController):
+                                p.controller.key_down(event.key)
+                    else:
+                        if event.key == pygame.K_r:
+                            restart = True
+
+        with prof.section("update"):
+            # Catch up on elapsed time; several ticks per frame when rendering falls behind
+            for _ in range(stepper.advance(seconds)):
+                now = start_ms + stepper.ticks * 1000 // FPS  # simulated clock, ms
+                p1_bits, p2_bits = arena.poll(now)
+                if recorder:
+                    recorder.record(arena, now, p1_bits, p2_bits, restart)
+                if restart:
+                    arena.restart()
+                arena.step(now, p1_bits, p2_bits)
+                restart = False
+
+        with prof.section("draw"):
+            extra = stepper.stats() + [("text cache hit/miss", f"{TEXT_CACHE.hits}/{TEXT_CACHE.misses}")]
+            overlay = lambda surf: prof.draw(surf, font, x=ARENA_PADDING, y=ARENA_PADDING + 10, extra=extra)
+            if renderer:
+                extra.append(("dirty px", renderer.pixels))
+                dirty = renderer.render(arena, font, big_font, now, stepper.alpha, overlay if prof.enabled else None)
+            else:
+                arena.draw(screen, font, big_font, now, stepper.alpha)
+                overlay(screen)
+
+        with prof.section("flip"):
+            if renderer:
+                pygame.display.update(dirty)
+            else:
+                pygame.display.flip()
+        prof.end_frame()
+
+    if recorder:
+        recorder.close()
     pygame.quit()
     sys.exit()
 
 
 if __name__=="__main__":
-    main()
+    parser = argparse.ArgumentParser(description="2P Sword Arena")
+    parser.add_argument("--record", metavar="PATH", help="write a replay log of every tick's input")
+    parser.add_argument("--render-fps", type=int, default=FPS, help="render frame cap (0 = uncapped); game speed is unaffected")
+    parser.add_argument("--full-flip", action="store_true", help="redraw the whole window every frame instead of dirty rects")
+    parser.add_argument("--p1", metavar="BOT", help="let a bot from arena_bots.py play P1")
+    parser.add_argument("--p2", metavar="BOT", help="let a bot from arena_bots.py play P2")
+    args = parser.parse_args()
+    main(args.record, args.render_fps, args.full_flip, (args.p1, args.p2))
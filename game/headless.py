@@ -0,0 +1,153 @@
+# 화면 없이 Game을 최대 속도로 돌리는 시뮬레이션 (밸런스 조정, 회귀 벤치마크용)
+# 사용법: python headless.py [--ticks N] [--seed S] [--policy random|aim] [--render] [--record run.rpl]
+import argparse
+import math
+import random
+import time
+from collections import Counter
+
+import numpy as np
+import pygame
+
+from defence import Game, TickInput, STATE_PLAYING, STATE_LOBBY, SHOP_ITEMS, get_window
+from replay import DefenceRecorder
+
+
+class RandomInput:
+    # hold 틱마다 이동 방향과 조준 방향을 새로 뽑고 계속 쏜다
+    def __init__(self, seed=None, hold=30):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.move = (0, 0, 0.0)
+
+    def __call__(self, game, tick):
+        if tick % self.hold == 0:
+            r = self.rng
+            self.move = (r.choice((-1, 0, 1)), r.choice((-1, 0, 1)), r.uniform(-math.pi, math.pi))
+        dx, dy, aim = self.move
+        return TickInput(dx, dy, aim, True)
+
+
+class ScriptedInput:
+    # (dx, dy, aim_angle, firing) 목록을 한 틱에 하나씩 재생, 끝나면 마지막 입력을 유지
+    def __init__(self, script):
+        self.script = [TickInput(*s) for s in script]
+
+    def __call__(self, game, tick):
+        return self.script[min(tick, len(self.script) - 1)]
+
+
+class AimInput:
+    # 가장 가까운 몬스터를 조준해 쏘고, keep_away보다 가까우면 반대쪽으로 물러난다 (아니면 보석을 주우러 간다)
+    # shopping에 든 아이템은 보석이 모이는 대로 앞에서부터 산다 (한 틱에 하나)
+    def __init__(self, keep_away=220, shopping=()):
+        self.keep_away = keep_away
+        self.shopping = shopping
+
+    def __call__(self, game, tick):
+        buy = self.pick_item(game)
+        p, m = game.player, game.monsters
+        if not len(m):
+            return TickInput(*self.toward_gem(game), p.aim_angle, True, buy=buy)
+        dx = m['x'] - p.x
+        dy = m['y'] - p.y
+        j = int(np.argmin(np.hypot(dx, dy)))
+        aim = math.atan2(dy[j], dx[j])
+        if math.hypot(dx[j], dy[j]) < self.keep_away:
+            return TickInput(-int(np.sign(dx[j])), -int(np.sign(dy[j])), aim, True, buy=buy)
+        return TickInput(*self.toward_gem(game), aim, True, buy=buy)
+
+    def pick_item(self, game):
+        p = game.player
+        for item_key in self.shopping:
+            if p.gems >= SHOP_ITEMS[item_key]['cost'] and not (item_key == 'add_gun' and p.num_guns >= 7):
+                return item_key
+        return None
+
+    def toward_gem(self, game):
+        # 위협이 없으면 가장 가까운 보석 쪽으로 걷는다
+        p, g = game.player, game.gems
+        if not len(g):
+            return 0, 0
+        dx = g['x'] - p.x
+        dy = g['y'] - p.y
+        k = int(np.argmin(np.hypot(dx, dy)))
+        return int(np.sign(round(dx[k]))), int(np.sign(round(dy[k])))
+
+
+POLICIES = {'random': RandomInput, 'aim': AimInput}
+
+
+START = TickInput(0, 0, 0.0, False, start=True)
+
+
+def simulate(ticks, seed=None, policy=None, restart=True, render=False, record_path=None):
+    # ticks번 step()을 돌리고 결과를 돌려준다. 죽으면 restart일 때 바로 새 게임을 시작한다.
+    # record_path를 주면 입력을 리플레이 파일로 남긴다 (seed가 없으면 기록기가 정한다)
+    recorder = DefenceRecorder(record_path, seed) if record_path else None
+    if recorder:
+        seed = recorder.seed
+    random.seed(seed)
+    policy = policy or RandomInput(seed)
+    win = get_window() if render else None
+    game = Game()
+    stats = Counter()
+    deaths = 0
+    best_wave = 0
+    tick = 0
+    t0 = time.perf_counter()
+    life_stats = game.stats  # reset_game()이 새 dict를 만들므로 죽은 판의 집계가 여기 남는다
+    while tick < ticks:
+        inp = policy(game, tick) if game.state == STATE_PLAYING else START
+        if recorder:
+            inp = recorder.record(game, inp)
+        was_playing = game.state == STATE_PLAYING
+        game.step(inp)
+        tick += 1
+        if was_playing and game.state == STATE_LOBBY:  # reset_game()으로 로비에 돌아왔다 = 죽었다
+            deaths += 1
+            stats.update(life_stats)
+            if not restart:
+                break
+            life_stats = game.stats
+        best_wave = max(best_wave, game.wave)
+        if win is not None:
+            pygame.event.pump()
+            game.draw(win)
+            pygame.display.flip()
+    elapsed = time.perf_counter() - t0
+    if recorder:
+        recorder.close()
+    if game.state != STATE_LOBBY:
+        stats.update(life_stats)
+    return {
+        'ticks': tick,
+        'seconds': elapsed,
+        'tps': tick / elapsed if elapsed > 0 else 0.0,
+        'best_wave': best_wave,
+        'deaths': deaths,
+        'level': game.player.level,
+        'kills': stats['kills'],
+        'gems': stats['gems'],
+        'waves_cleared': stats['waves_cleared'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Survival Defense headless simulation')
+    parser.add_argument('--ticks', type=int, default=36000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--render', action='store_true', help='그리기도 함께 한다 (프레임 제한 없음)')
+    parser.add_argument('--record', default=None, metavar='PATH', help='입력을 리플레이 파일로 기록 (python replay.py PATH로 검증)')
+    args = parser.parse_args()
+
+    policy = POLICIES[args.policy]() if args.policy != 'random' else RandomInput(args.seed)
+    result = simulate(args.ticks, args.seed, policy, render=args.render, record_path=args.record)
+    print(f"{result['ticks']} ticks in {result['seconds']:.2f}s = {result['tps']:.0f} ticks/s")
+    print(f"best wave {result['best_wave']}, deaths {result['deaths']}, level {result['level']}")
+    print(f"kills {result['kills']}, gems {result['gems']}, waves cleared {result['waves_cleared']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# 프레임 구간별 시간 측정기 (두 게임이 같이 쓴다)
+# with PROFILER.section('draw'): ... 로 구간을 재고, 프레임 끝에 end_frame()을 부른다.
+# 꺼져 있으면 section()은 아무것도 하지 않는 공용 객체를 돌려주므로 비용이 거의 없다.
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+NULL_SECTION = nullcontext()
+
+
+class Section:
+    __slots__ = ('profiler', 'name', 't0')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.t0 = 0.0
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.t0)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))
+    return sorted_values[k]
+
+
+class FrameProfiler:
+    def __init__(self, window=600, refresh=30):
+        self.enabled = False
+        self.window = window        # 백분위를 계산할 최근 프레임 수
+        self.refresh = refresh      # 오버레이 수치를 다시 계산하는 간격 (프레임)
+        self.sections = {}
+        self.names = {}             # 처음 나온 순서대로의 구간 이름 (순서 있는 집합으로 사용)
+        self.current = {}           # 이번 프레임 구간별 누적 시간 (ms)
+        self.history = deque(maxlen=window)
+        self.frames = 0
+        self.last_frame = None
+        self.summary = {}
+        self.lines = []
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.last_frame = None
+        self.current = {}
+
+    def section(self, name):
+        if not self.enabled:
+            return NULL_SECTION
+        s = self.sections.get(name)
+        if s is None:
+            s = self.sections[name] = Section(self, name)
+        return s
+
+    def add(self, name, seconds):
+        if name not in self.names:
+            self.names[name] = None
+        self.current[name] = self.current.get(name, 0.0) + seconds * 1000
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.add('total', now - self.last_frame)
+        self.last_frame = now
+        self.history.append(self.current)
+        self.current = {}
+        self.frames += 1
+        if self.frames % self.refresh == 0:
+            self.summary = self.percentiles()
+            self.lines = []
+
+    def percentiles(self):
+        # 구간별 (p50, p95, p99) ms. 구간이 없던 프레임은 0으로 친다.
+        out = {}
+        for name in self.names:
+            values = sorted(f.get(name, 0.0) for f in self.history)
+            out[name] = (percentile(values, 50), percentile(values, 95), percentile(values, 99))
+        return out
+
+    def draw(self, surf, font, x=10, y=120, extra=()):
+        # 반투명 상자에 구간별 백분위 표시. extra는 (이름, 값) 목록으로 덧붙일 수치. 그린 영역을 돌려준다.
+        if not self.enabled:
+            return None
+        if not self.lines:
+            rows = [f'{"phase":<18}{"p50":>7}{"p95":>7}{"p99":>7}']
+            rows += [f'{name:<18}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}' for name, (p50, p95, p99) in self.summary.items()]
+            self.lines = [font.render(r, True, (230, 230, 235)) for r in rows]
+        lines = self.lines + [font.render(f'{name}: {value}', True, (230, 230, 235)) for name, value in extra]
+        h = sum(l.get_height() for l in lines) + 8
+        w = max(l.get_width() for l in lines) + 12
+        box = pygame.Surface((w, h), pygame.SRCALPHA)
+        box.fill((0, 0, 0, 170))
+        surf.blit(box, (x, y))
+        ly = y + 4
+        for l in lines:
+            surf.blit(l, (x + 6, ly))
+            ly += l.get_height()
+        return pygame.Rect(x, y, w, h)
+
+    def dump_csv(self, path):
+        # 프레임당 한 줄, 구간마다 한 열 (ms)
+        with open(path, 'w', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(['frame'] + list(self.names))
+            start = self.frames - len(self.history)
+            for i, frame in enumerate(self.history):
+                w.writerow([start + i] + [f'{frame.get(n, 0.0):.4f}' for n in self.names])
+
+    def dump_json(self, path):
+        data = {
+            'frames': len(self.history),
+            'percentiles_ms': {n: dict(zip(('p50', 'p95', 'p99'), v)) for n, v in self.percentiles().items()},
+            'samples_ms': {n: [round(f.get(n, 0.0), 4) for f in self.history] for n in self.names},
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1)
+
+    def dump(self, prefix='profile'):
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        self.dump_csv(f'{prefix}_{stamp}.csv')
+        self.dump_json(f'{prefix}_{stamp}.json')
+        return f'{prefix}_{stamp}'
+
+
+PROFILER = FrameProfiler()
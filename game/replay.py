@@ -0,0 +1,158 @@
+# 입력 기록/재생 (두 게임 공용)
+# 파일 구조: 헤더 + 틱마다 고정 크기 입력 레코드, interval 틱마다 그 시점 상태의 CRC32가 끼어 있다.
+#   [헤더][틱 0]...[틱 interval-1][CRC][틱 interval]...
+# 재생은 화면 없이 같은 update 코드를 최대 속도로 돌리고, CRC가 다르면 그 틱을 알려준다.
+# 사용법: python replay.py run.rpl [--no-verify]
+import argparse
+import math
+import os
+import random
+import struct
+import time
+
+MAGIC = b'RPLY'
+VERSION = 1
+GAME_DEFENCE = 1
+GAME_ARENA = 2
+
+HEADER = struct.Struct('<4sBBQHI')    # magic, version, game, seed, checksum interval, start_ms
+DEFENCE_TICK = struct.Struct('<BhB')  # flags, aim, buy
+ARENA_TICK = struct.Struct('<HBBB')   # dt ms, p1 bits, p2 bits, flags
+CHECKSUM = struct.Struct('<I')
+
+# defence flags: 0-1비트 dx+1, 2-3비트 dy+1
+D_FIRE = 16
+D_START = 32
+D_RELOAD = 64
+BUY_ITEMS = (None, 'atk_boost', 'add_gun')
+
+# arena flags
+A_RESTART = 1
+
+AIM_SCALE = 32768 / math.pi  # 조준 각도를 int16으로 (약 0.0001 rad 단위)
+
+
+def quantize_aim(angle):
+    return (round(angle * AIM_SCALE) + 32768) % 65536 - 32768
+
+
+class Recorder:
+    def __init__(self, path, game_id, seed=None, interval=60, start_ms=0):
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(8), 'little')
+        self.interval = interval
+        self.ticks = 0
+        self.f = open(path, 'wb')
+        self.f.write(HEADER.pack(MAGIC, VERSION, game_id, self.seed, interval, start_ms))
+
+    def begin_tick(self, state):
+        # interval 틱마다, 이번 틱 입력을 쓰기 전에 지금까지의 상태 CRC를 남긴다
+        if self.ticks and self.ticks % self.interval == 0:
+            self.f.write(CHECKSUM.pack(state.checksum()))
+        self.ticks += 1
+
+    def close(self):
+        self.f.close()
+
+
+class DefenceRecorder(Recorder):
+    def __init__(self, path, seed=None, interval=60):
+        super().__init__(path, GAME_DEFENCE, seed, interval)
+
+    def record(self, game, inp):
+        # 기록한 값 그대로 재생되도록 조준 각도를 양자화한 입력을 돌려준다
+        from defence import TickInput
+        self.begin_tick(game)
+        aim = quantize_aim(inp.aim)
+        flags = (inp.dx + 1) | (inp.dy + 1) << 2
+        flags |= (D_FIRE if inp.firing else 0) | (D_START if inp.start else 0) | (D_RELOAD if inp.reload else 0)
+        self.f.write(DEFENCE_TICK.pack(flags, aim, BUY_ITEMS.index(inp.buy)))
+        return TickInput(inp.dx, inp.dy, aim / AIM_SCALE, inp.firing, inp.start, inp.reload, inp.buy)
+
+
+class ArenaRecorder(Recorder):
+    def __init__(self, path, seed=None, interval=60, start_ms=0):
+        super().__init__(path, GAME_ARENA, seed, interval, start_ms)
+        self.last_ms = start_ms
+
+    def record(self, arena, now, p1_bits, p2_bits, restart):
+        self.begin_tick(arena)
+        self.f.write(ARENA_TICK.pack(now - self.last_ms, p1_bits, p2_bits, A_RESTART if restart else 0))
+        self.last_ms = now
+
+
+def decode_defence(flags, aim, buy):
+    from defence import TickInput
+    return TickInput((flags & 3) - 1, (flags >> 2 & 3) - 1, aim / AIM_SCALE, bool(flags & D_FIRE),
+                     bool(flags & D_START), bool(flags & D_RELOAD), BUY_ITEMS[buy])
+
+
+def replay(path, verify=True):
+    # 기록된 입력을 화면 없이 최대 속도로 다시 돌린다
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, game_id, seed, interval, start_ms = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path}: 리플레이 파일이 아니거나 버전이 다릅니다')
+    random.seed(seed)
+    if game_id == GAME_DEFENCE:
+        from defence import Game
+        state = Game()
+        tick_fmt = DEFENCE_TICK
+        apply = lambda rec: state.step(decode_defence(*rec))
+    else:
+        from game import Arena
+        state = Arena(start_ms)
+        tick_fmt = ARENA_TICK
+        clock = [start_ms]
+
+        def apply(rec):
+            dt, p1_bits, p2_bits, flags = rec
+            clock[0] += dt
+            if flags & A_RESTART:
+                state.restart()
+            state.step(clock[0], p1_bits, p2_bits)
+
+    pos = HEADER.size
+    ticks = checked = 0
+    mismatches = []
+    t0 = time.perf_counter()
+    while pos + tick_fmt.size <= len(data):
+        if ticks and ticks % interval == 0:
+            expected, = CHECKSUM.unpack_from(data, pos)
+            pos += CHECKSUM.size
+            if verify:
+                checked += 1
+                if state.checksum() != expected:
+                    mismatches.append(ticks)
+            if pos + tick_fmt.size > len(data):
+                break
+        apply(tick_fmt.unpack_from(data, pos))
+        pos += tick_fmt.size
+        ticks += 1
+    elapsed = time.perf_counter() - t0
+    return {
+        'game': 'defence' if game_id == GAME_DEFENCE else 'arena',
+        'ticks': ticks,
+        'seconds': elapsed,
+        'tps': ticks / elapsed if elapsed > 0 else 0.0,
+        'checksums': checked,
+        'mismatches': mismatches,
+        'final_checksum': state.checksum(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='replay a recorded input log headless')
+    parser.add_argument('path')
+    parser.add_argument('--no-verify', action='store_true', help='CRC 비교를 건너뛴다 (순수 시뮬레이션 속도 측정)')
+    args = parser.parse_args()
+    r = replay(args.path, verify=not args.no_verify)
+    print(f"{r['game']}: {r['ticks']} ticks in {r['seconds']:.3f}s = {r['tps']:.0f} ticks/s")
+    if r['mismatches']:
+        print(f"checksum MISMATCH at ticks {r['mismatches'][:10]} ({len(r['mismatches'])}/{r['checksums']})")
+        raise SystemExit(1)
+    print(f"{r['checksums']} checksums ok, final {r['final_checksum']:08x}")
+
+
+if __name__ == '__main__':
+    main()
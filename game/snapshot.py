@@ -0,0 +1,158 @@
+# Game 상태 스냅샷 (defence.py): 되감기, 저장 슬롯, 같은 상태에서 갈라지는 what-if 시뮬레이션용
+# pickle 대신 고정 크기 구조체와 엔티티 열 배열의 원본 바이트를 이어 붙인다.
+#   [헤더][게임][플레이어][아이템 효과 n개][RNG][흐름장][총알][몬스터][보석]
+#   저장소: [행 수, 열 수][열마다 float64 x 행 수]
+# 웨이브 계획표는 (웨이브, 시드)로 다시 만들 수 있으므로 시드와 커서만 저장한다.
+# 흐름장도 결정적이므로 목표 칸과 진행 중인 탐색 위치만 저장하고 되살릴 때 다시 계산한다.
+# 타이머 휠(game.timers)은 시각만 저장한다. 예약된 타이머는 남은 틱과 'life' 열에서 다시 만든다.
+# d로 저장하는 좌표 등은 게임 안에서 int일 때도 있다 (시작 위치 MAP_WIDTH // 2 등). Game.checksum()이 repr을 쓰므로
+# 어느 칸이 int였는지 비트로 남겨 두고 되살릴 때 타입까지 맞춘다.
+import random
+import struct
+from collections import deque
+
+import numpy as np
+
+MAGIC = b'DSNP'
+VERSION = 3
+STATES = ('lobby', 'playing', 'intermission')
+
+HEADER = struct.Struct('<4sB')
+# state, wave, interm_time, wave_clear_timer, shop_open, planner seed, has plan, plan_tick, plan_cursor,
+# wave_origin x/y, camera x/y, kills, gems, waves_cleared, 타이머 휠 시각, 앞의 d 네 칸 중 int였던 칸
+GAME = struct.Struct('<BIii?I?iiddddIIIIB')
+# x, y, prev_x, prev_y, size, base_speed, strength, level, exp, exp_to_level, gems, stat_points,
+# weapon_id (0 = 없음), fire_cool, mag, reloading, num_guns, aim_angle, 아이템 효과 수,
+# d 칸(x, y, prev_x, prev_y, base_speed, aim_angle) 중 int였던 칸
+PLAYER = struct.Struct('<ddddidiiiiiiBiiiidBB')
+ITEM = struct.Struct('<Bi')         # 이름 길이, 남은 틱 (뒤에 이름)
+RNG = struct.Struct('<625I?d')      # random 모듈 내부 상태 (MT19937), gauss_next
+FLOW = struct.Struct('<iiI')        # 목표 칸, 진행 중인 탐색의 목표 칸 (-1 = 없음), 확정한 칸 수
+STORE = struct.Struct('<IB')
+
+
+def int_mask(values):
+    return sum(1 << i for i, v in enumerate(values) if type(v) is int)
+
+
+def retype(values, mask):
+    return [int(v) if mask >> i & 1 else v for i, v in enumerate(values)]
+
+
+def pack_store(store, out):
+    n = len(store)
+    out.append(STORE.pack(n, len(store.names)))
+    for name in store.names:
+        out.append(store.cols[name][:n].tobytes())
+
+
+def unpack_store(store, data, pos):
+    n, ncols = STORE.unpack_from(data, pos)
+    if ncols != len(store.names):
+        raise ValueError('스냅샷의 엔티티 열 구성이 다릅니다')
+    pos += STORE.size
+    while store.capacity < n:
+        store.grow()
+    store.clear()
+    for name in store.names:
+        store.cols[name][:n] = np.frombuffer(data, np.float64, n, pos)
+        pos += n * 8
+    store.n = n
+    return pos
+
+
+def dump(game):
+    p, flow = game.player, game.flow
+    out = [HEADER.pack(MAGIC, VERSION)]
+    reals = (*game.wave_origin, game.camera.x, game.camera.y)
+    out.append(GAME.pack(STATES.index(game.state), game.wave, game.interm_time, game.wave_clear_timer, game.shop_open,
+                         game.planner.seed, game.plan is not None, game.plan_tick, game.plan_cursor, *reals,
+                         game.stats['kills'], game.stats['gems'], game.stats['waves_cleared'], game.timers.now,
+                         int_mask(reals)))
+    reals = (p.x, p.y, p.prev_x, p.prev_y, p.base_speed, p.aim_angle)
+    out.append(PLAYER.pack(*reals[:4], p.size, p.base_speed, p.strength, p.level, p.exp,
+                           p.exp_to_level, p.gems, p.stat_points, p.weapon_id or 0, p.fire_cool, p.mag, p.reloading,
+                           p.num_guns, p.aim_angle, len(p.items_active), int_mask(reals)))
+    for key, ticks in p.items_active.items():
+        name = key.encode()
+        out.append(ITEM.pack(len(name), ticks) + name)
+    _, mt, gauss = random.getstate()
+    out.append(RNG.pack(*mt, gauss is not None, gauss or 0.0))
+    pending = flow.pending if flow.pending is not None else -1
+    out.append(FLOW.pack(-1 if flow.target is None else flow.target, pending, flow.settled if pending >= 0 else 0))
+    for store in (game.bullets, game.monsters, game.gems):
+        pack_store(store, out)
+    return b''.join(out)
+
+
+def load(game, data):
+    # dump()한 바이트로 game의 상태를 덮어쓴다 (렌더링 캐시, 상점 버튼 등은 그대로)
+    from defence import FlowField, MAP_WIDTH, MAP_HEIGHT, FLOW_CELL, OBSTACLES
+
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('게임 스냅샷이 아니거나 버전이 다릅니다')
+    pos = HEADER.size
+    (state, game.wave, game.interm_time, wave_clear, game.shop_open, seed, has_plan, game.plan_tick,
+     game.plan_cursor, *reals, kills, gems, cleared, now, ints) = GAME.unpack_from(data, pos)
+    pos += GAME.size
+    ox, oy, game.camera.x, game.camera.y = retype(reals, ints)
+    # 남은 틱을 만기 시각으로 바꾸는 값들보다 먼저 시계를 맞춘다
+    game.timers.reset(now)
+    game.wave_clear_timer = wave_clear
+    game.state = STATES[state]
+    game.wave_origin = (ox, oy)
+    game.stats.update(kills=kills, gems=gems, waves_cleared=cleared)
+    game.planner.seed = seed
+    game.plan = game.planner.get(game.wave) if has_plan else None
+
+    p = game.player
+    p.reload_timer = None  # 비운 휠의 타이머라 취소할 필요가 없다
+    (x, y, prev_x, prev_y, p.size, base_speed, p.strength, p.level, p.exp, p.exp_to_level, p.gems,
+     p.stat_points, weapon_id, p.fire_cool, p.mag, p.reloading, p.num_guns, aim_angle,
+     n_items, ints) = PLAYER.unpack_from(data, pos)
+    pos += PLAYER.size
+    p.x, p.y, p.prev_x, p.prev_y, p.base_speed, p.aim_angle = retype((x, y, prev_x, prev_y, base_speed, aim_angle), ints)
+    p.weapon_id = weapon_id or None
+    p.items_until = {}
+    for _ in range(n_items):
+        length, ticks = ITEM.unpack_from(data, pos)
+        pos += ITEM.size
+        p.add_item(data[pos:pos + length].decode(), ticks)
+        pos += length
+
+    *mt, has_gauss, gauss = RNG.unpack_from(data, pos)
+    pos += RNG.size
+    random.setstate((3, tuple(mt), gauss if has_gauss else None))
+
+    target, pending, settled = FLOW.unpack_from(data, pos)
+    pos += FLOW.size
+    game.flow = FlowField(MAP_WIDTH, MAP_HEIGHT, FLOW_CELL, OBSTACLES)
+    game.flow.resume(None if target < 0 else target, None if pending < 0 else pending, settled)
+
+    for store in (game.bullets, game.monsters, game.gems):
+        pos = unpack_store(store, data, pos)
+        if store.timers is not None:
+            store.rearm()
+    if pos != len(data):
+        raise ValueError('스냅샷 길이가 맞지 않습니다')
+
+
+class Rewind:
+    # interval 틱마다 스냅샷을 남기는 링 버퍼 (최근 count개), back()은 한 칸씩 과거로 돌아간다
+    def __init__(self, count=10, interval=60):
+        self.interval = interval
+        self.frames = deque(maxlen=count)
+        self.ticks = 0
+
+    def tick(self, game):
+        self.ticks += 1
+        if self.ticks % self.interval == 0:
+            self.frames.append(game.snapshot())
+
+    def back(self, game):
+        if self.frames:
+            game.restore(self.frames.pop())
+
+    def clear(self):
+        self.frames.clear()
@@ -0,0 +1,58 @@
+# 균일 격자 공간 인덱스 (broadphase)
+# 맵을 cell_size 크기의 칸으로 나누고 점들을 칸 번호 순으로 정렬해 둔다.
+# 충돌 검사는 질의 지점의 이웃 칸(3x3)에 든 점에 대해서만 하면 된다.
+# 매 틱 build()로 다시 만든다. 질의 반경은 cell_size 이하여야 한다.
+import numpy as np
+
+NEIGHBOURS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+class SpatialGrid:
+    def __init__(self, width, height, cell_size=64):
+        self.cell_size = cell_size
+        self.cols = width // cell_size + 1
+        self.rows = height // cell_size + 1
+        self.order = np.zeros(0, dtype=np.intp)   # 칸 번호 순으로 정렬한 점 인덱스
+        self.starts = np.zeros(self.cols * self.rows + 1, dtype=np.intp)  # 칸마다 order 안의 시작 위치
+
+    def cells_of(self, xs, ys):
+        # 맵 밖(스폰 지점 등)의 좌표는 가장자리 칸으로 모은다
+        cx = np.clip(np.floor_divide(xs, self.cell_size), 0, self.cols - 1).astype(np.intp)
+        cy = np.clip(np.floor_divide(ys, self.cell_size), 0, self.rows - 1).astype(np.intp)
+        return cx, cy
+
+    def build(self, xs, ys):
+        cx, cy = self.cells_of(xs, ys)
+        cell = cy * self.cols + cx
+        self.order = np.argsort(cell, kind='stable')
+        counts = np.bincount(cell, minlength=self.cols * self.rows)
+        np.cumsum(counts, out=self.starts[1:])
+
+    def query(self, x, y, radius):
+        # (x, y) 중심 반경 radius 사각형이 걸치는 칸들의 점 인덱스 (후보일 뿐, 정밀 판정은 호출자가 한다)
+        (x0, x1), (y0, y1) = self.cells_of(np.array([x - radius, x + radius]), np.array([y - radius, y + radius]))
+        found = [self.order[self.starts[cy * self.cols + x0]:self.starts[cy * self.cols + x1 + 1]]
+                 for cy in range(y0, y1 + 1)]
+        return np.concatenate(found)
+
+    def pairs(self, qx, qy):
+        # 질의 지점마다 이웃 칸에 든 점들과 짝지은 (질의 인덱스, 점 인덱스) 배열
+        qcx, qcy = self.cells_of(qx, qy)
+        qidx = np.arange(len(qx))
+        qs, ps = [], []
+        for dx, dy in NEIGHBOURS:
+            cx, cy = qcx + dx, qcy + dy
+            ok = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+            cell = (cy * self.cols + cx)[ok]
+            start = self.starts[cell]
+            counts = self.starts[cell + 1] - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            # 칸마다 [start, start+count) 범위를 한 배열로 펼친다
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(start, counts)
+            qs.append(np.repeat(qidx[ok], counts))
+            ps.append(self.order[offsets])
+        if not qs:
+            return qidx[:0], qidx[:0]
+        return np.concatenate(qs), np.concatenate(ps)
@@ -0,0 +1,118 @@
+# 스프라이트 아틀라스 (두 게임 공용)
+# 도형을 매 프레임 pygame.draw로 그리지 않고, 키마다 한 번만 큰 페이지 표면의 빈칸에 그려 둔 뒤
+# (페이지, 위치, 영역) 형태로 blit/blits 한다. 페이지는 화면 픽셀 형식으로 변환해 두므로 복사가 빠르다.
+# 투명 픽셀이 없는 스프라이트(사각형 채우기 등)는 불투명 페이지에, 나머지는 알파 페이지에 넣는다
+# (불투명 blit이 알파 blit보다 훨씬 빠르다).
+# 칸 배치는 선반(shelf) 방식: 한 줄씩 왼쪽부터 채우고, 줄 높이는 그 줄에서 가장 높은 스프라이트.
+import pygame
+
+PAGE_SIZE = 1024
+MAX_PAGES = 8  # 이보다 많아지면 (웨이브마다 몬스터 색이 바뀌는 등) 전부 비우고 다시 굽는다
+
+
+class Page:
+    def __init__(self, alpha):
+        flags = pygame.SRCALPHA if alpha else 0
+        surf = pygame.Surface((PAGE_SIZE, PAGE_SIZE), flags)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha() if alpha else surf.convert()
+        if alpha:
+            surf.fill((0, 0, 0, 0))
+        self.surf = surf
+        self.x = self.y = self.row_h = 0
+
+    def place(self, w, h):
+        # 빈칸의 Rect, 자리가 없으면 None (페이지보다 큰 스프라이트는 bake_alone()이 맡는다)
+        if self.x + w > PAGE_SIZE:
+            self.x, self.y, self.row_h = 0, self.y + self.row_h + 1, 0
+        if self.y + h > PAGE_SIZE:
+            return None
+        rect = pygame.Rect(self.x, self.y, w, h)
+        self.x += w + 1  # 1px 틈: 이웃 스프라이트가 번지지 않게
+        self.row_h = max(self.row_h, h)
+        return rect
+
+
+class SpriteAtlas:
+    def __init__(self):
+        self.sprites = {}  # key -> (페이지 표면, 영역 Rect)
+        self.pages = {False: [], True: []}
+        self.misses = 0
+
+    def get(self, key, w, h, paint, alpha=True):
+        # key의 (페이지, 영역). 처음이면 paint(surface)로 w x h 표면에 그려 아틀라스에 굽는다
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.bake(key, w, h, paint, alpha)
+        return sprite
+
+    def bake(self, key, w, h, paint, alpha):
+        self.misses += 1
+        if w > PAGE_SIZE or h > PAGE_SIZE:
+            return self.bake_alone(key, w, h, paint, alpha)
+        if sum(len(p) for p in self.pages.values()) >= MAX_PAGES:
+            self.clear()
+        pages = self.pages[alpha]
+        rect = pages[-1].place(w, h) if pages else None
+        if rect is None:
+            pages.append(Page(alpha))
+            rect = pages[-1].place(w, h)
+        page = pages[-1].surf
+        tmp = pygame.Surface((w, h), pygame.SRCALPHA if alpha else 0)
+        paint(tmp)
+        if alpha:
+            page.fill((0, 0, 0, 0), rect)
+            page.blit(tmp, rect, special_flags=pygame.BLEND_RGBA_MAX)  # 알파까지 그대로 복사
+        else:
+            page.blit(tmp, rect)
+        sprite = self.sprites[key] = (page, rect)
+        return sprite
+
+    def bake_alone(self, key, w, h, paint, alpha):
+        # 페이지보다 큰 스프라이트는 자기만의 표면에 (페이지처럼 화면 형식으로 변환해 둔다)
+        surf = pygame.Surface((w, h), pygame.SRCALPHA if alpha else 0)
+        paint(surf)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha() if alpha else surf.convert()
+        sprite = self.sprites[key] = (surf, surf.get_rect())
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+        self.pages = {False: [], True: []}
+
+    # 자주 쓰는 모양
+    # 매 프레임 엔티티마다 불리므로 캐시에 있으면 그리기 함수를 만들지 않고 바로 돌려준다
+    def rect(self, color, w, h):
+        key = ('rect', color, w, h)
+        return self.sprites.get(key) or self.bake(key, w, h, lambda s: s.fill(color), False)
+
+    def circle(self, color, d):
+        key = ('circle', color, d)
+        return self.sprites.get(key) or self.bake(
+            key, d, d, lambda s: pygame.draw.circle(s, color, (d // 2, d // 2), d // 2), True)
+
+    def round_rect(self, color, w, h, radius):
+        key = ('round_rect', color, w, h, radius)
+        return self.sprites.get(key) or self.bake(
+            key, w, h, lambda s: pygame.draw.rect(s, color, (0, 0, w, h), border_radius=radius), True)
+
+    def bar(self, back, front, w, h):
+        # HP 바 띠: 위 h줄은 배경색, 아래 h줄은 채움색. 채움은 영역 너비를 잘라 찍는다 (bar_items 참고)
+        key = ('bar', back, front, w, h)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            def paint(s):
+                s.fill(back, (0, 0, w, h))
+                s.fill(front, (0, h, w, h))
+            sprite = self.bake(key, w, h * 2, paint, False)
+        return sprite
+
+    def bar_items(self, back, front, w, h, fill_w, pos):
+        # 채운 너비가 fill_w인 HP 바 한 개를 그리는 blits 항목 두 개
+        page, area = self.bar(back, front, w, h)
+        x, y = area.topleft
+        return (page, pos, (x, y, w, h)), (page, pos, (x, y + h, fill_w, h))
+
+
+ATLAS = SpriteAtlas()
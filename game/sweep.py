@@ -0,0 +1,109 @@
+# 시드가 다른 헤드리스 게임 여러 판을 프로세스 풀에서 동시에 돌리고 결과를 모은다
+# MONSTER_TYPES / WEAPONS / SHOP_ITEMS 값을 바꿔 가며 밸런스를 비교하는 용도
+# 사용법:
+#   python sweep.py --runs 2000 --ticks 36000
+#   python sweep.py --runs 500 --set MONSTER_TYPES.1.base_hp=30 --vary WEAPONS.1.fire_delay=8,12,16
+import argparse
+import copy
+import multiprocessing
+import os
+import statistics
+import time
+
+import defence
+from defence import FPS
+from headless import simulate, AimInput
+
+TABLES = ('MONSTER_TYPES', 'WEAPONS', 'SHOP_ITEMS')
+DEFAULTS = {name: copy.deepcopy(getattr(defence, name)) for name in TABLES}
+
+
+def apply_config(config):
+    # 워커는 여러 설정을 번갈아 돌리므로 매번 기본값으로 되돌린 뒤 덮어쓴다
+    for name in TABLES:
+        table = getattr(defence, name)
+        table.clear()
+        table.update(copy.deepcopy(DEFAULTS[name]))
+    for path, value in config.items():
+        name, key, field = path.split('.')
+        table = getattr(defence, name)
+        table[int(key) if key.isdigit() else key][field] = value
+
+
+def run_one(job):
+    # 워커 프로세스에서 한 판 실행. 시드는 판 번호로 정해지므로 어느 워커가 돌려도 결과가 같다.
+    config_id, config, seed, ticks = job
+    apply_config(config)
+    result = simulate(ticks, seed, AimInput(shopping=('add_gun', 'atk_boost')), restart=False)
+    return config_id, result
+
+
+def summarize(results):
+    waves = [r['waves_cleared'] for r in results]
+    minutes = [r['ticks'] / FPS / 60 for r in results]
+    return {
+        'runs': len(results),
+        'waves_mean': statistics.fmean(waves),
+        'waves_median': statistics.median(waves),
+        'waves_max': max(waves),
+        'kills_per_min': statistics.fmean(r['kills'] / m for r, m in zip(results, minutes)),
+        'gems_per_min': statistics.fmean(r['gems'] / m for r, m in zip(results, minutes)),
+        'survived': sum(r['deaths'] == 0 for r in results) / len(results),
+        'tps_per_run': statistics.fmean(r['tps'] for r in results),
+    }
+
+
+def run_sweep(configs, runs, ticks, base_seed=0, workers=None):
+    # configs마다 같은 시드 묶음(base_seed ...)으로 runs판씩 돌린다
+    jobs = [(cid, config, base_seed + i, ticks) for cid, config in enumerate(configs) for i in range(runs)]
+    workers = workers or os.cpu_count()
+    results = [[] for _ in configs]
+    with multiprocessing.Pool(workers) as pool:
+        for cid, result in pool.imap_unordered(run_one, jobs, chunksize=max(1, len(jobs) // (workers * 8))):
+            results[cid].append(result)
+    return [summarize(r) for r in results]
+
+
+def parse_value(text):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Survival Defense balance sweep')
+    parser.add_argument('--runs', type=int, default=1000, help='설정마다 돌릴 판 수')
+    parser.add_argument('--ticks', type=int, default=36000, help='한 판의 최대 틱 수 (36000 = 10분)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--set', action='append', default=[], metavar='TABLE.KEY.FIELD=VALUE')
+    parser.add_argument('--vary', default=None, metavar='TABLE.KEY.FIELD=V1,V2,...')
+    args = parser.parse_args()
+
+    base = {}
+    for item in args.set:
+        path, value = item.split('=')
+        base[path] = parse_value(value)
+    configs = [base]
+    if args.vary:
+        path, values = args.vary.split('=')
+        configs = [dict(base, **{path: parse_value(v)}) for v in values.split(',')]
+
+    t0 = time.perf_counter()
+    summaries = run_sweep(configs, args.runs, args.ticks, args.seed, args.workers)
+    elapsed = time.perf_counter() - t0
+
+    total_runs = args.runs * len(configs)
+    print(f'{total_runs} runs on {args.workers or os.cpu_count()} workers in {elapsed:.1f}s ({total_runs / elapsed:.1f} runs/s)')
+    print(f'{"config":<40} {"waves":>6} {"median":>6} {"max":>4} {"kills/m":>8} {"gems/m":>7} {"alive":>6} {"tick/s":>7}')
+    for config, s in zip(configs, summaries):
+        name = ', '.join(f'{k}={v}' for k, v in config.items()) or 'default'
+        print(f'{name:<40} {s["waves_mean"]:>6.2f} {s["waves_median"]:>6.1f} {s["waves_max"]:>4} '
+              f'{s["kills_per_min"]:>8.1f} {s["gems_per_min"]:>7.2f} {s["survived"]:>6.0%} {s["tps_per_run"]:>7.0f}')
+
+
+if __name__ == '__main__':
+    main()
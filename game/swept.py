@@ -0,0 +1,123 @@
+# 연속(스윕) 충돌 판정 (두 게임이 같이 쓴다)
+# 틱 끝 위치만 보면 한 틱에 많이 움직이는 물체(빠른 총알, 부스트 중인 칼)가 상대를 건너뛴다.
+# 대신 이번 틱에 지나간 선분 전체를 검사한다. 두 물체가 다 움직이면 상대 기준의 움직임
+# (내 이동 - 상대 이동)으로 바꿔 상대가 멈춰 있는 것처럼 푼다.
+import math
+
+import numpy as np
+
+
+def circle_sweep_hits(ex, ey, dx, dy, r):
+    # 원 중심 기준으로 (ex, ey)에서 끝난, 이번 틱에 (dx, dy)만큼 움직인 점이 반지름 r 안을 지났는지 (numpy 배열 단위)
+    # 선분 위에서 원 중심에 가장 가까운 점의 거리로 판정하므로 끝 위치 거리 비교와 비용이 거의 같다
+    dd = dx * dx
+    dd += dy * dy
+    np.maximum(dd, 1e-12, out=dd)  # 움직이지 않았으면 s = 0 (끝점만 본다)
+    s = ex * dx
+    s += ey * dy
+    s /= dd
+    np.clip(s, 0, 1, out=s)  # 끝점에서 거슬러 올라간 비율
+    cx = s * dx
+    np.subtract(ex, cx, out=cx)
+    cy = s * dy
+    np.subtract(ey, cy, out=cy)
+    cx *= cx
+    cy *= cy
+    cx += cy
+    return cx < r * r
+
+
+def circle_sweep_time(ex, ey, dx, dy, r):
+    # circle_sweep_hits()가 참인 쌍이 처음 닿은 시점 t (0 = 틱 시작, 1 = 틱 끝)
+    x0 = ex - dx
+    y0 = ey - dy
+    a = dx * dx + dy * dy
+    b = x0 * dx + y0 * dy
+    c = x0 * x0 + y0 * y0 - r * r
+    t = np.divide(-b - np.sqrt(np.maximum(b * b - a * c, 0)), a, out=np.zeros(np.shape(a)), where=a > 0)
+    return np.where(c <= 0, 0.0, np.clip(t, 0, 1))
+
+
+def circle_sweep(ex, ey, dx, dy, r):
+    # circle_sweep_hits()와 circle_sweep_time()의 스칼라 판 (파이썬 float): 지났으면 처음 닿은 t, 아니면 None
+    # 몇 쌍 안 될 때 numpy 호출 비용을 피하려고 쓴다. 연산 순서가 같아 배열 판과 결과가 비트 단위로 같다
+    dd = dx * dx + dy * dy
+    s = (ex * dx + ey * dy) / (dd if dd > 1e-12 else 1e-12)
+    s = 0.0 if s < 0 else 1.0 if s > 1 else s
+    cx = ex - s * dx
+    cy = ey - s * dy
+    rr = r * r
+    if not cx * cx + cy * cy < rr:
+        return None
+    x0 = ex - dx
+    y0 = ey - dy
+    b = x0 * dx + y0 * dy
+    c = x0 * x0 + y0 * y0 - rr
+    if c <= 0 or not dd > 0:
+        return 0.0
+    t = (-b - math.sqrt(max(b * b - dd * c, 0))) / dd
+    return 0.0 if t < 0 else 1.0 if t > 1 else t
+
+
+def segment_aabb(x0, y0, x1, y1, left, top, right, bottom):
+    # 선분이 축 정렬 사각형에 처음 닿는 t, 안 닿으면 None (스칼라, 슬랩 판정. 두 축을 풀어 써서 튜플을 만들지 않는다)
+    t_enter, t_exit = 0.0, 1.0
+    d = x1 - x0
+    if d:
+        ta, tb = (left - x0) / d, (right - x0) / d
+        if ta > tb:
+            ta, tb = tb, ta
+        if ta > t_enter:
+            t_enter = ta
+        if tb < t_exit:
+            t_exit = tb
+        if t_enter > t_exit:
+            return None
+    elif x0 < left or x0 > right:
+        return None
+    d = y1 - y0
+    if d:
+        ta, tb = (top - y0) / d, (bottom - y0) / d
+        if ta > tb:
+            ta, tb = tb, ta
+        if ta > t_enter:
+            t_enter = ta
+        if tb < t_exit:
+            t_exit = tb
+        if t_enter > t_exit:
+            return None
+    elif y0 < top or y0 > bottom:
+        return None
+    return t_enter
+
+
+def swept_rects_hit(a, a_prev, b, b_prev):
+    # 사각형 a와 b가 이번 틱 사이에 겹친 적이 있는지. a_prev/b_prev는 틱 시작 때의 좌상단 좌표.
+    # 축마다 필요한 값만 정수 지역 변수로 한 번씩 읽는다 (Rect 속성 읽기가 비싸고, 대부분 x축에서 끝난다)
+    # b 기준 상대 이동: a의 좌상단이 b를 a 크기만큼 넓힌 사각형(민코프스키 합) 안을 지나갔는지
+    ax, aw, bx = a.x, a.w, b.x
+    rx = ax - a_prev[0] - bx + b_prev[0]
+    x0 = ax - rx
+    left, right = bx - aw, bx + b.w
+    # 지나간 범위가 넓힌 사각형과 떨어져 있으면 바로 거짓 (끝 위치도 이 범위 안이다)
+    if rx > 0:
+        if x0 >= right or ax <= left:
+            return False
+    elif ax >= right or x0 <= left:
+        return False
+    ay, ah, by = a.y, a.h, b.y
+    ry = ay - a_prev[1] - by + b_prev[1]
+    y0 = ay - ry
+    top, bottom = by - ah, by + b.h
+    if ry > 0:
+        if y0 >= bottom or ay <= top:
+            return False
+    elif ay >= bottom or y0 <= top:
+        return False
+    # 끝 위치에서 겹치면 참 (a.colliderect(b)와 같다)
+    if left < ax < right and top < ay < bottom:
+        return True
+    if not rx and not ry:
+        return False
+    t = segment_aabb(x0, y0, ax, ay, left, top, right, bottom)
+    return t is not None and t < 1.0  # t == 1은 끝 위치라 위에서 이미 판정했다
@@ -0,0 +1,56 @@
+# 글자 표면 캐시
+# font.render()는 프레임에서 가장 비싼 작업 중 하나라서, 같은 (폰트, 문자열, 색)은
+# 한 번만 그려 두고 재사용한다. 오래 안 쓴 항목부터 버린다 (LRU).
+from collections import OrderedDict
+
+
+class TextCache:
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        img = self.surfaces.get(key)
+        if img is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return img
+        self.misses += 1
+        img = font.render(text, antialias, color)
+        self.surfaces[key] = img
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return img
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class HudPanel:
+    # 표시할 값(key)이 바뀔 때만 render()를 불러 (표면, 위치) 목록을 다시 만든다
+    def __init__(self):
+        self.key = None
+        self.items = []
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        if key != self.key or not self.items:
+            self.items = render()
+            self.key = key
+            self.misses += 1
+        else:
+            self.hits += 1
+        return self.items
+
+    def draw(self, surf, key, render):
+        surf.blits(self.get(key, render), doreturn=False)
+
+
+TEXT_CACHE = TextCache()
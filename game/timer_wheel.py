@@ -0,0 +1,156 @@
+# 계층형 타이머 휠 (두 게임 공용)
+# 쿨다운, 수명처럼 "n틱 뒤에 할 일"을 매 틱 하나씩 깎지 않고, 만기 시각의 칸에 넣어 두었다가 그 시각이 되면 콜백을 부른다.
+# 0단계 휠은 한 칸이 1틱인 2**bits칸, k단계 휠은 한 칸이 2**(bits*k)틱. 먼 타이머는 윗단계 칸에 두었다가
+# 아랫단계가 한 바퀴 돌 때마다 그 칸을 풀어 한 단계 아래로 다시 넣는다 (캐스케이드).
+# 등록/취소는 O(1), 진행은 틱당 O(1) + 만기 수 (타이머마다 캐스케이드는 최대 levels번). 아랫단계가 비어 있으면 건너뛴다.
+# 시각 단위는 쓰는 쪽이 정한다: defence.py는 업데이트 틱, game.py는 ms.
+# 같은 시각에 만기인 타이머는 등록한 순서대로 부른다 (리플레이가 결정적이도록).
+import math
+from operator import attrgetter
+
+BITS = 6     # 단계마다 64칸
+LEVELS = 4   # 64**4 = 약 1670만 틱까지 휠에 두고, 그보다 먼 것은 overflow 목록에
+
+BY_SEQ = attrgetter('seq')
+
+
+class Timer:
+    # schedule()이 돌려주는 핸들. 부르거나 취소하면 callback이 None이 된다
+    __slots__ = ('deadline', 'seq', 'callback', 'args')
+
+    def __init__(self, deadline, seq, callback, args):
+        self.deadline = deadline
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+
+    @property
+    def active(self):
+        return self.callback is not None
+
+
+class TimerWheel:
+    def __init__(self, now=0, bits=BITS, levels=LEVELS):
+        self.bits = bits
+        self.levels = levels
+        self.mask = (1 << bits) - 1
+        self.reset(now)
+
+    def reset(self, now=0):
+        # 예약을 전부 버리고 시각을 now로 (스냅샷 복원용)
+        self.now = now
+        self.clear_slots()
+        self.due = []      # 등록할 때 이미 만기였던 타이머: 다음 advance에서 맨 먼저 부른다
+        self.pending = 0   # 아직 부르지도 취소하지도 않은 타이머 수
+        self.seq = 0
+        self.fired = 0
+
+    def clear_slots(self):
+        self.wheels = [[[] for _ in range(self.mask + 1)] for _ in range(self.levels)]
+        self.counts = [0] * self.levels  # 단계별로 칸에 들어 있는 타이머 수 (취소된 것 포함)
+        self.overflow = []
+
+    def __len__(self):
+        return self.pending
+
+    def schedule(self, delay, callback, *args):
+        # delay 뒤에 callback(*args)
+        return self.schedule_at(self.now + delay, callback, *args)
+
+    def schedule_at(self, deadline, callback, *args):
+        # 시각이 deadline 이상이 되는 첫 advance에서 callback(*args). 이미 지난 시각이면 다음 advance에서 바로
+        timer = Timer(math.ceil(deadline), self.seq, callback, args)
+        self.seq += 1
+        self.pending += 1
+        if timer.deadline <= self.now:
+            self.due.append(timer)
+        else:
+            self.place(timer)
+        return timer
+
+    def cancel(self, timer):
+        # 칸에서 빼지 않고 표시만 한다 (만기 때 건너뜀)
+        if timer.callback is not None:
+            timer.callback = None
+            self.pending -= 1
+
+    def remaining(self, timer):
+        return max(0, timer.deadline - self.now) if timer.callback is not None else 0
+
+    def place(self, timer):
+        # 지금 시각과 윗자리가 같은 가장 낮은 단계의, 만기 시각 자리 칸에 넣는다
+        d, now, bits = timer.deadline, self.now, self.bits
+        for level in range(self.levels):
+            shift = bits * level
+            if d >> (shift + bits) == now >> (shift + bits):
+                self.wheels[level][(d >> shift) & self.mask].append(timer)
+                self.counts[level] += 1
+                return
+        self.overflow.append(timer)
+
+    def advance(self, ticks=1):
+        self.advance_to(self.now + ticks)
+
+    def advance_to(self, t):
+        # 시각을 t까지 진행하며 만기가 된 타이머를 만기 순서대로 부른다
+        if self.due:
+            due, self.due = self.due, []
+            self.fire(due)
+        while self.now < t:
+            if not self.pending:
+                if any(self.counts) or self.overflow:
+                    self.clear_slots()  # 취소된 타이머만 남아 있다
+                self.now = t
+                return
+            # 아랫단계 휠이 비어 있으면 다음 캐스케이드 직전까지는 부를 것이 없다
+            skip = self.now
+            for level in range(self.levels):
+                if self.counts[level]:
+                    break
+                skip |= (1 << self.bits * (level + 1)) - 1
+            if skip >= t:
+                self.now = t
+                return
+            self.now = skip + 1
+            self.tick()
+
+    def tick(self):
+        now, bits, mask = self.now, self.bits, self.mask
+        if not now & mask:
+            # 아랫단계가 한 바퀴 돌았다: 윗단계부터 이번 칸을 풀어 다시 넣는다 (단계가 하나뿐이면 overflow만)
+            top = 0
+            while top < self.levels - 1 and not now & ((1 << bits * (top + 1)) - 1):
+                top += 1
+            if top == self.levels - 1 and not now & ((1 << bits * self.levels) - 1):
+                overflow, self.overflow = self.overflow, []
+                self.replace(overflow)
+            for level in range(top, 0, -1):
+                i = (now >> bits * level) & mask
+                slot = self.wheels[level][i]
+                if slot:
+                    self.wheels[level][i] = []
+                    self.counts[level] -= len(slot)
+                    self.replace(slot)
+        i = now & mask
+        slot = self.wheels[0][i]
+        if slot:
+            self.wheels[0][i] = []
+            self.counts[0] -= len(slot)
+            if len(slot) > 1:
+                slot.sort(key=BY_SEQ)  # 캐스케이드로 내려온 타이머가 뒤섞여 있을 수 있다
+            self.fire(slot)
+
+    def replace(self, timers):
+        for timer in timers:
+            if timer.callback is not None:
+                self.place(timer)
+
+    def fire(self, timers):
+        for timer in timers:
+            callback = timer.callback
+            if callback is None:
+                continue
+            timer.callback = None
+            self.pending -= 1
+            self.fired += 1
+            callback(*timer.args)
@@ -0,0 +1,127 @@
+# Headless bot-vs-bot tournament for the 2P arena: seeded P1-vs-P2 matches on a process pool
+# Used to compare balance values (DAMAGE_PER_HIT, BOOST_* ...) by win rate and match length.
+# Usage:
+#   python tournament.py --matches 5000 --p1 chase --p2 kite
+#   python tournament.py --p1 chase --p2 chase --vary DAMAGE_PER_HIT_BOOST=10,15,20
+#   python tournament.py --set BOOST_COOLDOWN_MS=2000 --vary BOOST_SPEED=6,7,8
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+import game
+from game import Arena, FPS
+from arena_bots import BOTS
+
+# Config values read while a match runs (so they can be changed per job in a worker)
+TUNABLES = ("BASE_SPEED", "BOOST_SPEED", "BOOST_DURATION_MS", "BOOST_COOLDOWN_MS", "SWORD_DURATION_MS",
+            "ATTACK_COOLDOWN_MS", "DAMAGE_PER_HIT", "DAMAGE_PER_HIT_BOOST", "START_HP", "HEAL_AMOUNT",
+            "ITEM_SPAWN_INTERVAL")
+DEFAULTS = {name: getattr(game, name) for name in TUNABLES}
+
+
+def apply_config(config):
+    # Workers run several configs in turn, so reset to the defaults before overriding
+    for name, value in DEFAULTS.items():
+        setattr(game, name, value)
+    for name, value in config.items():
+        setattr(game, name, value)
+
+
+def play_match(p1_bot, p2_bot, seed, max_ticks):
+    # One match on the simulated clock; same seed -> same match. Returns (winner or None, ticks, p1 hp, p2 hp)
+    rng = random.Random(seed)
+    arena = Arena(0, rng)
+    arena.p1.controller = BOTS[p1_bot](rng.getrandbits(32))
+    arena.p2.controller = BOTS[p2_bot](rng.getrandbits(32))
+    tick = 0
+    while tick < max_ticks and not arena.game_over:
+        tick += 1
+        now = tick * 1000 // FPS
+        arena.step(now, *arena.poll(now))
+    return arena.winner(), tick, arena.p1.hp, arena.p2.hp
+
+
+def run_batch(job):
+    # Several matches per job keep the pool's pickling overhead small
+    config_id, config, p1_bot, p2_bot, first_seed, count, max_ticks = job
+    apply_config(config)
+    tally = {"P1": 0, "P2": 0, None: 0, "ticks": 0, "winner_hp": 0}
+    for seed in range(first_seed, first_seed + count):
+        winner, ticks, hp1, hp2 = play_match(p1_bot, p2_bot, seed, max_ticks)
+        tally[winner] += 1
+        tally["ticks"] += ticks
+        if winner:
+            tally["winner_hp"] += hp1 if winner == "P1" else hp2
+    return config_id, tally
+
+
+def run_tournament(configs, p1_bot, p2_bot, matches, max_ticks, base_seed=0, workers=None, batch=50):
+    # Every config plays the same seeds (base_seed ...), so differences come from the config alone
+    jobs = [(cid, config, p1_bot, p2_bot, base_seed + start, min(batch, matches - start), max_ticks)
+            for cid, config in enumerate(configs) for start in range(0, matches, batch)]
+    workers = workers or os.cpu_count()
+    totals = [{"P1": 0, "P2": 0, None: 0, "ticks": 0, "winner_hp": 0} for _ in configs]
+    with multiprocessing.Pool(workers) as pool:
+        for cid, tally in pool.imap_unordered(run_batch, jobs):
+            for key, value in tally.items():
+                totals[cid][key] += value
+    return totals
+
+
+def parse_value(text):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"not a number: {text}")
+
+
+def parse_name(path):
+    if path not in TUNABLES:
+        raise SystemExit(f"unknown setting {path}; choose from {', '.join(TUNABLES)}")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="2P Sword Arena bot tournament")
+    parser.add_argument("--matches", type=int, default=2000, help="matches per config")
+    parser.add_argument("--p1", choices=BOTS, default="chase")
+    parser.add_argument("--p2", choices=BOTS, default="kite")
+    parser.add_argument("--max-ticks", type=int, default=FPS * 120, help="a match still running after this is a draw")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE")
+    parser.add_argument("--vary", default=None, metavar="NAME=V1,V2,...")
+    args = parser.parse_args()
+
+    base = {}
+    for item in args.set:
+        name, value = item.split("=")
+        base[parse_name(name)] = parse_value(value)
+    configs = [base]
+    if args.vary:
+        name, values = args.vary.split("=")
+        configs = [dict(base, **{parse_name(name): parse_value(v)}) for v in values.split(",")]
+
+    t0 = time.perf_counter()
+    totals = run_tournament(configs, args.p1, args.p2, args.matches, args.max_ticks, args.seed, args.workers)
+    elapsed = time.perf_counter() - t0
+
+    n = args.matches * len(configs)
+    ticks = sum(t["ticks"] for t in totals)
+    print(f"{args.p1} (P1) vs {args.p2} (P2): {n} matches on {args.workers or os.cpu_count()} workers in {elapsed:.1f}s "
+          f"({n / elapsed:.0f} matches/s, {ticks / elapsed:.0f} ticks/s)")
+    print(f"{'config':<36} {'P1 win':>7} {'P2 win':>7} {'draw':>6} {'avg s':>6} {'winner hp':>10}")
+    for config, t in zip(configs, totals):
+        name = ", ".join(f"{k}={v}" for k, v in config.items()) or "default"
+        decided = t["P1"] + t["P2"]
+        print(f"{name:<36} {t['P1'] / args.matches:>7.1%} {t['P2'] / args.matches:>7.1%} "
+              f"{t[None] / args.matches:>6.1%} {t['ticks'] / args.matches / FPS:>6.1f} "
+              f"{t['winner_hp'] / decided if decided else 0:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
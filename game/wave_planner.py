@@ -0,0 +1,118 @@
+# 웨이브 스폰 계획표
+# 웨이브마다 "몇 번째 틱에, 어떤 몬스터를, 웨이브 시작 때 플레이어 위치에서 얼마나 떨어진 곳에,
+# 체력/속도/공격력 얼마로" 낼지를 배열 몇 개로 미리 만들어 둔다.
+# 계획은 (웨이브, 시드, 몬스터 표)만으로 정해지므로 캐시해 두고 다시 쓰며, 다음 웨이브 계획은
+# 배경 스레드에서 미리 만든다. 게임은 틱마다 커서를 한 칸씩 확인하기만 하면 된다 (O(1)).
+# 사용법 (스폰 속도 분석): python wave_planner.py [--waves 1-50] [--seed 0]
+import argparse
+import copy
+import math
+import queue
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+SPAWN_CHANCE = 0.05  # 틱마다 다음 몬스터가 나올 확률 (간격은 기하분포)
+CACHE_SIZE = 256
+
+# tick: 웨이브 시작부터 센 스폰 틱 (오름차순), dx/dy: 웨이브 시작 때 플레이어 위치 기준 스폰 위치
+WavePlan = namedtuple('WavePlan', 'wave seed tick type dx dy hp speed damage')
+
+CACHE = OrderedDict()
+CACHE_LOCK = threading.Lock()
+REQUESTS = queue.Queue()
+WORKER = None
+
+
+def types_key(types):
+    return repr(sorted(types.items()))
+
+
+def plan_wave(wave, seed, types, spawn_dist):
+    rng = np.random.default_rng([seed, wave])
+    base_count = 5 + wave * 2
+    kinds = np.where(rng.random(base_count) < 0.7, 1, 2)
+    if wave % 10 == 0 and wave > 0:
+        kinds = np.concatenate([kinds, np.full(wave // 10, 3)])  # 보스는 맨 마지막에
+    n = len(kinds)
+    angle = rng.uniform(0, 2 * math.pi, n)
+    tick = np.cumsum(rng.geometric(SPAWN_CHANCE, n)) - 1
+    base_hp = np.array([types[k]['base_hp'] for k in kinds.tolist()], dtype=float)
+    base_speed = np.array([types[k]['base_speed'] for k in kinds.tolist()], dtype=float)
+    damage = [types[k]['damage'] for k in kinds.tolist()]
+    return WavePlan(
+        wave, seed,
+        tick.astype(np.int32),
+        kinds.astype(np.int8),
+        (spawn_dist * np.cos(angle)).astype(np.float32),
+        (spawn_dist * np.sin(angle)).astype(np.float32),
+        (base_hp * (1 + wave * 0.25)).astype(np.int32),
+        np.maximum(0.4, base_speed * (1 + (wave - 1) * 0.03)).astype(np.float32),
+        np.array(damage, dtype=np.int16),
+    )
+
+
+def cached_plan(wave, seed, types, spawn_dist):
+    key = (wave, seed, spawn_dist, types_key(types))
+    with CACHE_LOCK:
+        plan = CACHE.get(key)
+        if plan is not None:
+            CACHE.move_to_end(key)
+            return plan
+    plan = plan_wave(wave, seed, types, spawn_dist)
+    with CACHE_LOCK:
+        CACHE[key] = plan
+        if len(CACHE) > CACHE_SIZE:
+            CACHE.popitem(last=False)
+    return plan
+
+
+def worker():
+    while True:
+        cached_plan(*REQUESTS.get())
+
+
+class WavePlanner:
+    # 한 게임의 계획 담당. types는 몬스터 표 (바뀌면 캐시 키도 바뀐다)
+    def __init__(self, seed, types, spawn_dist, ahead=1):
+        self.seed = seed
+        self.types = types
+        self.spawn_dist = spawn_dist
+        self.ahead = ahead  # 미리 만들어 둘 다음 웨이브 수
+
+    def get(self, wave):
+        plan = cached_plan(wave, self.seed, self.types, self.spawn_dist)
+        for w in range(wave + 1, wave + 1 + self.ahead):
+            self.prefetch(w)
+        return plan
+
+    def prefetch(self, wave):
+        # 배경 스레드에 계획 생성을 맡긴다 (표는 지금 값으로 복사해서 넘김)
+        global WORKER
+        if WORKER is None or not WORKER.is_alive():
+            WORKER = threading.Thread(target=worker, name='wave-planner', daemon=True)
+            WORKER.start()
+        REQUESTS.put((wave, self.seed, copy.deepcopy(self.types), self.spawn_dist))
+
+
+def main():
+    from defence import MONSTER_TYPES, WIDTH, HEIGHT, FPS
+
+    parser = argparse.ArgumentParser(description='wave spawn plan summary')
+    parser.add_argument('--waves', default='1-30', metavar='FIRST-LAST')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    first, last = map(int, args.waves.split('-'))
+
+    print(f'{"wave":>5} {"count":>6} {"bosses":>7} {"last spawn s":>13} {"spawns/s":>9} {"total hp":>9} {"hp/s":>8}')
+    for wave in range(first, last + 1):
+        p = plan_wave(wave, args.seed, MONSTER_TYPES, max(WIDTH, HEIGHT))
+        seconds = (int(p.tick[-1]) + 1) / FPS
+        hp = int(p.hp.sum())
+        print(f'{wave:>5} {len(p.tick):>6} {int((p.type == 3).sum()):>7} {seconds:>13.1f} '
+              f'{len(p.tick) / seconds:>9.2f} {hp:>9} {hp / seconds:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()